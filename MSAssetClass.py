@@ -0,0 +1,76 @@
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSAssetClass decides which material classes (metal, fruit, fabric, scatter, ...) a
+Bridge asset belongs to.
+
+The tags and categories are normalized once into frozensets (AssetTraits) and every
+class is evaluated from CLASSIFICATION_RULES, a plain ordered list of
+(name, predicate) pairs that can be extended with AddRule(). A predicate is called
+as predicate(asset, classes) with the AssetTraits of the asset and the results of
+the rules before it, and returns whether the asset is in the class:
+
+    asset.type, asset.category      "type" and "category" fields (case-sensitive)
+    asset.tags, asset.categories    lowercase tag / category names
+    asset.rawTags, .rawCategories   tag / category names, case-sensitive
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+FRUIT = frozenset(["fruit", "fruits"])
+SSS_CATEGORIES = frozenset(["moss", "skin", "snow"])
+SCATTER = frozenset(["scatter", "cmb_asset"])
+COLORLESS_METAL = frozenset(["colorless", "metal"])
+
+CLASSIFICATION_RULES = [
+    ("isMetal", lambda asset, classes: asset.type == "surface" and asset.category == "Metal"),
+    ("isBareMetal", lambda asset, classes: classes["isMetal"] and "colorless" in asset.tags),
+    ("isFruit", lambda asset, classes: not FRUIT.isdisjoint(asset.tags) or not FRUIT.isdisjoint(asset.categories)),
+    ("isFabric", lambda asset, classes: "fabric" in asset.tags or "fabric" in asset.categories),
+    ("isPlant", lambda asset, classes: asset.type == "3dplant"),
+    ("isSurfaceSSS", lambda asset, classes: asset.type == "surface" and not SSS_CATEGORIES.isdisjoint(asset.categories)),
+    ("isScatterAsset", lambda asset, classes: asset.type == "3d" and (
+        not SCATTER.isdisjoint(asset.rawTags) or not SCATTER.isdisjoint(asset.rawCategories))),
+
+    # Flags the generated MAXScript reads through its MS* placeholders.
+    ("hasFabricTag", lambda asset, classes: "fabric" in asset.tags),
+    ("hasMetalTag", lambda asset, classes: "metal" in asset.rawTags or "metal" in asset.rawCategories),
+    ("hasColorlessMetalTags", lambda asset, classes: COLORLESS_METAL <= asset.rawTags),
+    ("hasBareMetalTag", lambda asset, classes: classes["hasColorlessMetalTags"] or "metal" in asset.rawCategories),
+    ("hasFruitTag", lambda asset, classes: "fruits" in asset.rawTags),
+]
+
+
+def AddRule(name, predicate):
+    """
+    Adds or replaces a classification rule. New rules are evaluated after the
+    existing ones, so their predicate can read them from classes.
+    """
+    for index_, (name_, predicate_) in enumerate(CLASSIFICATION_RULES):
+        if name_ == name:
+            CLASSIFICATION_RULES[index_] = (name, predicate)
+            return
+    CLASSIFICATION_RULES.append((name, predicate))
+
+
+class AssetTraits():
+    __slots__ = ("type", "category", "tags", "categories", "rawTags", "rawCategories")
+
+    def __init__(self, json_data):
+        self.type = json_data.get("type", "")
+        self.category = json_data.get("category", "")
+        self.rawTags = frozenset(json_data.get("tags") or ())
+        self.rawCategories = frozenset(json_data.get("categories") or ())
+        self.tags = frozenset(map(str.lower, self.rawTags))
+        self.categories = frozenset(map(str.lower, self.rawCategories))
+
+
+def Classify(json_data, rules=None):
+    """
+    Returns {rule name: bool} for every rule, evaluated in list order.
+    """
+    asset_ = AssetTraits(json_data)
+    classes_ = {}
+    for name_, predicate_ in CLASSIFICATION_RULES if rules is None else rules:
+        classes_[name_] = bool(predicate_(asset_, classes_))
+    return classes_
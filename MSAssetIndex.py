@@ -0,0 +1,131 @@
+import re
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSAssetIndex remembers which scene material was built for which Megascans asset, so
+that exporting the same asset again does not build a second copy of its material.
+
+An asset is identified by its Bridge id, LOD and texture resolution, plus what
+else shapes its material: the renderer and whether displacement is used. The key is
+stored on the material itself with setAppData, so the index lives in the .max file
+and survives save / load and merges. Every import rebuilds the MAXScript-side index
+once from sceneMaterials.
+
+What happens on a match is the "Reimport_Policy" setting:
+    duplicate  always build a new material, like before the index existed (default)
+    reuse      assign the existing material, build nothing
+    replace    build a new material and swap it in for the existing one everywhere
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+POLICY_REUSE = "reuse"
+POLICY_REPLACE = "replace"
+POLICY_DUPLICATE = "duplicate"
+POLICIES = (POLICY_REUSE, POLICY_REPLACE, POLICY_DUPLICATE)
+DEFAULT_POLICY = POLICY_DUPLICATE
+
+# Resolution suffix of a texture file name, e.g. the "4K" of rock_4K_Albedo.jpg.
+RESOLUTION_PATTERN = re.compile(r"(?<![0-9])([0-9]+)[kK](?![a-zA-Z0-9])")
+
+# setAppData slot holding the asset key on a material ("MS" + 1).
+APPDATA_SLOT = 0x4D5301
+
+
+def AssetResolution(json_data, textureList=()):
+    """
+    Texture resolution of the export ("2K", "4K", ...). Bridge sends it as
+    "resolution"; older payloads only have it in the texture filenames.
+    """
+    resolution_ = json_data.get("resolution")
+    if resolution_:
+        return str(resolution_).upper()
+    for texFormat, texType, texPath in textureList:
+        match_ = RESOLUTION_PATTERN.search(texPath.replace("\\", "/").rsplit("/", 1)[-1])
+        if match_:
+            return match_.group(0).upper()
+    return ""
+
+
+def AssetKey(assetID, lod, resolution, renderer, useDisplacement):
+    displacement_ = "displaced" if useDisplacement else "flat"
+    return f"{assetID}|{lod}|{resolution}|{renderer}|{displacement_}".lower()
+
+
+def GetPolicy(settings):
+    policy_ = str(settings.get("Reimport_Policy", DEFAULT_POLICY)).lower()
+    return policy_ if policy_ in POLICIES else DEFAULT_POLICY
+
+
+class AssetIndex():
+    PRELUDE = """
+        global MSAssetIndexImportID
+        global MSAssetIndex
+        global MSAssetIndexReplace
+        global MSAssetIndexRegister
+        if MSAssetIndexRegister == undefined do (
+            -- Defined by the first import of the 3ds Max session
+            fn MSAssetIndexRegister assetKey newMaterial existingMaterial = (
+                if existingMaterial != undefined and existingMaterial != newMaterial do (
+                    if MSAssetIndexReplace do replaceInstances existingMaterial newMaterial
+                )
+                setAppData newMaterial APPDATASLOT assetKey
+                MSAssetIndex[assetKey] = newMaterial
+            )
+        )
+        if MSAssetIndex == undefined or MSAssetIndexImportID != "IMPORTID" do (
+            MSAssetIndexImportID = "IMPORTID"
+            MSAssetIndexReplace = REPLACEEXISTING
+            MSAssetIndex = Dictionary #string
+            for sceneMat in sceneMaterials do (
+                local assetKey = getAppData sceneMat APPDATASLOT
+                if assetKey != undefined do MSAssetIndex[assetKey] = sceneMat
+            )
+        )
+        """
+
+    def GetPrelude(self, importID, policy):
+        """
+        Index functions and the index rebuild of an import, emitted once per
+        executed script (RendererData.preludes). The first script of an import to
+        run in 3ds Max reads the index back from the scene.
+        """
+        return (
+            self.PRELUDE
+            .replace("IMPORTID", str(importID))
+            .replace("REPLACEEXISTING", str(policy == POLICY_REPLACE).lower())
+            .replace("APPDATASLOT", str(APPDATA_SLOT))
+        )
+
+    def GetLookup(self, assetKey):
+        return f"""
+        msExistingMaterial = undefined
+        if hasDictValue MSAssetIndex "{assetKey}" do (
+            msExistingMaterial = MSAssetIndex["{assetKey}"]
+            if isDeleted msExistingMaterial do msExistingMaterial = undefined
+        )
+        """
+
+    def WrapMaterialSetup(self, assetKey, policy, materialScript, materialName):
+        """
+        Wraps a material setup that leaves its material in the variable materialName.
+        With the reuse policy the setup only runs when the asset has no material yet.
+        """
+        register_ = f"""
+        MSAssetIndexRegister "{assetKey}" {materialName} msExistingMaterial
+        """
+        if policy != POLICY_REUSE:
+            return self.GetLookup(assetKey) + materialScript + register_
+        return self.GetLookup(assetKey) + f"""
+        if msExistingMaterial != undefined then (
+            format "Reusing the scene material % for {assetKey}\\n" msExistingMaterial.name
+            for o in selection do o.material = msExistingMaterial
+        ) else (
+        {materialScript}
+        {register_}
+        )
+        """
+
+
+index = AssetIndex()
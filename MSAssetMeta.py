@@ -0,0 +1,80 @@
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSAssetMeta parses the "meta" list Bridge sends with every asset ({key, name, value}
+entries) once, into an AssetMeta with a case-insensitive key index and the fields
+the Octane setup reads. The fields are read the way the setup always read them:
+the height is the number as written, whatever its unit, and the scan area is in
+metres with only centimetres converted.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+def ParseNumber(value):
+    """
+    The number a meta value starts with: "0.009 m" -> 0.009. Returns None if it
+    does not start with one.
+    """
+    try:
+        return float(value.split()[0])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def ParseScanArea(value):
+    """
+    "0.6x0.6 m" -> (0.6, 0.6), "60x60 cm" -> (0.6, 0.6). Other units are taken
+    as metres, and a size that can not be read as 1 x 1.
+    """
+    parts_ = str(value).split()
+    try:
+        width_, height_ = (float(size_) for size_ in parts_[0].split("x"))
+    except (IndexError, ValueError):
+        width_, height_ = 1.0, 1.0
+    if len(parts_) >= 2 and parts_[1].lower().startswith("cm"):
+        width_ /= 100.0
+        height_ /= 100.0
+    return width_, height_
+
+
+class AssetMeta():
+    __slots__ = ("entries", "index", "height", "scanWidth", "scanHeight", "hasScanArea", "isScaleFixed")
+
+    def __init__(self, meta=None):
+        self.entries = meta or []
+        self.index = {}
+        # Height as written, None if the asset has none or it is not a number.
+        # The displacement has always come from the last readable "height" entry, key as is.
+        self.height = None
+        for entry in self.entries:
+            try:
+                self.index.setdefault(entry["key"].lower(), entry)
+                if entry["key"] == "height":
+                    height_ = ParseNumber(entry.get("value"))
+                    self.height = height_ if height_ is not None else self.height
+            except (KeyError, AttributeError, TypeError):
+                pass
+
+        # Scan area, 1 x 1 if the asset has none.
+        self.hasScanArea = "scanarea" in self.index
+        self.scanWidth, self.scanHeight = ParseScanArea(self.Get("scanarea", "")) if self.hasScanArea else (1.0, 1.0)
+
+        self.isScaleFixed = str(self.Get("isscalefixed", "")).lower() == "true"
+
+    def Get(self, key, default=None):
+        """
+        Returns the value of the first entry whose key matches, ignoring case.
+        """
+        entry_ = self.index.get(key.lower())
+        if entry_ is None:
+            return default
+        return entry_.get("value", default)
+
+    def __contains__(self, key):
+        return key.lower() in self.index
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
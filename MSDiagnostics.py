@@ -0,0 +1,104 @@
+import os, json, threading, tempfile, time, queue
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSDiagnostics writes debug artifacts (generated MAXScript, renderer asset data) off
+the import path.
+
+It is off unless "Diagnostics_Enabled" is set in Settings.json. When on, Record()
+only queues a reference; a background thread serializes it and writes it under
+"Diagnostics_Dir" (default: <temp>/megascans_diagnostics), one folder per asset ID.
+Each folder keeps the newest "Diagnostics_History" files per artifact, and each file
+is capped at "Diagnostics_Max_KB".
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), "megascans_diagnostics")
+
+
+class DiagnosticsSink():
+    def __init__(self):
+        self.isEnabled = False
+        self.directory = DEFAULT_DIRECTORY
+        self.history = 5
+        self.maxBytes = 1024 * 1024
+        self.queue = queue.Queue()
+        self.worker = None
+        self.sequence = 0
+        self.lock = threading.Lock()
+
+    def Configure(self, settings):
+        self.isEnabled = bool(settings.get("Diagnostics_Enabled", False))
+        self.directory = settings.get("Diagnostics_Dir") or DEFAULT_DIRECTORY
+        self.history = max(1, int(settings.get("Diagnostics_History", 5)))
+        self.maxBytes = max(1, int(settings.get("Diagnostics_Max_KB", 1024))) * 1024
+
+    def Record(self, assetID, name, payload, extension="json"):
+        """
+        Queues payload (a string, or anything vars()/json can serialize) to be
+        written as <assetID>/<name>. Does nothing while diagnostics are off.
+        """
+        if not self.isEnabled:
+            return
+        with self.lock:
+            self.sequence += 1
+            sequence_ = self.sequence
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self._Run, name="MSDiagnostics")
+                self.worker.daemon = True
+                self.worker.start()
+        self.queue.put((self.directory, self.history, self.maxBytes, sequence_, assetID, name, payload, extension))
+
+    def Wait(self):
+        """
+        Blocks until everything queued so far has been written.
+        """
+        self.queue.join()
+
+    def _Run(self):
+        while True:
+            item_ = self.queue.get()
+            try:
+                self._Write(*item_)
+            except Exception as e:
+                print(f"MSDiagnostics failed to write {item_[5]}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def _Write(self, directory, history, maxBytes, sequence, assetID, name, payload, extension):
+        if isinstance(payload, str):
+            text_ = payload
+        else:
+            if hasattr(payload, "__dict__"):
+                payload = vars(payload)
+            text_ = json.dumps(payload, indent=4, default=str)
+        data_ = text_.encode("utf-8")
+        if len(data_) > maxBytes:
+            data_ = data_[:maxBytes] + b"\n... truncated at %d bytes\n" % maxBytes
+
+        folder_ = os.path.join(directory, str(assetID or "unknown"))
+        os.makedirs(folder_, exist_ok=True)
+        stamp_ = time.strftime("%Y%m%d-%H%M%S")
+        with open(os.path.join(folder_, "%s_%s_%06d.%s" % (name, stamp_, sequence, extension)), "wb") as f:
+            f.write(data_)
+
+        # Keep only the newest files of this artifact.
+        files_ = sorted(
+            (entry for entry in os.scandir(folder_) if entry.name.startswith(name + "_")),
+            key=lambda entry: (entry.stat().st_mtime_ns, entry.name),
+        )
+        for entry in files_[:-history]:
+            os.remove(entry.path)
+
+
+sink = DiagnosticsSink()
+
+
+def Configure(settings):
+    sink.Configure(settings)
+
+
+def Record(assetID, name, payload, extension="json"):
+    sink.Record(assetID, name, payload, extension)
@@ -0,0 +1,83 @@
+import os
+import MSRuntime
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSFileProbe answers "does this file exist" questions for an import from directory
+listings instead of one filesystem call per question.
+
+Each directory is listed once with os.scandir and kept for the life of the probe,
+which is one import or one bulk batch. On network-mounted Megascans libraries this
+turns a round trip per texture check into one per asset folder. Names are compared
+with os.path.normcase, so lookups are case-insensitive on Windows like the
+filesystem itself. Directories are listed where MSRuntime.MapPath puts them, i.e.
+in the fixture directory of a headless run.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+
+class FileProbe():
+    def __init__(self):
+        self.listings = {}
+        self.entries = {}
+
+    def List(self, directory):
+        """
+        Returns {normcased name: actual name} for directory, listing it only once.
+        """
+        key_ = NormalizePath(directory or ".")
+        listing_ = self.listings.get(key_)
+        if listing_ is None:
+            listing_ = {}
+            entries_ = {}
+            try:
+                with os.scandir(MSRuntime.MapPath(directory or ".")) as scan_:
+                    for entry_ in scan_:
+                        listing_[os.path.normcase(entry_.name)] = entry_.name
+                        entries_[os.path.normcase(entry_.name)] = entry_
+            except OSError:
+                pass
+            self.listings[key_] = listing_
+            self.entries[key_] = entries_
+        return listing_
+
+    def Fingerprint(self, path):
+        """
+        Returns (size, mtime_ns) of path, or None if it does not exist. The listing
+        already carries both on Windows, so this costs no extra filesystem call there.
+        """
+        directory_, name_ = os.path.split(path)
+        self.List(directory_)
+        entry_ = self.entries[NormalizePath(directory_ or ".")].get(os.path.normcase(name_))
+        if entry_ is None:
+            return None
+        try:
+            stat_ = entry_.stat()
+        except OSError:
+            return None
+        return (stat_.st_size, stat_.st_mtime_ns)
+
+    def Exists(self, path):
+        directory_, name_ = os.path.split(path)
+        return os.path.normcase(name_) in self.List(directory_)
+
+    def FindVariant(self, path, extension):
+        """
+        Returns the sibling of path with the same stem and the given extension
+        (e.g. ".exr"), or None if there is none.
+        """
+        directory_, name_ = os.path.split(path)
+        candidate_ = os.path.splitext(name_)[0] + extension
+        actual_ = self.List(directory_).get(os.path.normcase(candidate_))
+        if actual_ is None:
+            return None
+        return os.path.join(directory_, candidate_)
+
+
+def NormalizePath(path):
+    """
+    Key of path in the listings: normalized and normcased, with forward slashes.
+    """
+    return os.path.normcase(os.path.normpath(path)).replace("\\", "/")
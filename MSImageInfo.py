@@ -0,0 +1,167 @@
+import os, struct, threading, collections
+import MSRuntime
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSImageInfo reads the pixel dimensions of EXR, PNG, JPEG and TIFF files from their
+headers, without decoding (or reading) the image data.
+
+Paths are looked up where MSRuntime.MapPath puts them, i.e. in the fixture directory
+of a headless run. Results are cached by path and invalidated when the file's mtime
+or size changes; the cache keeps the MAX_CACHED_SIZES most recently used paths.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+EXR_MAGIC = b"\x76\x2f\x31\x01"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+JPEG_MAGIC = b"\xff\xd8"
+TIFF_MAGICS = (b"II*\x00", b"MM\x00*")
+
+# Upper bound for header bytes read from one file; EXR headers with many channels
+# and JPEGs with large EXIF blocks stay far below it.
+MAX_HEADER_BYTES = 256 * 1024
+
+MAX_CACHED_SIZES = 4096
+
+# {path: ((mtime_ns, size), (width, height) or None)}, least recently used first
+sizeCache = collections.OrderedDict()
+sizeCacheLock = threading.Lock()
+
+
+def GetImageSize(path):
+    """
+    Returns (width, height) of the image at path, or None if the file is missing or
+    not a supported format.
+    """
+    path = MSRuntime.MapPath(path)
+    try:
+        stat_ = os.stat(path)
+    except OSError:
+        return None
+    stamp_ = (stat_.st_mtime_ns, stat_.st_size)
+    with sizeCacheLock:
+        cached_ = sizeCache.get(path)
+        if cached_ is not None and cached_[0] == stamp_:
+            sizeCache.move_to_end(path)
+            return cached_[1]
+
+    try:
+        with open(path, "rb") as fl_:
+            size_ = ReadImageSize(fl_)
+    except (OSError, struct.error, ValueError):
+        size_ = None
+    with sizeCacheLock:
+        sizeCache[path] = (stamp_, size_)
+        sizeCache.move_to_end(path)
+        while len(sizeCache) > MAX_CACHED_SIZES:
+            sizeCache.popitem(last=False)
+    return size_
+
+
+def ReadImageSize(fl_):
+    head_ = fl_.read(32)
+    if head_.startswith(PNG_MAGIC):
+        return ReadPNGSize(head_)
+    if head_.startswith(EXR_MAGIC):
+        fl_.seek(0)
+        return ReadEXRSize(fl_)
+    if head_.startswith(JPEG_MAGIC):
+        fl_.seek(0)
+        return ReadJPEGSize(fl_)
+    if head_[:4] in TIFF_MAGICS:
+        fl_.seek(0)
+        return ReadTIFFSize(fl_)
+    return None
+
+
+def ReadPNGSize(head_):
+    # The IHDR chunk always comes first: length, "IHDR", width, height.
+    if head_[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", head_[16:24])
+
+
+def ReadEXRSize(fl_):
+    # Magic, version, then attributes as: name\0 type\0 int32 size, value.
+    # The size comes from "dataWindow" (box2i: xMin, yMin, xMax, yMax).
+    data_ = fl_.read(4096)
+    position_ = 8
+    while True:
+        nameEnd = data_.find(b"\x00", position_)
+        typeEnd = data_.find(b"\x00", nameEnd + 1) if nameEnd != -1 else -1
+        if nameEnd == -1 or typeEnd == -1 or typeEnd + 5 > len(data_):
+            if len(data_) >= MAX_HEADER_BYTES:
+                return None
+            more_ = fl_.read(len(data_))
+            if not more_:
+                return None
+            data_ += more_
+            continue
+        if nameEnd == position_:
+            return None
+        name_ = data_[position_:nameEnd]
+        valueSize = struct.unpack_from("<i", data_, typeEnd + 1)[0]
+        if valueSize < 0:
+            return None
+        valueStart = typeEnd + 5
+        if name_ == b"dataWindow":
+            while len(data_) < valueStart + 16:
+                more_ = fl_.read(4096)
+                if not more_:
+                    return None
+                data_ += more_
+            xMin, yMin, xMax, yMax = struct.unpack_from("<iiii", data_, valueStart)
+            return (xMax - xMin + 1, yMax - yMin + 1)
+        position_ = valueStart + valueSize
+
+
+def ReadJPEGSize(fl_):
+    # Walk the marker segments up to the first start-of-frame, seeking past the rest.
+    fl_.seek(2)
+    while fl_.tell() < MAX_HEADER_BYTES:
+        marker_ = fl_.read(2)
+        if len(marker_) < 2 or marker_[0] != 0xFF:
+            return None
+        code_ = marker_[1]
+        while code_ == 0xFF:
+            fill_ = fl_.read(1)
+            if not fill_:
+                return None
+            code_ = fill_[0]
+        if code_ == 0x01 or 0xD0 <= code_ <= 0xD7:
+            continue
+        length_ = struct.unpack(">H", fl_.read(2))[0]
+        if length_ < 2:
+            return None
+        if 0xC0 <= code_ <= 0xCF and code_ not in (0xC4, 0xC8, 0xCC):
+            height_, width_ = struct.unpack(">xHH", fl_.read(5))
+            return (width_, height_)
+        fl_.seek(length_ - 2, os.SEEK_CUR)
+    return None
+
+
+def ReadTIFFSize(fl_):
+    head_ = fl_.read(8)
+    order_ = "<" if head_[:2] == b"II" else ">"
+    fl_.seek(struct.unpack(order_ + "I", head_[4:8])[0])
+    count_ = struct.unpack(order_ + "H", fl_.read(2))[0]
+    entries_ = fl_.read(12 * count_)
+    width_ = height_ = None
+    for index_ in range(count_):
+        tag_, type_ = struct.unpack_from(order_ + "HH", entries_, 12 * index_)
+        if tag_ not in (256, 257):
+            continue
+        # SHORT values are left-aligned in the 4-byte value field.
+        if type_ == 3:
+            value_ = struct.unpack_from(order_ + "H", entries_, 12 * index_ + 8)[0]
+        else:
+            value_ = struct.unpack_from(order_ + "I", entries_, 12 * index_ + 8)[0]
+        if tag_ == 256:
+            width_ = value_
+        else:
+            height_ = value_
+    if width_ is None or height_ is None:
+        return None
+    return (width_, height_)
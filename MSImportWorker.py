@@ -0,0 +1,133 @@
+import queue, threading, traceback
+import MSParallelImport
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSImportWorker moves script generation off the 3ds Max main thread.
+
+A single background thread runs LiveLinkImporter.PrepareAsset for every asset of an
+export: JSON parsing, classification, file probing and template rendering. The
+prepared scripts go back to the main thread through a result queue, and only
+LiveLinkImporter.CommitAsset (pymxs.runtime.execute and the other 3ds Max calls)
+runs there.
+
+Results come back in submission order. An export is framed by Begin / Finish:
+the worker hands Begin to the main thread and waits until the main thread has
+started the batch (renderer probe, settings) before preparing the export's assets.
+SubmitAll hands a whole export to MSParallelImport instead, whose process pool
+prepares the assets while this thread posts them back in order.
+
+    worker = ImportWorker(importer, notify)    # notify() is called from the worker
+    worker.Begin()
+    worker.Submit(asset)                       # or worker.SubmitAll(assets, workers)
+    worker.Finish(token)
+    for kind, payload in worker.Drain():       # on the main thread, after notify()
+        ...
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+BEGIN = "begin"
+ASSET = "asset"
+ASSETS = "assets"
+ERROR = "error"
+FINISH = "finish"
+
+
+class ImportWorker():
+    def __init__(self, importer, notify=None):
+        self.Importer = importer
+        self.notify = notify
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.thread = None
+
+    def Start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self._Run, name="MSImportWorker", daemon=True)
+        self.thread.start()
+
+    def Stop(self):
+        """
+        Lets the worker finish the queued jobs and exit.
+        """
+        self.jobs.put(None)
+
+    def Begin(self):
+        self.jobs.put((BEGIN, None))
+
+    def Submit(self, json_data):
+        self.jobs.put((ASSET, json_data))
+
+    def SubmitAll(self, assets, workers=0, executable=None):
+        """
+        Queues the assets of a whole export, prepared on workers processes, see
+        MSParallelImport.GenerateScripts.
+        """
+        self.jobs.put((ASSETS, (assets, workers, executable)))
+
+    def Finish(self, token=None):
+        self.jobs.put((FINISH, token))
+
+    def Drain(self):
+        """
+        Yields the (kind, payload) results ready so far. Call from the main thread:
+            BEGIN   threading.Event to set once the batch is started
+            ASSET   MS_Importer.PreparedAsset to commit
+            ERROR   (asset id, formatted traceback) of an asset that failed
+            FINISH  the token given to Finish
+        """
+        while True:
+            try:
+                yield self.results.get_nowait()
+            except queue.Empty:
+                return
+
+    def _Post(self, kind, payload):
+        self.results.put((kind, payload))
+        if self.notify is not None:
+            self.notify()
+
+    def _Run(self):
+        while True:
+            job_ = self.jobs.get()
+            if job_ is None:
+                return
+            kind_, payload_ = job_
+            if kind_ == BEGIN:
+                started_ = threading.Event()
+                self._Post(BEGIN, started_)
+                started_.wait()
+            elif kind_ == ASSET:
+                try:
+                    prepared_ = self.Importer.PrepareAsset(payload_)
+                except Exception:
+                    self._Post(ERROR, (GetAssetID(payload_), traceback.format_exc()))
+                    continue
+                if prepared_ is not None:
+                    self._Post(ASSET, prepared_)
+            elif kind_ == ASSETS:
+                self._PrepareAll(*payload_)
+            else:
+                self._Post(FINISH, payload_)
+
+    def _PrepareAll(self, assets, workers, executable):
+        posted_ = 0
+        try:
+            for prepared_, error_ in MSParallelImport.GenerateScripts(self.Importer, assets, workers, executable):
+                if error_ is not None:
+                    self._Post(ERROR, (GetAssetID(assets[posted_]), error_))
+                elif prepared_ is not None:
+                    self._Post(ASSET, prepared_)
+                posted_ += 1
+        except Exception:
+            # The pool itself failed: the rest of the export is reported, not imported
+            trace_ = traceback.format_exc()
+            for asset_ in assets[posted_:]:
+                self._Post(ERROR, (GetAssetID(asset_), trace_))
+
+
+def GetAssetID(json_data):
+    return json_data.get("id", "") if isinstance(json_data, dict) else ""
@@ -0,0 +1,173 @@
+import codecs, json, struct
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSLiveLinkStream holds the socket side of the Bridge connection, independent of Qt
+and pymxs so it can run on the monitor thread and in benchmarks.
+
+Bridge writes one JSON array per connection and closes the socket. A sender may
+instead prefix the payload with a frame header (FRAME_MAGIC followed by the payload
+length as an unsigned 64-bit big-endian integer), in which case exactly that many
+bytes are read and the connection does not need to be closed.
+
+JSONArrayStream parses the payload while it arrives and hands out each top-level
+array element as soon as it is complete, so the first asset of a bulk export can be
+imported while the rest is still on the wire.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+# Plugin version, kept here so MS_API can report it without loading the Qt side
+MSLIVELINK_VERSION = "5.5"
+
+BRIDGE_HOST = "localhost"
+BRIDGE_PORT = 13292
+CHUNK_SIZE = 64 * 1024
+FRAME_MAGIC = b"MSLL"
+FRAME_HEADER = struct.Struct("!4sQ")
+
+# Characters that can follow a complete number inside the array.
+NUMBER_ENDS = frozenset([",", "]", " ", "\t", "\r", "\n"])
+
+
+def FramePayload(payload):
+    """
+    Prefixes payload with a frame header, for senders that keep the socket open.
+    """
+    return FRAME_HEADER.pack(FRAME_MAGIC, len(payload)) + payload
+
+
+def IterPayloadChunks(client, chunkSize=CHUNK_SIZE):
+    """
+    Yields the chunks of one Bridge payload from client as they arrive, either up to
+    EOF or up to the end of a single length-framed message.
+    """
+    head_ = bytearray()
+    while len(head_) < FRAME_HEADER.size and FRAME_MAGIC.startswith(bytes(head_[:len(FRAME_MAGIC)])):
+        data_ = client.recv(chunkSize)
+        if not data_:
+            break
+        head_ += data_
+
+    if not head_.startswith(FRAME_MAGIC) or len(head_) < FRAME_HEADER.size:
+        if head_:
+            yield bytes(head_)
+        while True:
+            data_ = client.recv(chunkSize)
+            if not data_:
+                return
+            yield data_
+
+    length_ = FRAME_HEADER.unpack_from(head_)[1]
+    received_ = min(length_, len(head_) - FRAME_HEADER.size)
+    if received_:
+        yield bytes(head_[FRAME_HEADER.size:FRAME_HEADER.size + received_])
+    while received_ < length_:
+        data_ = client.recv(min(chunkSize, length_ - received_))
+        if not data_:
+            raise ConnectionError("Bridge closed the connection after %d of %d bytes" % (received_, length_))
+        received_ += len(data_)
+        yield data_
+
+
+def ReceivePayload(client, chunkSize=CHUNK_SIZE):
+    """
+    Reads one whole Bridge payload from client. Chunks are collected in a list and
+    joined once, so nothing already received is copied again.
+    """
+    return b"".join(IterPayloadChunks(client, chunkSize))
+
+
+class JSONArrayStream():
+    """
+    Incremental parser for the JSON array Bridge sends. Feed() takes raw bytes and
+    returns the top-level elements completed by them; Close() returns whatever is
+    left and raises if the payload was malformed or truncated.
+    A payload that is not an array is parsed whole on Close() and returned as a
+    single element.
+    """
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.textDecoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        # Text received since the buffer was last joined
+        self.chunks = []
+        self.position = 0
+        self.state = "start"
+        self.count = 0
+
+    def Feed(self, data):
+        text_ = self.textDecoder.decode(data)
+        if not text_:
+            return []
+        self.chunks.append(text_)
+        # An element can only have been completed by a closing bracket or brace,
+        # so parsing is only retried when one arrives.
+        if self.state == "start" or (self.state == "items" and ("}" in text_ or "]" in text_)):
+            self._Join()
+            return self._Drain()
+        return []
+
+    def Close(self):
+        self.chunks.append(self.textDecoder.decode(b"", final=True))
+        self._Join()
+        elements_ = self._Drain(final=True)
+        if self.state == "whole":
+            value_ = json.loads(self.buffer)
+            self.buffer = ""
+            elements_ = value_ if isinstance(value_, list) else [value_]
+            self.count += len(elements_)
+        elif self.state != "done" and (self.state != "start" or self.buffer.strip()):
+            raise ValueError("Bridge payload ended inside the JSON array")
+        return elements_
+
+    def _Join(self):
+        # Consumed text is dropped here, so memory stays bounded by the element in flight.
+        self.chunks.insert(0, self.buffer[self.position:])
+        self.buffer = "".join(self.chunks)
+        self.chunks = []
+        self.position = 0
+
+    def _SkipWhitespace(self):
+        buffer_ = self.buffer
+        position_ = self.position
+        while position_ < len(buffer_) and buffer_[position_] in " \t\r\n":
+            position_ += 1
+        self.position = position_
+
+    def _Drain(self, final=False):
+        elements_ = []
+        while self.state in ("start", "items"):
+            self._SkipWhitespace()
+            if self.position >= len(self.buffer):
+                break
+            char_ = self.buffer[self.position]
+
+            if self.state == "start":
+                if char_ != "[":
+                    self.state = "whole"
+                    break
+                self.position += 1
+                self.state = "items"
+            elif char_ == "]":
+                self.position += 1
+                self.state = "done"
+            elif char_ == ",":
+                self.position += 1
+            else:
+                try:
+                    element_, end_ = self.decoder.raw_decode(self.buffer, self.position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break
+                if not final and isinstance(element_, (int, float)) and self.buffer[end_:end_ + 1] not in NUMBER_ENDS:
+                    # A number not yet followed by a separator may still be growing,
+                    # e.g. "10." before its fraction arrives.
+                    break
+                self.position = end_
+                self.count += 1
+                elements_.append(element_)
+        return elements_
@@ -0,0 +1,513 @@
+import collections, os, json, sys, socket, threading, time
+from pymxs import runtime as rt
+
+import MS_Importer
+import MSImportWorker, MSLiveLinkStream, MSParallelImport, MSProfiling, MSTiming
+from Logging import Logger
+
+_path_ = os.path.dirname(__file__).replace("\\", "/")
+
+MSLIVELINK_VERSION = MSLiveLinkStream.MSLIVELINK_VERSION
+
+try:
+    from PySide6.QtGui import *
+    from PySide6.QtCore import *
+    from PySide6.QtWidgets import *
+except ImportError:
+    try:
+        from PySide2.QtGui import *
+        from PySide2.QtCore import *
+        from PySide2.QtWidgets import *
+    except ImportError:
+        try:
+            from PySide.QtGui import *
+            from PySide.QtCore import *
+        except ImportError:
+            try:
+                from PyQt5.QtGui import *
+                from PyQt5.QtCore import *
+                from PyQt5.QtWidgets import *
+            except ImportError:
+                try:
+                    from PyQt4.QtGui import *
+                    from PyQt4.QtCore import *
+                except ImportError:
+                    raise ImportError("No suitable PyQt or PySide version found")
+
+
+
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSLiveLinkUI is the Qt side of the plugin: QLiveLinkMonitor, which receives Bridge
+exports and drives the importer, and the LiveLinkUI window.
+
+MS_API imports it on demand, so 3ds Max startup does not pay for the Qt binding
+probe, the importer and its Settings.json, or the main window lookup. With the
+deferred startup that happens on the first Bridge connection or menu click.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+_importerSetup_ = None
+
+
+def GetImporter():
+    """
+    The LiveLinkImporter of the session, created on first use.
+    """
+    global _importerSetup_
+    if _importerSetup_ is None:
+        _importerSetup_ = MS_Importer.LiveLinkImporter()
+    return _importerSetup_
+
+
+def GetHostApp():
+    try:
+        try:
+            import qtmax
+            mainWindow = qtmax.GetQMaxMainWindow()
+        except:
+            try:
+                mainWindow = QWidget.find(rt.windows.getMAXHWND())
+            except:
+                mainWindow = QApplication.activeWindow()
+
+        while True:
+            lastWin = mainWindow.parent()
+            if lastWin:
+                mainWindow = lastWin
+            else:
+                break
+        return mainWindow
+    except:
+        pass
+
+class BridgeExport():
+    """
+    One Bridge export, from Export_Started until CompleteImport. Exports are imported
+    one after the other; the assets of an export that arrives while another one is
+    still importing are kept here until it starts.
+    """
+    def __init__(self):
+        self.assets = []
+        self.importedAssets = []
+        # Set by FinishImport once the whole export has been received
+        self.assetCount = None
+        self.isStarted = False
+        # How the export imports, decided when it starts, see BeginExport
+        self.isProfiling = False
+        self.isBackgroundImport = False
+        # With Settings "Parallel_Workers" > 1 the assets are kept until the export is
+        # received and their scripts generated on a process pool, see MSParallelImport
+        self.workers = 0
+        self.executable = None
+
+""" QLiveLinkMonitor is a QThread-based thread that monitors a specific port for import.
+Simply put, this class is responsible for communication between your software and Bridge."""
+
+class QLiveLinkMonitor(QThread):
+    Bridge_Call = Signal(object)
+    Export_Started = Signal()
+    Export_Done = Signal(int)
+    Scripts_Ready = Signal()
+    Instance = []
+
+    def __init__(self):
+        super(QLiveLinkMonitor, self).__init__()
+        # BridgeExports, oldest first: the first one is importing, the last one receiving
+        self.Exports = collections.deque()
+        # Scripts are generated on the import worker and executed on the main thread,
+        # see CommitPreparedAssets. Scripts_Ready is emitted from the worker thread.
+        self.Worker = MSImportWorker.ImportWorker(GetImporter(), self.Scripts_Ready.emit)
+        QLiveLinkMonitor.Instance.append(self)
+
+    def __del__(self):
+        self.quit()
+        self.wait()
+
+    def stop(self):
+        self.terminate()
+
+    def run(self):
+        time.sleep(0.025)
+        try:
+            socket_ = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            socket_.bind((MSLiveLinkStream.BRIDGE_HOST, MSLiveLinkStream.BRIDGE_PORT))
+            socket_.listen(5)
+            while True:
+                client, address = socket_.accept()
+                self.ReceiveExport(client)
+        except Exception as e:
+            print(f"Error in QLiveLinkMonitor: {e}")
+
+    def ReceiveExport(self, client):
+        """
+        Reads one Bridge export from client and emits it to the importer slots.
+        Runs on the monitor thread, or on MS_API's BridgeListener thread.
+        """
+        # Every asset is handed to the importer as soon as its JSON is
+        # complete, while the rest of a bulk export is still arriving.
+        stream_ = MSLiveLinkStream.JSONArrayStream()
+        MSTiming.recorder.BeginImport("bridge")
+        self.Export_Started.emit()
+        try:
+            with MSTiming.Span("receive"):
+                for data in MSLiveLinkStream.IterPayloadChunks(client):
+                    for asset_ in stream_.Feed(data):
+                        self.Bridge_Call.emit(asset_)
+                for asset_ in stream_.Close():
+                    self.Bridge_Call.emit(asset_)
+        except Exception as e:
+            print(f"Error receiving Bridge data: {e}")
+        finally:
+            client.close()
+        self.Export_Done.emit(stream_.count)
+
+    def StartImport(self):
+        # An export only starts once the one before it has completed, so that
+        # BeginBatch never resets the batch, settings or file probe of an export
+        # the worker is still preparing.
+        export_ = BridgeExport()
+        self.Exports.append(export_)
+        if len(self.Exports) == 1:
+            self.BeginExport(export_)
+
+    def BeginExport(self, export_):
+        # Every export runs in bulk mode: one renderer probe and settings read, and
+        # the generated scripts are executed in batches, see LiveLinkImporter.BeginBatch.
+        importer = GetImporter()
+        # Profiled imports run on this thread without batching, so that every asset
+        # gets its own profile, see MSProfiling.
+        importer.loadSettings()
+        # Settings changed in LiveLinkUI from here on apply to the next export
+        importer.HoldSettings()
+        export_.isProfiling = MSProfiling.profiler.IsArmed()
+        export_.isBackgroundImport = bool(importer.Settings.get("Background_Import", True)) and not export_.isProfiling
+        if not export_.isProfiling:
+            export_.workers = importer.Settings.get("Parallel_Workers", 0)
+            export_.executable = importer.Settings.get("Parallel_Python") or None
+        export_.isStarted = True
+        if export_.isProfiling:
+            print("Profiling this import, see " + MSProfiling.profiler.directory)
+        elif export_.isBackgroundImport:
+            self.Worker.Start()
+            self.Worker.Begin()
+        else:
+            importer.BeginBatch()
+        assets_ = export_.assets
+        export_.assets = []
+        for asset_ in assets_:
+            self.PrepareAsset(export_, asset_)
+        if export_.assetCount is not None:
+            self.EndExport(export_)
+
+    def ImportAsset(self, asset_):
+        export_ = self.Exports[-1]
+        try:
+            guid = asset_['guid']
+            assetID = asset_['id']
+        except KeyError:
+            guid = ""
+            assetID = ""
+        export_.importedAssets.append((guid, assetID))
+        if export_.isStarted:
+            self.PrepareAsset(export_, asset_)
+        else:
+            export_.assets.append(asset_)
+
+    def PrepareAsset(self, export_, asset_):
+        if export_.workers > 1:
+            export_.assets.append(asset_)
+        elif export_.isBackgroundImport:
+            self.Worker.Submit(asset_)
+        elif export_.isProfiling:
+            MSProfiling.profiler.Profile(asset_.get("id", ""), GetImporter().set_Asset_Data, asset_)
+        else:
+            GetImporter().set_Asset_Data(asset_)
+
+    def FinishImport(self, assetCount):
+        export_ = self.Exports[-1]
+        export_.assetCount = assetCount
+        if export_.isStarted:
+            self.EndExport(export_)
+
+    def EndExport(self, export_):
+        if export_.isBackgroundImport:
+            if export_.workers > 1:
+                self.Worker.SubmitAll(export_.assets, export_.workers, export_.executable)
+            self.Worker.Finish(export_)
+            return
+        try:
+            if export_.workers > 1:
+                importer = GetImporter()
+                generated_ = MSParallelImport.GenerateScripts(importer, export_.assets, export_.workers, export_.executable)
+                for asset_, (prepared_, error_) in zip(export_.assets, generated_):
+                    if error_ is not None:
+                        print(f"Error preparing asset {MSImportWorker.GetAssetID(asset_)}:\n{error_}")
+                    elif prepared_ is not None:
+                        importer.CommitAsset(prepared_)
+        finally:
+            self.CompleteImport(export_)
+
+    def CommitPreparedAssets(self):
+        """
+        Main thread side of the import worker: starts the batch, executes the
+        prepared scripts and completes the import, in the order they were queued.
+        """
+        importer = GetImporter()
+        for kind_, payload_ in self.Worker.Drain():
+            if kind_ == MSImportWorker.BEGIN:
+                try:
+                    importer.BeginBatch()
+                finally:
+                    payload_.set()
+            elif kind_ == MSImportWorker.ASSET:
+                try:
+                    importer.CommitAsset(payload_)
+                except Exception as e:
+                    print(f"Error importing asset {payload_.ID}: {e}")
+            elif kind_ == MSImportWorker.ERROR:
+                assetID, trace_ = payload_
+                print(f"Error preparing asset {assetID}:\n{trace_}")
+            elif kind_ == MSImportWorker.FINISH:
+                self.CompleteImport(payload_)
+
+    def CompleteImport(self, export_):
+        import pymxs
+        try:
+            GetImporter().EndBatch()
+            if MSTiming.recorder.EndImport(export_.assetCount) is not None and isinstance(LiveLinkUI.Instance, LiveLinkUI):
+                LiveLinkUI.Instance.ShowTimings()
+            if export_.isProfiling:
+                self.CountProfiledImport()
+            bridge_event = "BRIDGE_BULK_EXPORT_ASSET" if export_.assetCount > 1 else "BRIDGE_EXPORT_ASSET"
+            rendererClass = MS_Importer.rendererProbe.GetRendererClass()
+            for guid, assetID in export_.importedAssets:
+                try:
+                    Logger(rendererClass, pymxs.runtime.maxversion()[7], guid, assetID, bridge_event)
+                except Exception as e:
+                    Logger(rendererClass, "2019 or lower", guid, assetID, bridge_event)
+                    print(f"Error in CompleteImport Logger: {e}")
+        finally:
+            GetImporter().ReleaseSettings()
+            # Then the next export that was received meanwhile starts
+            self.Exports.popleft()
+            if self.Exports:
+                self.BeginExport(self.Exports[0])
+
+    def CountProfiledImport(self):
+        # Profile_Next_Imports counts down in Settings.json, so the capture switches itself off
+        importer = GetImporter()
+        remaining_ = MSProfiling.profiler.CompleteImport()
+        settings_data = importer.loadSettings()
+        settings_data["Profile_Next_Imports"] = remaining_
+        importer.updateSettings(settings_data)
+        if isinstance(LiveLinkUI.Instance, LiveLinkUI):
+            LiveLinkUI.Instance.profileImports.setChecked(remaining_ > 0)
+
+
+
+
+"""
+#################################################################################################
+#################################################################################################
+"""
+
+stylesheet_ = ("""
+
+QCheckBox { background: transparent; color: #E6E6E6; font-family: Source Sans Pro; font-size: 14px; }
+QCheckBox::indicator:hover { border: 2px solid #2B98F0; background-color: transparent; }
+QCheckBox::indicator:checked:hover { background-color: #2B98F0; border: 2px solid #73a5ce; }
+QCheckBox:indicator{ color: #67696a; background-color: transparent; border: 2px solid #67696a;
+width: 14px; height: 14px; border-radius: 2px; }
+QCheckBox::indicator:checked { border: 2px solid #18191b;
+background-color: #2B98F0; color: #ffffff; }
+QCheckBox::hover { spacing: 12px; background: transparent; color: #ffffff; }
+QCheckBox::checked { color: #ffffff; }
+QCheckBox::indicator:disabled, QRadioButton::indicator:disabled { border: 1px solid #444; }
+QCheckBox:disabled { background: transparent; color: #414141; font-family: Source Sans Pro;
+font-size: 14px; margin: 0px; text-align: center; }
+
+QComboBox { color: #FFFFFF; font-size: 14px; font-family: Source Sans Pro;
+selection-background-color: #1d1e1f; background-color: #1d1e1f; }
+QComboBox:hover { color: #c9c9c9; font-size: 14px; font-family: Source Sans Pro;
+selection-background-color: #232426; background-color: #232426; } """)
+
+
+"""
+#################################################################################################
+#################################################################################################
+"""
+
+class LiveLinkUI(QWidget):
+
+    Instance = []
+    Settings = [0, 0, 0]
+
+
+    # UI Widgets
+
+    def __init__(self, _importerSetup_, parent=None):
+        # The 3ds Max main window is looked up when the UI is first opened
+        if parent is None:
+            parent = GetHostApp()
+        super(LiveLinkUI, self).__init__(parent)
+
+        LiveLinkUI.Instance = self
+        self.Importer = _importerSetup_
+
+        self._path_ = _path_
+        self.setObjectName("LiveLinkUI")
+        img_ = QPixmap( os.path.join(self._path_, "MS_Logo.png") )
+        self.setWindowIcon(QIcon(img_))
+        self.setMinimumWidth(250)
+        self.setWindowTitle("MS Plugin " + MSLIVELINK_VERSION + " - 3ds Max")
+        self.setWindowFlags(Qt.Window)
+
+        self.style_ = ("""  QWidget#LiveLinkUI { background-color: #262729; } """)
+        self.setStyleSheet(self.style_)
+
+        # style_ = ("QLabel {background-color: #232325; font-size: 14px;font-family: Source Sans Pro; color: #afafaf;}")
+
+        # Set the main layout
+        self.MainLayout = QVBoxLayout()
+        self.setLayout(self.MainLayout)
+        self.MainLayout.setSpacing(5)
+        self.MainLayout.setContentsMargins(5, 2, 5, 2)
+
+
+        # Set the checkbox options
+
+        self.checks_l = QVBoxLayout()
+        self.checks_l.setSpacing(2)
+        self.MainLayout.addLayout(self.checks_l)
+
+        self.applytoSel = QCheckBox("Apply Material to Selection")
+        self.applytoSel.setToolTip("Applies the imported material(s) to your selection.")
+        self.applytoSel.setChecked( self.Importer.getPref("Material_to_Sel") )
+        self.applytoSel.setFixedHeight(30)
+        self.applytoSel.setStyleSheet(stylesheet_)
+        self.checks_l.addWidget(self.applytoSel)
+        
+        
+        # Enable Displacement Check Box
+        # Set the checkbox options
+
+        self.checks_l = QVBoxLayout()
+        self.checks_l.setSpacing(2)
+        self.MainLayout.addLayout(self.checks_l)
+
+        self.enableDisplacement = QCheckBox("Import 3D Assets with Displacement")
+        self.enableDisplacement.setToolTip("Enables displacement for 3D Assets")
+        self.enableDisplacement.setChecked( self.Importer.getPref("Enable_Displacement") )
+        self.enableDisplacement.setFixedHeight(30)
+        self.enableDisplacement.setStyleSheet(stylesheet_)
+        self.checks_l.addWidget(self.enableDisplacement)
+        
+        
+        # Import timings (MSTiming): the last imports, exportable as JSON
+
+        self.timings_l = QVBoxLayout()
+        self.timings_l.setSpacing(2)
+        self.MainLayout.addLayout(self.timings_l)
+
+        self.recordTimings = QCheckBox("Record Import Timings")
+        self.recordTimings.setToolTip("Times receiving, script generation and 3ds Max execution of every import.")
+        self.recordTimings.setChecked( self.Importer.Settings.get("Timing_Enabled", False) )
+        self.recordTimings.setFixedHeight(30)
+        self.recordTimings.setStyleSheet(stylesheet_)
+        self.timings_l.addWidget(self.recordTimings)
+
+        self.timingsList = QListWidget()
+        self.timingsList.setToolTip("The most recent imports, newest first.")
+        self.timingsList.setFixedHeight(90)
+        self.timings_l.addWidget(self.timingsList)
+
+        self.exportTimings = QPushButton("Export Timings...")
+        self.exportTimings.clicked.connect(self.exportTimingsClicked)
+        self.timings_l.addWidget(self.exportTimings)
+        self.ShowTimings()
+
+        self.profileImports = QCheckBox("Profile Next Import")
+        self.profileImports.setToolTip("Writes cProfile and tracemalloc data per asset for the next import(s) (Profile_Import_Count).")
+        self.profileImports.setChecked( self.Importer.Settings.get("Profile_Next_Imports", 0) > 0 )
+        self.profileImports.setFixedHeight(30)
+        self.profileImports.setStyleSheet(stylesheet_)
+        self.timings_l.addWidget(self.profileImports)
+
+        # Save current import settings
+        self.applytoSel.stateChanged.connect(self.settingsChanged)
+        self.enableDisplacement.stateChanged.connect(self.settingsChanged)
+        self.recordTimings.stateChanged.connect(self.settingsChanged)
+        self.profileImports.stateChanged.connect(self.settingsChanged)
+
+    # UI Callbacks
+    def settingsChanged(self):
+        settings_data = self.Importer.loadSettings()
+        settings_data["Material_to_Sel"] = self.applytoSel.isChecked()
+        settings_data["Enable_Displacement"] = self.enableDisplacement.isChecked()
+        settings_data["Timing_Enabled"] = self.recordTimings.isChecked()
+        if self.profileImports.isChecked() != (settings_data.get("Profile_Next_Imports", 0) > 0):
+            settings_data["Profile_Next_Imports"] = (
+                max(1, int(settings_data.get("Profile_Import_Count", 1))) if self.profileImports.isChecked() else 0
+            )
+        self.Importer.updateSettings(settings_data)
+
+    def ShowTimings(self):
+        history_ = MSTiming.recorder.GetHistory()
+        self.timingsList.clear()
+        for timing_ in reversed(history_):
+            self.timingsList.addItem(timing_.Summary())
+        self.exportTimings.setEnabled(bool(history_))
+
+    def exportTimingsClicked(self):
+        path_, filter_ = QFileDialog.getSaveFileName(self, "Export Import Timings", "import_timings.json", "JSON (*.json)")
+        if path_:
+            try:
+                MSTiming.recorder.Export(path_)
+            except Exception as e:
+                print(f"Could not export the import timings: {e}")
+
+# LIVELINK INITIALIZER
+
+def initLiveLink():
+
+    if LiveLinkUI.Instance != None:
+        try: LiveLinkUI.Instance.close()
+        except: pass
+
+    LiveLinkUI.Instance = LiveLinkUI(GetImporter())
+    LiveLinkUI.Instance.show()
+    pref_geo = QRect(500, 300, 460, 30)
+    LiveLinkUI.Instance.setGeometry(pref_geo)
+    return LiveLinkUI.Instance
+
+
+def CreateMonitor():
+    """
+    Creates the QLiveLinkMonitor and connects the importer slots, without starting
+    its socket thread. Call on the main thread; MS_API's BridgeListener does through
+    MSMainThread.RunOnMainThread.
+    """
+    if len(QLiveLinkMonitor.Instance) != 0:
+        return QLiveLinkMonitor.Instance[0]
+    bridge_monitor = QLiveLinkMonitor()
+    bridge_monitor.Export_Started.connect(bridge_monitor.StartImport)
+    bridge_monitor.Bridge_Call.connect(bridge_monitor.ImportAsset)
+    bridge_monitor.Export_Done.connect(bridge_monitor.FinishImport)
+    bridge_monitor.Scripts_Ready.connect(bridge_monitor.CommitPreparedAssets)
+    return bridge_monitor
+
+
+# Start the LiveLink server here.
+def StartSocketServer():
+    try:
+        if len(QLiveLinkMonitor.Instance) == 0:
+            CreateMonitor().start()
+        print("Quixel Bridge Plugin v" + MSLIVELINK_VERSION + " started successfully.")
+        
+    except:
+        print("Quixel Bridge Plugin v" + MSLIVELINK_VERSION + " failed to start.")
+        pass
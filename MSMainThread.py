@@ -0,0 +1,98 @@
+import threading
+
+try:
+    from PySide6.QtCore import QCoreApplication, QObject, QThread, Signal, Slot
+except ImportError:
+    try:
+        from PySide2.QtCore import QCoreApplication, QObject, QThread, Signal, Slot
+    except ImportError:
+        try:
+            from PySide.QtCore import QCoreApplication, QObject, QThread, Signal, Slot
+        except ImportError:
+            try:
+                from PyQt5.QtCore import QCoreApplication, QObject, QThread, pyqtSignal as Signal, pyqtSlot as Slot
+            except ImportError:
+                try:
+                    from PyQt4.QtCore import QCoreApplication, QObject, QThread, pyqtSignal as Signal, pyqtSlot as Slot
+                except ImportError:
+                    raise ImportError("No suitable PyQt or PySide version found")
+
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSMainThread runs functions on the 3ds Max main thread (the thread of the
+QApplication) from any other thread, e.g. MS_API's BridgeListener.
+
+It only needs QtCore, and MS_API imports it on first use rather than at 3ds Max
+startup. Install() creates the dispatcher on the main thread, which MS_API does
+once the UI is loaded (menu click). Before that, the first RunOnMainThread from
+another thread (the first Bridge connection) creates it on that thread and moves
+it to the main thread.
+
+    MSMainThread.Install()                              # on the main thread
+    monitor = MSMainThread.RunOnMainThread(Create)      # from any thread
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+
+class MainThreadCall(QObject):
+    """
+    Runs functions on the thread of the QApplication, from any other thread.
+    """
+    Call = Signal(object)
+
+    def __init__(self):
+        super(MainThreadCall, self).__init__()
+        self.moveToThread(QCoreApplication.instance().thread())
+        self.Call.connect(self.Run)
+
+    @Slot(object)
+    def Run(self, function):
+        function()
+
+
+mainThreadCall = None
+
+
+def Install():
+    """
+    Creates the dispatcher. Call on the main thread.
+    """
+    global mainThreadCall
+    if mainThreadCall is None and QCoreApplication.instance() is not None:
+        mainThreadCall = MainThreadCall()
+
+
+def IsMainThread():
+    app_ = QCoreApplication.instance()
+    return app_ is None or QThread.currentThread() == app_.thread()
+
+
+def RunOnMainThread(function):
+    """
+    Calls function on the main thread, waits for it and returns its result.
+    """
+    global mainThreadCall
+    if IsMainThread():
+        return function()
+    if mainThreadCall is None:
+        # Made on this thread and moved to the main thread, see MainThreadCall
+        mainThreadCall = MainThreadCall()
+    result_ = {}
+    done_ = threading.Event()
+
+    def Call():
+        try:
+            result_["value"] = function()
+        except Exception as e:
+            result_["error"] = e
+        finally:
+            done_.set()
+
+    mainThreadCall.Call.emit(Call)
+    done_.wait()
+    if "error" in result_:
+        raise result_["error"]
+    return result_.get("value")
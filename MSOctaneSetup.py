@@ -1,85 +1,383 @@
 import os, sys, json
-import MSLiveLinkHelpers
-from pymxs import runtime as rt  # Import pymxs for MAXScript interaction
+from functools import lru_cache
+import MSLiveLinkHelpers, MSAssetIndex, MSDiagnostics, MSImageInfo, MSTemplate, MSTiming
 
 helper = MSLiveLinkHelpers.LiveLinkHelper()
 
+# Octane displacement levelOfDetail range, as log2 of the texture resolution.
+DISPLACEMENT_LOD_MIN = 8
+DISPLACEMENT_LOD_MAX = 13
+
+# Texture type (Bridge component type) behind each bitmap variable of TextureSetup.
+BITMAP_TEXTURE_TYPES = {
+    "albedoBitmap": "albedo",
+    "metallicBitmap": "metalness",
+    "roughnessBitmap": "roughness",
+    "glossBitmap": "gloss",
+    "specularBitmap": "specular",
+    "normalBitmap": "normal",
+    "displacementBitmap": "displacement",
+    "opacityBitmap": "opacity",
+    "translucencyBitmap": "translucency",
+    "transmissionBitmap": "transmission",
+    "bumpBitmap": "bump",
+    "cavityBitmap": "cavity",
+    "fuzzBitmap": "fuzz",
+}
+
+class OctaneNodeRegistry():
+    """
+    Shares Octane texture nodes within one import (a single asset or a whole bulk
+    export). The MAXScript side keeps a dictionary of the nodes created so far:
+    image nodes are keyed by (node type, filename, colorspace, gamma, transform,
+    projection) and transform nodes by their scales, so sub-materials and assets
+    pointing at the same files reuse one node. The dictionary is reset when a new
+    import id shows up, and the created / reused counts are printed per asset.
+    """
+    PRELUDE = """
+        global MSOctaneImportID
+        global MSOctaneNodes
+        global MSOctaneNodeStats
+        global MSOctaneNodeKey
+        global MSOctaneImageKey
+        global MSOctaneImageNode
+        global MSOctaneTransformNode
+        global MSOctaneProjectionNode
+        if MSOctaneProjectionNode == undefined do (
+            -- Defined by the first import of the 3ds Max session
+            fn MSOctaneNodeKey node = (
+                if node == undefined then "-" else ((getHandleByAnim node) as string)
+            )
+            fn MSOctaneImageKey nodeClass fileName colorSpaceName gammaValue transformNode projectionNode = (
+                (nodeClass as string) + "|" + (toLower fileName) + "|" + colorSpaceName + "|" + (gammaValue as string) + "|" + (MSOctaneNodeKey transformNode) + "|" + (MSOctaneNodeKey projectionNode)
+            )
+            fn MSOctaneImageNode nodeClass fileName colorSpaceName gammaValue transformNode projectionNode = (
+                local key = MSOctaneImageKey nodeClass fileName colorSpaceName gammaValue transformNode projectionNode
+                if hasDictValue MSOctaneNodes key then (
+                    MSOctaneNodeStats[2] += 1
+                    MSOctaneNodes[key]
+                ) else (
+                    local imageNode = nodeClass()
+                    imageNode.gamma = gammaValue
+                    imageNode.colorSpace = colorSpaceName
+                    imageNode.filename = fileName
+                    if transformNode != undefined do imageNode.transform = transformNode
+                    if projectionNode != undefined do imageNode.Projection = projectionNode
+                    MSOctaneNodeStats[1] += 1
+                    MSOctaneNodes[key] = imageNode
+                    imageNode
+                )
+            )
+            fn MSOctaneTransformNode scale1 scale2 = (
+                local key = "_2D_transformation|" + (scale1 as string) + "|" + (scale2 as string)
+                if hasDictValue MSOctaneNodes key then (
+                    MSOctaneNodeStats[2] += 1
+                    MSOctaneNodes[key]
+                ) else (
+                    local transformNode = _2D_transformation()
+                    transformNode.name = "Shared_Transform_9876"
+                    transformNode.scale1 = scale1
+                    transformNode.scale2 = scale2
+                    MSOctaneNodeStats[1] += 1
+                    MSOctaneNodes[key] = transformNode
+                    transformNode
+                )
+            )
+            fn MSOctaneProjectionNode = (
+                local key = "Mesh_UV_projection"
+                if hasDictValue MSOctaneNodes key then (
+                    MSOctaneNodeStats[2] += 1
+                    MSOctaneNodes[key]
+                ) else (
+                    local projectionNode = Mesh_UV_projection()
+                    projectionNode.name = "Shared_Projection_5678"
+                    MSOctaneNodeStats[1] += 1
+                    MSOctaneNodes[key] = projectionNode
+                    projectionNode
+                )
+            )
+        )
+        if MSOctaneNodes == undefined or MSOctaneImportID != "IMPORTID" do (
+            -- First script of this import: start from an empty registry
+            MSOctaneImportID = "IMPORTID"
+            MSOctaneNodes = Dictionary #string
+            MSOctaneNodeStats = #(0, 0)
+            if SEEDNODES do (
+                -- Reuse policy: nodes already in the scene are part of the registry
+                for transformNode in getClassInstances _2D_transformation where transformNode.name == "Shared_Transform_9876" do (
+                    local key = "_2D_transformation|" + (transformNode.scale1 as string) + "|" + (transformNode.scale2 as string)
+                    if not hasDictValue MSOctaneNodes key do MSOctaneNodes[key] = transformNode
+                )
+                for projectionNode in getClassInstances Mesh_UV_projection where projectionNode.name == "Shared_Projection_5678" do (
+                    if not hasDictValue MSOctaneNodes "Mesh_UV_projection" do MSOctaneNodes["Mesh_UV_projection"] = projectionNode
+                )
+                for nodeClass in #(RGB_image, Grayscale_image) do (
+                    for imageNode in getClassInstances nodeClass where imageNode.filename != undefined and imageNode.filename != "" do (
+                        local key = MSOctaneImageKey nodeClass imageNode.filename imageNode.colorSpace imageNode.gamma imageNode.transform imageNode.Projection
+                        if not hasDictValue MSOctaneNodes key do MSOctaneNodes[key] = imageNode
+                    )
+                )
+            )
+        )
+        """
+
+    def GetPrelude(self, importID, seedFromScene=False):
+        """
+        Node registry functions and the registry reset of an import. It goes in
+        RendererData.preludes, so the importer emits it once per executed script
+        rather than once per asset. The first script of an import to run in 3ds Max
+        starts from an empty registry, or from the scene's nodes with seedFromScene.
+        The check is made in MAXScript, so scripts generated out of order or in
+        other processes agree on it.
+        """
+        return (
+            self.PRELUDE
+            .replace("IMPORTID", str(importID))
+            .replace("SEEDNODES", str(seedFromScene).lower())
+        )
+
+    def GetReport(self, materialName):
+        return f"""
+        format "Octane texture nodes after \\"{materialName}\\": % created, % reused in this import\\n" MSOctaneNodeStats[1] MSOctaneNodeStats[2]
+        """
+
+    def ImageNode(self, nodeClass, bitmapName, colorSpace, gamma, shared=True):
+        """
+        MAXScript expression returning the registry's image node for bitmapName.
+        """
+        transform_ = "trans2D meshUV" if shared else "undefined undefined"
+        return f'MSOctaneImageNode {nodeClass} {bitmapName}.filename "{colorSpace}" {gamma} {transform_}'
+
+
+nodeRegistry = OctaneNodeRegistry()
+
+
+def ImageSlotBlock(target, branches, shared=True):
+    """
+    MAXScript block assigning target from the first bitmap of branches that is set
+    and passes its file check. branches are (bitmapName, nodeClass, colorSpace, gamma).
+    """
+    block_ = ""
+    for bitmapName, nodeClass, colorSpace, gamma in branches:
+        keyword_ = "else if" if block_ else "if"
+        block_ += f"""        {keyword_} {bitmapName} != undefined then (
+            if OCT_CHECK_{bitmapName} then (
+                {target} = {nodeRegistry.ImageNode(nodeClass, bitmapName, colorSpace, gamma, shared)}
+            )
+        )
+"""
+    return block_ + "\n"
+
+
+LINEAR = "_OctaneBuildIn_LINEAR_sRGB"
+SRGB = "_OctaneBuildIn_sRGB"
+
+OPAQUE_HEADER = """
+        OCT_NODENAME = universal_material()
+        OCT_NODENAME.name = "OCT_MATNAME"
+        -- Set all texture input types to "texture" mode (2)
+        OCT_NODENAME.albedo_input_type = 2
+        OCT_NODENAME.metallic_input_type = 2
+        OCT_NODENAME.roughness_input_type = 2
+        OCT_NODENAME.opacity_input_type = 2
+        OCT_NODENAME.specular_input_type = 2
+        OCT_NODENAME.normal_input_type = 2
+        OCT_NODENAME.transmission_input_type = 2
+
+        -- Shared transform and projection nodes, reused from the node registry
+        -- Check if scale is fixed
+        isScaleFixed = OCT_SCALEFIXED
+        if isScaleFixed then (
+            transScale1 = 1.0
+            transScale2 = 1.0
+        ) else (
+            -- Base scale from asset metadata (assumed to be in meters)
+            baseScale1 = OCT_SCALE1
+            baseScale2 = OCT_SCALE2
+            -- Determine the system unit type and set the scale multiplier
+            scaleMultiplier = 1.0  -- Default for meters
+            case units.SystemType of (
+                #meters: scaleMultiplier = 1.0
+                #centimeters: scaleMultiplier = 100.0
+                #millimeters: scaleMultiplier = 1000.0
+                #kilometers: scaleMultiplier = 0.001
+                #inches: scaleMultiplier = 39.3701
+                #feet: scaleMultiplier = 3.28084
+                #miles: scaleMultiplier = 0.000621371
+                default: (
+                    format "Warning: Unknown system unit type %, defaulting to meters (scaleMultiplier = 1.0)\\n" units.SystemType
+                    scaleMultiplier = 1.0
+                )
+            )
+            -- Apply the multiplier to the base scales
+            transScale1 = baseScale1 * scaleMultiplier
+            transScale2 = baseScale2 * scaleMultiplier
+        )
+        trans2D = MSOctaneTransformNode transScale1 transScale2
+        meshUV = MSOctaneProjectionNode()
+
+"""
+
+DISPLACEMENT_BLOCK = """
+        -- Displacement
+        if displacementBitmap != undefined then (
+            if OCT_CHECK_displacementBitmap do (
+                OCT_NODENAME.displacement = Texture_displacement()
+                OCT_NODENAME.displacement.texture_input_type = 2
+                OCT_NODENAME.displacement.amount = OCT_DISPAMOUNT
+                OCT_NODENAME.displacement.levelOfDetail = OCT_DISPLOD
+                OCT_NODENAME.displacement.black_level = 0.5
+
+                OCT_NODENAME.displacement.texture_tex = %s
+            )
+        )
+""" % nodeRegistry.ImageNode("Grayscale_image", "displacementBitmap", LINEAR, 1.0)
+
+COATING_BLOCK = """
+        -- Coating for polished surfaces
+        OCT_NODENAME.coating_input_type = 0  -- Value mode
+        OCT_NODENAME.coating_value = 1.0     -- Enable coating
+        OCT_NODENAME.coatingRoughness_input_type = 0  -- Value mode
+        OCT_NODENAME.coatingRoughness_value = 0.01    -- Smooth coating
+"""
+
+# Opaque material blocks in script order: (texture types that need the block, block).
+# None marks where the displacement and coating blocks go.
+OPAQUE_SLOT_BLOCKS = [
+    (frozenset(["albedo"]), "        -- Albedo (set up base texture with shared transform/projection)\n" + ImageSlotBlock(
+        "OCT_NODENAME.albedo_tex", [("albedoBitmap", "RGB_image", SRGB, 2.2)])),
+    (frozenset(["metalness"]), "        -- Metallic\n" + ImageSlotBlock(
+        "OCT_NODENAME.metallic_tex", [("metallicBitmap", "Grayscale_image", LINEAR, 1.0)])),
+    (frozenset(["roughness", "gloss"]), "        -- Roughness\n" + ImageSlotBlock(
+        "OCT_NODENAME.roughness_tex", [("roughnessBitmap", "Grayscale_image", LINEAR, 1.0),
+                                       ("glossBitmap", "Grayscale_image", LINEAR, 1.0)])),
+    (frozenset(["specular"]), "        -- Specular\n" + ImageSlotBlock(
+        "OCT_NODENAME.specular_tex", [("specularBitmap", "RGB_image", LINEAR, 1.0)])),
+    (frozenset(["normal"]), "        -- Normal\n" + ImageSlotBlock(
+        "OCT_NODENAME.normal_tex", [("normalBitmap", "RGB_image", LINEAR, 1.0)])),
+    None,
+    (frozenset(["opacity"]), "        -- Opacity\n" + ImageSlotBlock(
+        "OCT_NODENAME.opacity_tex", [("opacityBitmap", "Grayscale_image", LINEAR, 1.0)])),
+    (frozenset(["translucency", "transmission"]), "        -- Transmission / Translucency\n" + ImageSlotBlock(
+        "OCT_NODENAME.transmission_tex", [("translucencyBitmap", "RGB_image", SRGB, 2.2),
+                                          ("transmissionBitmap", "Grayscale_image", LINEAR, 1.0)])),
+    # Bump, Cavity, Fuzz (these nodes are created but not connected)
+    (frozenset(["bump"]), ImageSlotBlock("local BumpNode", [("bumpBitmap", "Grayscale_image", LINEAR, 1.0)])),
+    (frozenset(["cavity"]), ImageSlotBlock("local CavityNode", [("cavityBitmap", "Grayscale_image", LINEAR, 1.0)])),
+    (frozenset(["fuzz"]), ImageSlotBlock("local FuzzNode", [("fuzzBitmap", "Grayscale_image", LINEAR, 1.0)])),
+]
+
+GLASS_HEADER = """
+        OCT_NODENAME = specular_material()
+        OCT_NODENAME.name = "OCT_MATNAME"
+        -- Set texture input types for the channels used
+        OCT_NODENAME.roughness_input_type = 2
+        OCT_NODENAME.normal_input_type = 2
+
+"""
+
+GLASS_SLOT_BLOCKS = [
+    (frozenset(["roughness", "gloss"]), "        -- Roughness\n" + ImageSlotBlock(
+        "OCT_NODENAME.roughness_tex", [("roughnessBitmap", "Grayscale_image", LINEAR, 1.0),
+                                       ("glossBitmap", "Grayscale_image", LINEAR, 1.0)], shared=False)),
+    (frozenset(["normal"]), "        -- Normal\n" + ImageSlotBlock(
+        "OCT_NODENAME.normal_tex", [("normalBitmap", "RGB_image", LINEAR, 1.0)], shared=False)),
+]
+
+GLASS_FOOTER = """
+        OCT_NODENAME.index = 1.5
+"""
+
+MATERIAL_TOKENS = (
+    "OCT_NODENAME", "OCT_MATNAME", "OCT_SCALEFIXED", "OCT_SCALE1", "OCT_SCALE2", "OCT_DISPAMOUNT", "OCT_DISPLOD",
+) + tuple("OCT_CHECK_" + bitmapName for bitmapName in BITMAP_TEXTURE_TYPES)
+MATERIAL_PLACEHOLDERS = MSTemplate.Placeholders(MATERIAL_TOKENS)
+
+
+def GetAssetShape(blocks, textureTypes):
+    """
+    Indexes of the blocks an asset with textureTypes needs. Without textureTypes
+    every block is emitted, as the runtime checks skip the missing bitmaps anyway.
+    """
+    if textureTypes is None:
+        return tuple(range(len(blocks)))
+    textureTypes = frozenset(textureTypes)
+    return tuple(
+        index_ for index_, block_ in enumerate(blocks)
+        if block_ is None or not block_[0].isdisjoint(textureTypes)
+    )
+
+
+@lru_cache(maxsize=64)
+def GetOpaqueShape(textureTypes):
+    return GetAssetShape(OPAQUE_SLOT_BLOCKS, textureTypes)
+
+
+@lru_cache(maxsize=64)
+def GetGlassShape(textureTypes):
+    return GetAssetShape(GLASS_SLOT_BLOCKS, textureTypes)
+
+
+@lru_cache(maxsize=64)
+def GetCheckContext(verifiedTextures):
+    """
+    Template context of every material token, with the MAXScript file check of each
+    bitmap and empty values for the rest. Files the importer already found on disk
+    are not checked again with doesFileExist.
+    """
+    context_ = dict.fromkeys(MATERIAL_TOKENS, "")
+    for bitmapName, textureType in BITMAP_TEXTURE_TYPES.items():
+        context_["OCT_CHECK_" + bitmapName] = (
+            "true" if textureType in verifiedTextures else f"doesFileExist {bitmapName}.filename"
+        )
+    return context_
+
+
+@lru_cache(maxsize=256)
+def CompileOpaqueMaterial(shape, withDisplacement, withCoating):
+    parts_ = [OPAQUE_HEADER]
+    for index_ in shape:
+        block_ = OPAQUE_SLOT_BLOCKS[index_]
+        if block_ is None:
+            parts_.append(DISPLACEMENT_BLOCK if withDisplacement else "        --No displacement\n")
+            if withCoating:
+                parts_.append(COATING_BLOCK)
+        else:
+            parts_.append(block_[1])
+    return MSTemplate.CompiledTemplate("".join(parts_), MATERIAL_PLACEHOLDERS)
+
+
+@lru_cache(maxsize=16)
+def CompileGlassMaterial(shape):
+    parts_ = [GLASS_HEADER]
+    parts_ += [GLASS_SLOT_BLOCKS[index_][1] for index_ in shape]
+    parts_.append(GLASS_FOOTER)
+    return MSTemplate.CompiledTemplate("".join(parts_), MATERIAL_PLACEHOLDERS)
+
+
 class OctaneSetup():
+    @MSTiming.Timed("material")
     def GetMaterialSetup(self, assetData):
         """
         Creates either a single or multi-material for Octane without using any Slate Editor functionality.
         """
-        # Debug: Write assetData to C:\temp\assetData.json
-        debug_path = r"C:\temp\assetData.json"
-        os.makedirs(os.path.dirname(debug_path), exist_ok=True)
-        try:
-            with open(debug_path, 'w') as f:
-                json.dump(vars(assetData), f, indent=4, default=str)
-        except Exception as e:
-            print(f"Failed to write assetData to {debug_path}: {e}")
-
-        # Extract displacement amount from meta
-        displacement_amount = 0.013  # Default
-        for entry in assetData.meta:
-            if entry["key"] == "height":
-                try:
-                    displacement_amount = float(entry["value"].split()[0])  # e.g., "0.009 m" -> 0.009
-                except (ValueError, IndexError):
-                    pass
-
-        # Extract scanArea scale from meta
-        scan_scale1 = 1.0
-        scan_scale2 = 1.0
-        for entry in assetData.meta:
-            if entry["key"].lower() == "scanarea":
-                val = entry["value"]  # e.g. "0.6x0.6 m" or "60x60 cm"
-                parts = val.split()
-                if len(parts) >= 1:
-                    dims = parts[0]  # "0.6x0.6" or "60x60"
-                    dims_parts = dims.split("x")
-                    if len(dims_parts) == 2:
-                        try:
-                            scale1 = float(dims_parts[0])
-                            scale2 = float(dims_parts[1])
-                        except:
-                            scale1 = 1.0
-                            scale2 = 1.0
-                    else:
-                        scale1 = 1.0
-                        scale2 = 1.0
-                else:
-                    scale1 = 1.0
-                    scale2 = 1.0
-                unit = "m"
-                if len(parts) >= 2:
-                    unit = parts[1].lower()
-                if unit.startswith("cm"):
-                    scale1 /= 100.0
-                    scale2 /= 100.0
-                scan_scale1 = scale1
-                scan_scale2 = scale2
-                break
+        # Debug: keep assetData (when diagnostics are on), written off the import path
+        MSDiagnostics.Record(assetData.assetID, "assetData", assetData)
 
-        # Extract isScaleFixed from meta
-        is_scale_fixed = False  # Default to False
-        for entry in assetData.meta:
-            if entry["key"].lower() == "isscalefixed":
-                is_scale_fixed = entry["value"].lower() == "true"
-                break
+        # Displacement amount, scan area and isScaleFixed from the pre-parsed meta
+        assetMeta = assetData.assetMeta
+        displacement_amount = 0.013  # Default
+        if assetMeta.height is not None:
+            displacement_amount = assetMeta.height  # e.g., "0.009 m" -> 0.009
+        scan_scale1 = assetMeta.scanWidth
+        scan_scale2 = assetMeta.scanHeight
+        is_scale_fixed = assetMeta.isScaleFixed
 
-        # Extract LoD from displacement filename
+        # LoD from the displacement map's real size, falling back to its filename
         displacement_lod = 13  # Default to 8k
         for tex_type, tex_name, tex_path in assetData.textureList:
             if tex_name == "displacement":
-                filename = tex_path.lower()
-                if "1k" in filename:
-                    displacement_lod = 10  # 1024x1024
-                elif "2k" in filename:
-                    displacement_lod = 11  # 2048x2048
-                elif "4k" in filename:
-                    displacement_lod = 12  # 4096x4096
-                elif "8k" in filename:
-                    displacement_lod = 13  # 8192x8192
+                displacement_lod = self.GetDisplacementLoD(tex_path)
                 break
 
         # Check for "polished" in textureList
@@ -89,10 +387,17 @@ class OctaneSetup():
                 has_polished = True
                 break
 
+        # Node registry and asset index, shared by every sub-material and asset of the import
+        reimportPolicy = assetData.reimportPolicy
+        assetData.preludes.append(nodeRegistry.GetPrelude(assetData.importID, reimportPolicy == MSAssetIndex.POLICY_REUSE))
+        assetData.preludes.append(MSAssetIndex.index.GetPrelude(assetData.importID, reimportPolicy))
         materialScript = ""
 
         # If multiple sub-materials exist, build a Multi/Sub material
-        if helper.HasMultipleMaterial(assetData.meta):
+        isMultiMaterial = assetData.isMultiMaterial
+        if isMultiMaterial is None:
+            isMultiMaterial = helper.HasMultipleMaterial(assetData.meta)
+        if isMultiMaterial:
             multiNodeName = "MutliMaterial"
             materialScript += f"""
             {multiNodeName} = MultiSubMaterial()
@@ -105,7 +410,8 @@ class OctaneSetup():
                 nodeName = f"MatNode_{index}"
                 matName = f"{assetData.materialName}_{index}"
                 if matData.matType == "glass":
-                    materialScript += self.GetGlassMaterial(nodeName, matName)
+                    materialScript += self.GetGlassMaterial(nodeName, matName, assetData.verifiedTextures,
+                                                            assetData.textureTypes)
                 else:
                     materialScript += self.GetOpaqueMaterial(nodeName, matName,
                                                              assetData.useDisplacement,
@@ -115,7 +421,9 @@ class OctaneSetup():
                                                              has_polished,
                                                              scan_scale1,
                                                              scan_scale2,
-                                                             is_scale_fixed)
+                                                             is_scale_fixed,
+                                                             assetData.verifiedTextures,
+                                                             assetData.textureTypes)
                 zeroBased = index - 1
                 materialScript += f"""
                 {multiNodeName}.materialList[{zeroBased+1}] = {nodeName}
@@ -126,6 +434,7 @@ class OctaneSetup():
             for o in selection do o.material = {multiNodeName}
             {multiNodeName}.showInViewport = true
             """
+            materialVariable = multiNodeName
         else:
             # Single material route
             nodeName = "MatNode"
@@ -137,311 +446,84 @@ class OctaneSetup():
                                                      has_polished,
                                                      scan_scale1,
                                                      scan_scale2,
-                                                     is_scale_fixed)
+                                                     is_scale_fixed,
+                                                     assetData.verifiedTextures,
+                                                     assetData.textureTypes)
             materialScript += f"""
             for o in selection do o.material = {nodeName}
             {nodeName}.showInViewport = true
             """
+            materialVariable = nodeName
+
+        # Re-exports of an asset already in the scene follow the reimport policy
+        materialScript = MSAssetIndex.index.WrapMaterialSetup(
+            assetData.assetKey, reimportPolicy, materialScript, materialVariable
+        )
+        materialScript += nodeRegistry.GetReport(assetData.materialName)
         materialScript += helper.RearrangeMaterialGraph()
-        helper.DeselectEverything()
+        assetData.mainThreadCalls.append(helper.DeselectEverything)
         return materialScript
 
-    def GetOpaqueMaterial(self, nodeName, matName, useDisplacement, assetType, displacement_amount, displacement_lod, has_polished, scan_scale1, scan_scale2, is_scale_fixed):
+    def GetDisplacementLoD(self, tex_path):
         """
-        Creates an Octane universal_material for opaque surfaces.
-        Before each texture assignment, the slot’s input type is set to 2.
-        All RGB_image and Grayscale_image nodes share the albedo’s _2D_transformation and Mesh_UV_projection.
-        Scaling is handled directly in the generated MAXScript, with a check for isScaleFixed.
+        Octane displacement levelOfDetail (10 = 1024, ..., 13 = 8192) sized to the
+        texture. The dimensions come from the image header; the "1k".."8k" filename
+        tags are only used when the header can not be read.
         """
-        # Create displacement snippet with LoD and amount from computed values
-        displacementSnippet = "--No displacement"
-        if useDisplacement and assetType.lower() not in ["3dplant"]:
-            displacementSnippet = f"""
-            if displacementBitmap != undefined then (
-                if doesFileExist displacementBitmap.filename do (
-                    {nodeName}.displacement = Texture_displacement()
-                    {nodeName}.displacement.texture_input_type = 2
-                    {nodeName}.displacement.amount = {displacement_amount}
-                    {nodeName}.displacement.levelOfDetail = {displacement_lod}
-                    {nodeName}.displacement.black_level = 0.5
-
-                    {nodeName}.displacement.texture_tex = Grayscale_image()
-                    {nodeName}.displacement.texture_tex.gamma = 1.0
-                    {nodeName}.displacement.texture_tex.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                    {nodeName}.displacement.texture_tex.filename = displacementBitmap.filename
-                    {nodeName}.displacement.texture_tex.transform = trans2D
-                    {nodeName}.displacement.texture_tex.Projection = meshUV
-                )
-            )
-            """
-
-        # Coating snippet for polished surfaces
-        coatingSnippet = ""
-        if has_polished:
-            coatingSnippet = f"""
-            {nodeName}.coating_input_type = 0  -- Value mode
-            {nodeName}.coating_value = 1.0     -- Enable coating
-            {nodeName}.coatingRoughness_input_type = 0  -- Value mode
-            {nodeName}.coatingRoughness_value = 0.01    -- Smooth coating
-            """
-
-        # Embed the scaling logic directly in the MAXScript, with a check for isScaleFixed
-        matScript = f"""
-        {nodeName} = universal_material()
-        {nodeName}.name = "{matName}"
-        -- Set all texture input types to "texture" mode (2)
-        {nodeName}.albedo_input_type = 2
-        {nodeName}.metallic_input_type = 2
-        {nodeName}.roughness_input_type = 2
-        {nodeName}.opacity_input_type = 2
-        {nodeName}.specular_input_type = 2
-        {nodeName}.normal_input_type = 2
-        {nodeName}.transmission_input_type = 2
-
-        -- Create shared transform and projection nodes for albedo
-        trans2D = _2D_transformation()
-        trans2D.name = "Shared_Transform_9876"
-        -- Check if scale is fixed
-        isScaleFixed = {str(is_scale_fixed).lower()}
-        if isScaleFixed then (
-            trans2D.scale1 = 1.0
-            trans2D.scale2 = 1.0
-        ) else (
-            -- Base scale from asset metadata (assumed to be in meters)
-            baseScale1 = {scan_scale1}
-            baseScale2 = {scan_scale2}
-            -- Determine the system unit type and set the scale multiplier
-            scaleMultiplier = 1.0  -- Default for meters
-            case units.SystemType of (
-                #meters: scaleMultiplier = 1.0
-                #centimeters: scaleMultiplier = 100.0
-                #millimeters: scaleMultiplier = 1000.0
-                #kilometers: scaleMultiplier = 0.001
-                #inches: scaleMultiplier = 39.3701
-                #feet: scaleMultiplier = 3.28084
-                #miles: scaleMultiplier = 0.000621371
-                default: (
-                    format "Warning: Unknown system unit type %, defaulting to meters (scaleMultiplier = 1.0)\n" units.SystemType
-                    scaleMultiplier = 1.0
-                )
-            )
-            -- Apply the multiplier to the base scales
-            trans2D.scale1 = baseScale1 * scaleMultiplier
-            trans2D.scale2 = baseScale2 * scaleMultiplier
-        )
-        meshUV = Mesh_UV_projection()
-        meshUV.name = "Shared_Projection_5678"
-
-        -- Albedo (set up base texture with shared transform/projection)
-        if albedoBitmap != undefined then (
-            if doesFileExist albedoBitmap.filename do (
-                {nodeName}.albedo_tex = RGB_image()
-                {nodeName}.albedo_tex.gamma = 2.2
-                {nodeName}.albedo_tex.colorSpace = "_OctaneBuildIn_sRGB"
-                {nodeName}.albedo_tex.filename = albedoBitmap.filename
-                {nodeName}.albedo_tex.transform = undefined
-                {nodeName}.albedo_tex.Projection = undefined
-                {nodeName}.albedo_tex.transform = trans2D
-                {nodeName}.albedo_tex.Projection = meshUV
-            )
-        )
+        size_ = MSImageInfo.GetImageSize(tex_path)
+        if size_ is not None:
+            resolution_ = max(size_)
+            displacement_lod = DISPLACEMENT_LOD_MIN
+            while displacement_lod < DISPLACEMENT_LOD_MAX and (1 << displacement_lod) < resolution_:
+                displacement_lod += 1
+            return displacement_lod
 
-        -- Metallic
-        if metallicBitmap != undefined then (
-            if doesFileExist metallicBitmap.filename do (
-                {nodeName}.metallic_tex = Grayscale_image()
-                {nodeName}.metallic_tex.gamma = 1.0
-                {nodeName}.metallic_tex.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                {nodeName}.metallic_tex.filename = metallicBitmap.filename
-                {nodeName}.metallic_tex.transform = undefined
-                {nodeName}.metallic_tex.Projection = undefined
-                {nodeName}.metallic_tex.transform = trans2D
-                {nodeName}.metallic_tex.Projection = meshUV
-            )
-        )
-
-        -- Roughness
-        if roughnessBitmap != undefined then (
-            if doesFileExist roughnessBitmap.filename then (
-                {nodeName}.roughness_tex = Grayscale_image()
-                {nodeName}.roughness_tex.gamma = 1.0
-                {nodeName}.roughness_tex.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                {nodeName}.roughness_tex.filename = roughnessBitmap.filename
-                {nodeName}.roughness_tex.transform = undefined
-                {nodeName}.roughness_tex.Projection = undefined
-                {nodeName}.roughness_tex.transform = trans2D
-                {nodeName}.roughness_tex.Projection = meshUV
-            )
-        )
-        else if glossBitmap != undefined then (
-            if doesFileExist glossBitmap.filename then (
-                {nodeName}.roughness_tex = Grayscale_image()
-                {nodeName}.roughness_tex.gamma = 1.0
-                {nodeName}.roughness_tex.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                {nodeName}.roughness_tex.filename = glossBitmap.filename
-                {nodeName}.roughness_tex.transform = undefined
-                {nodeName}.roughness_tex.Projection = undefined
-                {nodeName}.roughness_tex.transform = trans2D
-                {nodeName}.roughness_tex.Projection = meshUV
-            )
-        )
-
-        -- Specular
-        if specularBitmap != undefined then (
-            if doesFileExist specularBitmap.filename then (
-                {nodeName}.specular_tex = RGB_image()
-                {nodeName}.specular_tex.gamma = 1.0
-                {nodeName}.specular_tex.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                {nodeName}.specular_tex.filename = specularBitmap.filename
-                {nodeName}.specular_tex.transform = undefined
-                {nodeName}.specular_tex.Projection = undefined
-                {nodeName}.specular_tex.transform = trans2D
-                {nodeName}.specular_tex.Projection = meshUV
-            )
-        )
-
-        -- Normal
-        if normalBitmap != undefined then (
-            if doesFileExist normalBitmap.filename do (
-                {nodeName}.normal_tex = RGB_image()
-                {nodeName}.normal_tex.gamma = 1.0
-                {nodeName}.normal_tex.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                {nodeName}.normal_tex.filename = normalBitmap.filename
-                {nodeName}.normal_tex.transform = undefined
-                {nodeName}.normal_tex.Projection = undefined
-                {nodeName}.normal_tex.transform = trans2D
-                {nodeName}.normal_tex.Projection = meshUV
-            )
-        )
-
-        -- Displacement (already updated in snippet above)
-        {displacementSnippet}
-
-        -- Coating for polished surfaces
-        {coatingSnippet}
-
-        -- Opacity
-        if opacityBitmap != undefined then (
-            if doesFileExist opacityBitmap.filename do (
-                {nodeName}.opacity_tex = Grayscale_image()
-                {nodeName}.opacity_tex.gamma = 1.0
-                {nodeName}.opacity_tex.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                {nodeName}.opacity_tex.filename = opacityBitmap.filename
-                {nodeName}.opacity_tex.transform = undefined
-                {nodeName}.opacity_tex.Projection = undefined
-                {nodeName}.opacity_tex.transform = trans2D
-                {nodeName}.opacity_tex.Projection = meshUV
-            )
-        )
-
-        -- Transmission / Translucency
-        if translucencyBitmap != undefined then (
-            if doesFileExist translucencyBitmap.filename then (
-                {nodeName}.transmission_tex = RGB_image()
-                {nodeName}.transmission_tex.gamma = 2.2
-                {nodeName}.transmission_tex.colorSpace = "_OctaneBuildIn_sRGB"
-                {nodeName}.transmission_tex.filename = translucencyBitmap.filename
-                {nodeName}.transmission_tex.transform = undefined
-                {nodeName}.transmission_tex.Projection = undefined
-                {nodeName}.transmission_tex.transform = trans2D
-                {nodeName}.transmission_tex.Projection = meshUV
-            )
-        )
-        else if transmissionBitmap != undefined then (
-            if doesFileExist transmissionBitmap.filename then (
-                {nodeName}.transmission_tex = Grayscale_image()
-                {nodeName}.transmission_tex.gamma = 1.0
-                {nodeName}.transmission_tex.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                {nodeName}.transmission_tex.filename = transmissionBitmap.filename
-                {nodeName}.transmission_tex.transform = undefined
-                {nodeName}.transmission_tex.Projection = undefined
-                {nodeName}.transmission_tex.transform = trans2D
-                {nodeName}.transmission_tex.Projection = meshUV
-            )
-        )
+        filename = tex_path.lower()
+        if "1k" in filename:
+            return 10  # 1024x1024
+        elif "2k" in filename:
+            return 11  # 2048x2048
+        elif "4k" in filename:
+            return 12  # 4096x4096
+        return 13  # 8192x8192, also the default
 
-        -- Bump, Cavity, Fuzz (these nodes are created but not connected)
-        if bumpBitmap != undefined then (
-            if doesFileExist bumpBitmap.filename then (
-                local BumpNode = Grayscale_image()
-                BumpNode.gamma = 1.0
-                BumpNode.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                BumpNode.filename = bumpBitmap.filename
-                BumpNode.transform = undefined
-                BumpNode.Projection = undefined
-                BumpNode.transform = trans2D
-                BumpNode.Projection = meshUV
-            )
-        )
-        if cavityBitmap != undefined then (
-            if doesFileExist cavityBitmap.filename then (
-                local CavityNode = Grayscale_image()
-                CavityNode.gamma = 1.0
-                CavityNode.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                CavityNode.filename = cavityBitmap.filename
-                CavityNode.transform = undefined
-                CavityNode.Projection = undefined
-                CavityNode.transform = trans2D
-                CavityNode.Projection = meshUV
-            )
-        )
-        if fuzzBitmap != undefined then (
-            if doesFileExist fuzzBitmap.filename then (
-                local FuzzNode = Grayscale_image()
-                FuzzNode.gamma = 1.0
-                FuzzNode.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                FuzzNode.filename = fuzzBitmap.filename
-                FuzzNode.transform = undefined
-                FuzzNode.Projection = undefined
-                FuzzNode.transform = trans2D
-                FuzzNode.Projection = meshUV
-            )
-        )
+    def GetOpaqueMaterial(self, nodeName, matName, useDisplacement, assetType, displacement_amount, displacement_lod, has_polished, scan_scale1, scan_scale2, is_scale_fixed, verifiedTextures=frozenset(), textureTypes=None):
         """
-        return matScript
+        Creates an Octane universal_material for opaque surfaces.
+        Before each texture assignment, the slot’s input type is set to 2.
+        All RGB_image and Grayscale_image nodes share one _2D_transformation and Mesh_UV_projection,
+        and every node comes from the OctaneNodeRegistry of the current import.
+        Scaling is handled directly in the generated MAXScript, with a check for isScaleFixed.
+        The script is compiled once per asset shape (texture types present, displacement,
+        coating) and only the blocks for the asset's textureTypes are emitted.
+        """
+        withDisplacement = useDisplacement and assetType.lower() not in ["3dplant"]
+        if textureTypes is not None:
+            textureTypes = frozenset(textureTypes)
+            withDisplacement = withDisplacement and "displacement" in textureTypes
+        template_ = CompileOpaqueMaterial(GetOpaqueShape(textureTypes), withDisplacement, bool(has_polished))
+        return template_.Render(self.GetMaterialContext(
+            nodeName, matName, verifiedTextures,
+            OCT_SCALEFIXED=str(is_scale_fixed).lower(),
+            OCT_SCALE1=str(scan_scale1),
+            OCT_SCALE2=str(scan_scale2),
+            OCT_DISPAMOUNT=str(displacement_amount),
+            OCT_DISPLOD=str(displacement_lod)
+        ))
 
-    def GetGlassMaterial(self, nodeName, matName):
+    def GetGlassMaterial(self, nodeName, matName, verifiedTextures=frozenset(), textureTypes=None):
         """
         Creates a specular_material for glass. Only the roughness and normal channels are set.
         """
-        matScript = f"""
-        {nodeName} = specular_material()
-        {nodeName}.name = "{matName}"
-        -- Set texture input types for the channels used
-        {nodeName}.roughness_input_type = 2
-        {nodeName}.normal_input_type = 2
-
-        -- Roughness
-        if roughnessBitmap != undefined then (
-            if doesFileExist roughnessBitmap.filename then (
-                {nodeName}.roughness_tex = Grayscale_image()
-                {nodeName}.roughness_tex.gamma = 1.0
-                {nodeName}.roughness_tex.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                {nodeName}.roughness_tex.filename = roughnessBitmap.filename
-            )
-        )
-        else if glossBitmap != undefined then (
-            if doesFileExist glossBitmap.filename then (
-                {nodeName}.roughness_tex = Grayscale_image()
-                {nodeName}.roughness_tex.gamma = 1.0
-                {nodeName}.roughness_tex.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                {nodeName}.roughness_tex.filename = glossBitmap.filename
-            )
-        )
+        template_ = CompileGlassMaterial(GetGlassShape(None if textureTypes is None else frozenset(textureTypes)))
+        return template_.Render(self.GetMaterialContext(nodeName, matName, verifiedTextures))
 
-        -- Normal
-        if normalBitmap != undefined then (
-            if doesFileExist normalBitmap.filename do (
-                {nodeName}.normal_tex = RGB_image()
-                {nodeName}.normal_tex.gamma = 1.0
-                {nodeName}.normal_tex.colorSpace = "_OctaneBuildIn_LINEAR_sRGB"
-                {nodeName}.normal_tex.filename = normalBitmap.filename
-            )
-        )
-
-        {nodeName}.index = 1.5
-        """
-        return matScript
+    def GetMaterialContext(self, nodeName, matName, verifiedTextures, **values):
+        context_ = dict(GetCheckContext(verifiedTextures))
+        context_["OCT_NODENAME"] = nodeName
+        context_["OCT_MATNAME"] = matName
+        context_.update(values)
+        return context_
 
     def _IsGlassAsset(self, meta):
         return False
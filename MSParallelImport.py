@@ -0,0 +1,125 @@
+import itertools, os, sys, traceback
+import MSRuntime
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSParallelImport generates the scripts of a bulk export on a process pool.
+
+LiveLinkImporter.PrepareAsset is pure Python and independent per asset, so the
+assets of a payload are fanned out over a concurrent.futures.ProcessPoolExecutor
+and the prepared scripts come back in payload order. Executing them stays on the
+3ds Max main thread (LiveLinkImporter.CommitAsset).
+
+This module does not import pymxs. The worker processes are plain Python
+interpreters; EnsureRuntime gives the plugin modules an inert pymxs there, whose
+runtime raises if generation ever calls into 3ds Max.
+
+Inside 3ds Max sys.executable is 3dsmax.exe, so the pool needs the path of a
+Python interpreter of the same version (Settings "Parallel_Python"). Without one
+the scripts are generated in-process, one after the other.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+# Importer attributes a worker needs to generate the scripts of the current import.
+IMPORTER_STATE = ("Settings", "toSelRequest", "Renderer", "ImportID", "MaxVersion", "BatchChunkSize")
+
+executors = {}
+workerImporter = None
+
+
+def EnsureRuntime():
+    if not MSRuntime.IsAvailable() and not isinstance(MSRuntime.current, MSRuntime.HeadlessRuntime):
+        MSRuntime.Install(MSRuntime.UnavailableRuntime())
+
+
+def CanSpawn(executable=None):
+    """
+    True if worker processes can be started: with an explicit interpreter, or when
+    this process is a regular Python interpreter rather than 3ds Max.
+    """
+    if executable:
+        return os.path.isfile(executable)
+    return not os.path.basename(sys.executable).lower().startswith("3dsmax")
+
+
+def GetExecutor(workers, executable=None):
+    key_ = (workers, executable)
+    executor_ = executors.get(key_)
+    if executor_ is None:
+        # Only bulk imports with Parallel_Workers pay for loading multiprocessing
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        context_ = multiprocessing.get_context("spawn")
+        if executable:
+            context_.set_executable(executable)
+        executor_ = executors[key_] = ProcessPoolExecutor(max_workers=workers, mp_context=context_)
+    return executor_
+
+
+def Shutdown():
+    for executor_ in executors.values():
+        executor_.shutdown(wait=True, cancel_futures=True)
+    executors.clear()
+
+
+def GetImporterState(importer):
+    return {name_: getattr(importer, name_, None) for name_ in IMPORTER_STATE}
+
+
+def GenerateScripts(importer, assets, workers=0, executable=None):
+    """
+    Yields (PreparedAsset or None, error traceback or None) for every asset, in
+    the order of assets. workers <= 1, or no usable interpreter, prepares them
+    in this process.
+    """
+    if workers <= 1 or len(assets) < 2 or not CanSpawn(executable):
+        for asset_ in assets:
+            try:
+                yield importer.PrepareAsset(asset_), None
+            except Exception:
+                yield None, traceback.format_exc()
+        return
+
+    import MS_Importer
+    state_ = GetImporterState(importer)
+    chunkSize = max(1, len(assets) // (workers * 4))
+    results_ = GetExecutor(workers, executable).map(
+        PrepareInWorker, itertools.repeat(state_), assets, chunksize=chunkSize
+    )
+    for prepared_, error_ in results_:
+        if prepared_ is not None:
+            # 3ds Max calls travel by name and are bound to the helper here
+            prepared_.mainThreadCalls = [getattr(MS_Importer.helper, name_) for name_ in prepared_.mainThreadCalls]
+        yield prepared_, error_
+
+
+def PrepareInWorker(state, json_data):
+    """
+    Runs in a worker process: prepares one asset with the worker's importer set
+    to the state of the importer that submitted it.
+    """
+    global workerImporter
+    try:
+        if workerImporter is None:
+            EnsureRuntime()
+            import MS_Importer
+            workerImporter = MS_Importer.LiveLinkImporter()
+            workerImporter.Batch = []
+        isNewImport = workerImporter.ImportID != state["ImportID"]
+        for name_, value_ in state.items():
+            setattr(workerImporter, name_, value_)
+        if isNewImport:
+            # The submitting importer's settings, for the modules too (timing
+            # markers, diagnostics, the script cache), as in updateSettings
+            import MSFileProbe
+            workerImporter.FileProbe = MSFileProbe.FileProbe()
+            workerImporter.configureModules()
+
+        prepared_ = workerImporter.PrepareAsset(json_data)
+        if prepared_ is not None:
+            prepared_.mainThreadCalls = [call_.__name__ for call_ in prepared_.mainThreadCalls]
+        return prepared_, None
+    except Exception:
+        return None, traceback.format_exc()
@@ -0,0 +1,96 @@
+import os, cProfile, time, tracemalloc
+import MSDiagnostics
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSProfiling captures cProfile and tracemalloc data for the next imports, to find
+out where the time and memory of a slow asset go.
+
+It is armed by "Profile_Next_Imports" in Settings.json (or the LiveLinkUI
+checkbox) and counts down by one per import. A profiled import runs on the main
+thread, one asset at a time and without batching, so every asset gets its own
+files under "Profile_Dir" (default: <diagnostics folder>/profiles/<asset ID>/):
+
+    <stamp>_<n>.pstats              cProfile stats, for pstats / snakeviz
+    <stamp>_<n>.tracemalloc         tracemalloc.Snapshot.load() snapshot
+    <stamp>_<n>_allocations.txt     peak memory and the top allocations by line
+
+Imports that are not profiled are not affected.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+
+class ImportProfiler():
+    def __init__(self):
+        self.remaining = 0
+        self.directory = os.path.join(MSDiagnostics.DEFAULT_DIRECTORY, "profiles")
+        self.topAllocations = 25
+        self.frames = 10
+        self.sequence = 0
+
+    def Configure(self, settings):
+        self.remaining = max(0, int(settings.get("Profile_Next_Imports", 0)))
+        self.directory = settings.get("Profile_Dir") or os.path.join(
+            settings.get("Diagnostics_Dir") or MSDiagnostics.DEFAULT_DIRECTORY, "profiles"
+        )
+        self.topAllocations = max(1, int(settings.get("Profile_Top_Allocations", 25)))
+
+    def IsArmed(self):
+        return self.remaining > 0
+
+    def CompleteImport(self):
+        """
+        Counts a profiled import; returns how many are left to profile.
+        """
+        self.remaining = max(0, self.remaining - 1)
+        return self.remaining
+
+    def Profile(self, assetID, function, *args, **kwargs):
+        """
+        Calls function under cProfile and tracemalloc and writes the results for
+        assetID. Returns what function returned.
+        """
+        isTracing = tracemalloc.is_tracing()
+        if not isTracing:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        before_ = tracemalloc.take_snapshot()
+        profile_ = cProfile.Profile()
+        start_ = time.perf_counter()
+        try:
+            return profile_.runcall(function, *args, **kwargs)
+        finally:
+            seconds_ = time.perf_counter() - start_
+            current_, peak_ = tracemalloc.get_traced_memory()
+            after_ = tracemalloc.take_snapshot()
+            if not isTracing:
+                tracemalloc.stop()
+            try:
+                path_ = self._Write(assetID, profile_, before_, after_, seconds_, peak_)
+                print(f"Profiled {assetID} in {seconds_:.3f} s: {path_}.pstats")
+            except Exception as e:
+                print(f"MSProfiling failed to write the profile of {assetID}: {e}")
+
+    def _Write(self, assetID, profile, before, after, seconds, peak):
+        self.sequence += 1
+        folder_ = os.path.join(self.directory, str(assetID or "unknown"))
+        os.makedirs(folder_, exist_ok=True)
+        base_ = os.path.join(folder_, "%s_%04d" % (time.strftime("%Y%m%d-%H%M%S"), self.sequence))
+
+        profile.dump_stats(base_ + ".pstats")
+        after.dump(base_ + ".tracemalloc")
+        with open(base_ + "_allocations.txt", "w") as f:
+            f.write("Asset %s: %.3f s, peak traced memory %.1f KB\n\n" % (assetID, seconds, peak / 1024.0))
+            f.write("Top %d allocations by line, compared to before the import:\n" % self.topAllocations)
+            for stat_ in after.compare_to(before, "lineno")[:self.topAllocations]:
+                f.write("%s\n" % stat_)
+        return base_
+
+
+profiler = ImportProfiler()
+
+
+def Configure(settings):
+    profiler.Configure(settings)
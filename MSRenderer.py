@@ -0,0 +1,184 @@
+import importlib, importlib.util, os, sys, threading
+from enum import Enum
+import MSRuntime
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSRenderer resolves which render engine is active in 3ds Max.
+
+The probe asks 3ds Max once and memoizes the answer. It is only asked again after
+3ds Max reports a renderer change (#postRendererChange) or Refresh() is called.
+
+SetupRegistry maps each renderer to its material setup plugin, and Register() lets
+a site replace or add one. A setup module is imported and its class instantiated
+the first time that renderer imports an asset.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+
+class RendererType(str, Enum):
+    """
+    The render engines the importer knows. Members compare equal to the names the
+    importer has always used, e.g. RendererType.OCTANE == "Octane".
+    """
+    CORONA = "Corona"
+    REDSHIFT = "Redshift"
+    VRAY = "Vray"
+    OCTANE = "Octane"
+    FSTORM = "FStorm"
+    ARNOLD = "Arnold"
+    NOT_SUPPORTED = "Not-Supported"
+
+    def __str__(self):
+        return self.value
+
+
+# Substrings of "renderers.current", checked in order.
+RENDERER_MATCHES = [
+    ("corona", RendererType.CORONA),
+    ("redshift", RendererType.REDSHIFT),
+    ("v_ray", RendererType.VRAY),
+    ("octane", RendererType.OCTANE),
+    ("fstorm", RendererType.FSTORM),
+    ("arnold", RendererType.ARNOLD),
+]
+
+
+# Material setup plugin per renderer: (module, class, method building the setup script).
+SETUP_PLUGINS = {
+    RendererType.ARNOLD: ("MSArnoldSetup", "ArnoldSetup", "GetMaterialSetup"),
+    RendererType.CORONA: ("MSCoronaSetup", "CoronaSetup", "GetMaterialSetup"),
+    RendererType.VRAY: ("MSVraySetup", "VraySetup", "GetVRayRenderSetup"),
+    RendererType.REDSHIFT: ("MSRedshiftSetup", "RedshiftSetup", "GetMaterialSetup"),
+    RendererType.FSTORM: ("MSFStormSetup", "FStormSetup", "GetMaterialSetup"),
+    RendererType.OCTANE: ("MSOctaneSetup", "OctaneSetup", "GetMaterialSetup"),
+}
+
+
+def ClassifyRenderer(rendererName):
+    rendererName = str(rendererName).lower()
+    for match_, rendererType in RENDERER_MATCHES:
+        if match_ in rendererName:
+            return rendererType
+    return RendererType.NOT_SUPPORTED
+
+
+class RendererProbe():
+    CALLBACK_ID = "MSRendererProbe"
+
+    def __init__(self):
+        self.Current = None
+        self.RendererClass = None
+        self.isWatching = False
+
+    def Get(self):
+        """
+        Returns the active RendererType, probing 3ds Max only if nothing is cached.
+        """
+        if self.Current is None:
+            self.Refresh()
+        return self.Current
+
+    def GetRendererClass(self):
+        """
+        Returns the cached "classof renderers.current" value, for logging.
+        """
+        if self.Current is None:
+            self.Refresh()
+        return self.RendererClass
+
+    def Refresh(self):
+        self.Watch()
+        rt = MSRuntime.Get()
+        self.Current = ClassifyRenderer(rt.execute("renderers.current"))
+        self.RendererClass = rt.execute("classof renderers.current")
+        return self.Current
+
+    def Invalidate(self):
+        self.Current = None
+        self.RendererClass = None
+
+    def Expire(self):
+        """
+        Called at the end of an import batch. Without change notifications the
+        cache can not be trusted beyond the batch it was probed for.
+        """
+        if not self.isWatching:
+            self.Invalidate()
+
+    def Watch(self):
+        """
+        Registers the #postRendererChange callback that invalidates the cache.
+        """
+        if self.isWatching:
+            return
+        try:
+            rt = MSRuntime.Get()
+            rt.callbacks.removeScripts(id=rt.name(RendererProbe.CALLBACK_ID))
+            rt.callbacks.addScript(rt.name("postRendererChange"), self.Invalidate, id=rt.name(RendererProbe.CALLBACK_ID))
+            self.isWatching = True
+        except Exception as e:
+            print(f"Could not watch for renderer changes: {e}")
+
+
+class SetupRegistry():
+    """
+    Lazily loaded material setups, looked up like a dict:
+        registry[RendererType.OCTANE](assetData)
+    """
+    def __init__(self, plugins=None):
+        self.plugins = dict(SETUP_PLUGINS if plugins is None else plugins)
+        self.instances = {}
+        self.lock = threading.Lock()
+
+    def Register(self, rendererType, moduleName, className, methodName="GetMaterialSetup"):
+        with self.lock:
+            self.plugins[rendererType] = (moduleName, className, methodName)
+            self.instances.pop(rendererType, None)
+
+    def GetSetup(self, rendererType):
+        """
+        Returns the setup instance of rendererType, importing its module on first use.
+        """
+        setup_ = self.instances.get(rendererType)
+        if setup_ is None:
+            with self.lock:
+                setup_ = self.instances.get(rendererType)
+                if setup_ is None:
+                    moduleName, className, methodName = self.plugins[rendererType]
+                    setup_ = getattr(importlib.import_module(moduleName), className)()
+                    self.instances[rendererType] = setup_
+        return setup_
+
+    def Identity(self, rendererType):
+        """
+        The registration of rendererType and the file, size and modification time of
+        its module, without importing it. Part of the MSScriptCache key, so a setup
+        registered from outside the plugin folder also invalidates cached scripts.
+        """
+        moduleName, className, methodName = self.plugins[rendererType]
+        module_ = sys.modules.get(moduleName)
+        origin_ = getattr(module_, "__file__", None)
+        if origin_ is None:
+            try:
+                spec_ = importlib.util.find_spec(moduleName)
+            except (ImportError, ValueError):
+                spec_ = None
+            origin_ = spec_.origin if spec_ is not None else None
+        try:
+            stat_ = os.stat(origin_)
+            fingerprint_ = (stat_.st_size, stat_.st_mtime_ns)
+        except (OSError, TypeError):
+            fingerprint_ = None
+        return (moduleName, className, methodName, origin_, fingerprint_)
+
+    def IsLoaded(self, rendererType):
+        return rendererType in self.instances
+
+    def __getitem__(self, rendererType):
+        return getattr(self.GetSetup(rendererType), self.plugins[rendererType][2])
+
+    def __contains__(self, rendererType):
+        return rendererType in self.plugins
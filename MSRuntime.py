@@ -0,0 +1,179 @@
+import ntpath, os, re, sys, types
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSRuntime is the one place the importer gets its MAXScript runtime from.
+
+Inside 3ds Max that is pymxs.runtime, imported on first use. Anywhere else a
+HeadlessRuntime can be installed instead: it records every script it is asked to
+execute, answers the renderer and version queries the importer makes, and checks
+files against a fixture directory. Install also provides a pymxs module backed by
+it for the plugin modules that import pymxs directly (MSLiveLinkHelpers, the
+renderer setups), so Bridge JSON to final MAXScript runs on a plain Python.
+
+    runtime = MSRuntime.Install(MSRuntime.HeadlessRuntime(fixtureDir="fixtures"))
+    importer.set_Asset_Data(asset)
+    runtime.Executed[-1]                        # the script 3ds Max would have run
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+OCTANE_RENDERER = "Octane_Renderer:Octane_Renderer"
+
+DOES_FILE_EXIST = re.compile(r'^doesFileExist\s+@?"(.*)"$', re.IGNORECASE)
+
+current = None
+
+
+def Get():
+    """
+    Returns the active runtime, pymxs.runtime unless another one was installed.
+    """
+    global current
+    if current is None:
+        import pymxs
+        current = pymxs.runtime
+    return current
+
+
+def Install(runtime):
+    """
+    Makes runtime the active runtime. Without a real pymxs, a pymxs module backed
+    by runtime is registered too.
+    """
+    global current
+    current = runtime
+    module_ = sys.modules.get("pymxs")
+    if module_ is None or getattr(module_, "isStandIn", False):
+        module_ = types.ModuleType("pymxs")
+        module_.runtime = runtime
+        module_.isStandIn = True
+        sys.modules["pymxs"] = module_
+    return runtime
+
+
+def IsAvailable():
+    """
+    True inside 3ds Max, i.e. when the real pymxs can be imported.
+    """
+    module_ = sys.modules.get("pymxs")
+    if module_ is not None:
+        return not getattr(module_, "isStandIn", False)
+    try:
+        import pymxs
+    except ImportError:
+        return False
+    return True
+
+
+def MapPath(path):
+    """
+    Where the active runtime finds path on this machine: path itself in 3ds Max,
+    the matching file of the fixture directory for a HeadlessRuntime.
+    """
+    if isinstance(current, HeadlessRuntime):
+        return current.MapPath(path)
+    return path
+
+
+class UnavailableRuntime():
+    """
+    Runtime of processes that must never call into 3ds Max, e.g. generation workers.
+    """
+    def __getattr__(self, name):
+        raise RuntimeError(f"pymxs.runtime.{name} is not available outside 3ds Max")
+
+
+class HeadlessRuntime():
+    def __init__(self, renderer=OCTANE_RENDERER, maxVersion=2024, fixtureDir=None, libraryRoot=None):
+        """
+        renderer is what "renderers.current" returns ("<name>:<class>"). With a
+        fixtureDir, file checks of a path under libraryRoot look up the same
+        relative path in fixtureDir; paths outside libraryRoot lose their drive
+        and root instead. Without one they check the real filesystem.
+        """
+        self.Renderer = renderer
+        self.MaxVersion = maxVersion
+        self.FixtureDir = fixtureDir
+        self.LibraryRoot = libraryRoot.replace("\\", "/").rstrip("/") if libraryRoot else None
+        self.Executed = []
+        self.Calls = []
+        self.callbacks = RecordingNamespace("callbacks", self.Calls)
+
+    def Reset(self):
+        del self.Executed[:]
+        del self.Calls[:]
+
+    def MapPath(self, path):
+        if not self.FixtureDir or not path:
+            return path
+        path_ = path.replace("\\", "/")
+        if self.LibraryRoot and path_.lower().startswith(self.LibraryRoot.lower() + "/"):
+            relative_ = path_[len(self.LibraryRoot) + 1:]
+        else:
+            # Bridge sends Windows paths, whatever the OS running the tests
+            relative_ = ntpath.splitdrive(path_)[1].lstrip("/")
+        return os.path.join(self.FixtureDir, *relative_.split("/"))
+
+    def execute(self, script):
+        """
+        Records script. Single-line renderer, version and file queries are answered
+        like 3ds Max would; anything else returns True.
+        """
+        query_ = script.strip()
+        if query_ == "renderers.current":
+            return self.Renderer
+        if query_ == "classof renderers.current":
+            return self.Renderer.split(":")[-1]
+        if query_.lower() == "maxversion()":
+            return self.maxVersion()
+        match_ = DOES_FILE_EXIST.match(query_)
+        if match_:
+            return self.doesFileExist(match_.group(1))
+        self.Executed.append(script)
+        return True
+
+    def maxVersion(self):
+        # (release, API, SDK, update, hotfix, build, ..., product year)
+        return [(self.MaxVersion - 1998) * 1000, 0, 0, 0, 0, 0, 0, self.MaxVersion]
+
+    maxversion = maxVersion
+
+    def doesFileExist(self, path):
+        return os.path.exists(self.MapPath(path))
+
+    def name(self, value):
+        return str(value)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return RecordingCall(name, self.Calls)
+
+
+class RecordingCall():
+    """
+    Any other runtime function: records (name, args, kwargs) and returns None.
+    """
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((self.name, args, kwargs))
+        return None
+
+
+class RecordingNamespace():
+    """
+    A runtime struct such as callbacks, whose functions are recorded as "struct.fn".
+    """
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return RecordingCall(f"{self.name}.{name}", self.calls)
@@ -0,0 +1,221 @@
+import os, collections, hashlib, json, tempfile, threading, queue
+import MSTiming
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSScriptCache keeps the generated MAXScript of imported assets on disk, so that
+importing the same asset again skips parsing and script generation.
+
+An entry is keyed by a hash of everything the script is generated from: the
+Bridge JSON of the asset (key order normalized), the settings and renderer the
+importer uses, the 3ds Max version, the plugin files (PluginVersion) and the
+size and modification time of the asset's textures, its MSAssetClass classes
+and the material setup registered for the renderer. Changing any of them is a
+miss. The import ID the scripts compare against is stored as IMPORT_ID_TOKEN and
+put back on every hit.
+
+It is off unless "Script_Cache_Enabled" is true in Settings.json. Entries are
+written under "Script_Cache_Dir" (default: <temp>/megascans_script_cache), one
+file per key by a background thread; a hit touches its file, and the least
+recently used files are removed once the folder exceeds "Script_Cache_Max_MB".
+Hits and misses are kept here and counted in the MSTiming report of the import.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), "megascans_script_cache")
+
+# Bump when the entry layout changes; older entries are then misses.
+FORMAT_VERSION = 2
+
+# Generated in place of the import ID and replaced by the current one on use.
+IMPORT_ID_TOKEN = "MS_CACHED_IMPORT"
+
+EXTENSION = ".json"
+
+pluginVersions = {}
+
+
+def PluginVersion(directory):
+    """
+    Hash of the names, sizes and modification times of the plugin's Python files,
+    computed once per directory. Updating the plugin changes every key.
+    """
+    version_ = pluginVersions.get(directory)
+    if version_ is None:
+        files_ = []
+        try:
+            with os.scandir(directory) as entries_:
+                for entry_ in entries_:
+                    if entry_.name.endswith(".py") and entry_.is_file():
+                        stat_ = entry_.stat()
+                        files_.append((entry_.name, stat_.st_size, stat_.st_mtime_ns))
+        except OSError:
+            pass
+        version_ = hashlib.sha256(repr(sorted(files_)).encode("utf-8")).hexdigest()
+        pluginVersions[directory] = version_
+    return version_
+
+
+class ScriptCache():
+    def __init__(self):
+        self.isEnabled = False
+        self.directory = DEFAULT_DIRECTORY
+        self.maxBytes = 64 * 1024 * 1024
+        # {file name: size}, least recently used first; read from the folder on first use
+        self.entries = None
+        self.totalBytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.queue = queue.Queue()
+        self.worker = None
+        self.lock = threading.Lock()
+
+    def Configure(self, settings):
+        self.isEnabled = bool(settings.get("Script_Cache_Enabled", False))
+        directory_ = settings.get("Script_Cache_Dir") or DEFAULT_DIRECTORY
+        with self.lock:
+            if directory_ != self.directory:
+                self.directory = directory_
+                self.entries = None
+        self.maxBytes = max(1, int(settings.get("Script_Cache_Max_MB", 64))) * 1024 * 1024
+
+    @staticmethod
+    def Key(*parts):
+        """
+        Hash of parts, which must be JSON serializable. Dictionaries are hashed
+        with sorted keys, so the key order of the Bridge JSON does not matter.
+        """
+        text_ = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(text_.encode("utf-8")).hexdigest()
+
+    def Get(self, key):
+        """
+        Returns the entry stored for key ({"id", "script", "mainThreadCalls",
+        "preludes"}, the script and preludes still holding IMPORT_ID_TOKEN), or None
+        on a miss.
+        """
+        name_ = key + EXTENSION
+        path_ = os.path.join(self.directory, name_)
+        try:
+            with open(path_, "r", encoding="utf-8") as f:
+                entry_ = json.load(f)
+        except (OSError, ValueError):
+            entry_ = None
+        if not isinstance(entry_, dict) or entry_.get("format") != FORMAT_VERSION:
+            with self.lock:
+                self.misses += 1
+            MSTiming.recorder.Count("script_cache.miss")
+            return None
+
+        with self.lock:
+            self.hits += 1
+            entries_ = self._Entries()
+            if name_ in entries_:
+                entries_.move_to_end(name_)
+        try:
+            os.utime(path_)
+        except OSError:
+            pass
+        MSTiming.recorder.Count("script_cache.hit")
+        return entry_
+
+    def Put(self, key, assetID, script, mainThreadCalls, preludes=()):
+        """
+        Queues a generated script, the names of its 3ds Max calls and its preludes
+        to be stored under key.
+        """
+        with self.lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self._Run, name="MSScriptCache")
+                self.worker.daemon = True
+                self.worker.start()
+        self.queue.put((self.directory, key, assetID, script, list(mainThreadCalls), list(preludes)))
+
+    def Wait(self):
+        """
+        Blocks until everything queued so far has been stored.
+        """
+        self.queue.join()
+
+    def _Run(self):
+        while True:
+            item_ = self.queue.get()
+            try:
+                self._Write(*item_)
+            except Exception as e:
+                print(f"MSScriptCache failed to store {item_[2]}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def _Write(self, directory, key, assetID, script, mainThreadCalls, preludes):
+        name_ = key + EXTENSION
+        data_ = json.dumps({
+            "format": FORMAT_VERSION,
+            "id": assetID,
+            "script": script,
+            "mainThreadCalls": mainThreadCalls,
+            "preludes": preludes,
+        }).encode("utf-8")
+        os.makedirs(directory, exist_ok=True)
+        path_ = os.path.join(directory, name_)
+        # Written aside and renamed, so a reader never sees half an entry
+        temporary_ = "%s.%d.tmp" % (path_, os.getpid())
+        with open(temporary_, "wb") as f:
+            f.write(data_)
+        os.replace(temporary_, path_)
+
+        # Then the least recently used entries over the size limit are removed
+        with self.lock:
+            if directory != self.directory:
+                return
+            entries_ = self._Entries()
+            self.totalBytes += len(data_) - entries_.pop(name_, 0)
+            entries_[name_] = len(data_)
+            while self.totalBytes > self.maxBytes and len(entries_) > 1:
+                oldest_, size_ = entries_.popitem(last=False)
+                self.totalBytes -= size_
+                try:
+                    os.remove(os.path.join(directory, oldest_))
+                except OSError:
+                    pass
+
+    def Clear(self):
+        with self.lock:
+            for name_ in self._Entries():
+                try:
+                    os.remove(os.path.join(self.directory, name_))
+                except OSError:
+                    pass
+            self.entries = collections.OrderedDict()
+            self.totalBytes = 0
+
+    def GetStats(self):
+        with self.lock:
+            entries_ = self._Entries()
+            return {"hits": self.hits, "misses": self.misses, "entries": len(entries_), "bytes": self.totalBytes}
+
+    def _Entries(self):
+        # Called with self.lock held
+        if self.entries is None:
+            found_ = []
+            try:
+                with os.scandir(self.directory) as scan_:
+                    for entry_ in scan_:
+                        if entry_.name.endswith(EXTENSION):
+                            stat_ = entry_.stat()
+                            found_.append((stat_.st_mtime_ns, entry_.name, stat_.st_size))
+            except OSError:
+                pass
+            found_.sort()
+            self.entries = collections.OrderedDict((name_, size_) for mtime_, name_, size_ in found_)
+            self.totalBytes = sum(self.entries.values())
+        return self.entries
+
+
+cache = ScriptCache()
+
+
+def Configure(settings):
+    cache.Configure(settings)
@@ -0,0 +1,138 @@
+import os, json, threading, tempfile, atexit
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSSettings keeps the plugin's Settings.json in memory.
+
+Load() only re-reads the file when its modification time or size changed, so the
+per-import cost is a single os.stat. Update() keeps the new values in memory and
+writes them after a short quiet period, so a burst of checkbox toggles becomes one
+write. Writes go to a temporary file that is renamed over Settings.json, so a
+reader never sees a half-written file.
+
+Pending writes are flushed when Python exits. There is one exit hook for the module,
+which flushes the latest store of every path; a store replaced by a newer one for
+the same path is flushed at that point and then released.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+WRITE_DELAY = 0.5
+
+# Latest SettingsStore per settings file, flushed at exit
+stores = {}
+storesLock = threading.Lock()
+
+
+class SettingsStore():
+    def __init__(self, path, defaults, writeDelay=WRITE_DELAY):
+        self.path = path
+        self.defaults = dict(defaults)
+        self.writeDelay = writeDelay
+        self.Settings = None
+        self.stamp = None
+        self.pending = False
+        self.timer = None
+        self.lock = threading.RLock()
+        key_ = os.path.normcase(os.path.abspath(path))
+        with storesLock:
+            previous_ = stores.get(key_)
+            stores[key_] = self
+        if previous_ is not None:
+            previous_.Flush()
+
+    def Load(self):
+        """
+        Returns a copy of the current settings, re-reading Settings.json only if it
+        changed on disk since the last read or write.
+        """
+        with self.lock:
+            if not self.pending:
+                try:
+                    stat_ = os.stat(self.path)
+                except OSError:
+                    stat_ = None
+
+                if stat_ is None:
+                    self.Settings = dict(self.defaults)
+                    self._Write()
+                elif (stat_.st_mtime_ns, stat_.st_size) != self.stamp:
+                    self._Read(stat_)
+            return dict(self.Settings)
+
+    def Save(self, settings):
+        """
+        Replaces the settings and writes them immediately.
+        """
+        with self.lock:
+            self.Settings = dict(settings)
+            self._CancelTimer()
+            self._Write()
+
+    def Update(self, settings):
+        """
+        Replaces the settings in memory and schedules a debounced write.
+        """
+        with self.lock:
+            self.Settings = dict(settings)
+            self.pending = True
+            self._CancelTimer()
+            self.timer = threading.Timer(self.writeDelay, self.Flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def Flush(self):
+        with self.lock:
+            self._CancelTimer()
+            if self.pending:
+                self._Write()
+
+    def _CancelTimer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def _Read(self, stat_):
+        try:
+            with open(self.path, "r") as fl_:
+                loaded_ = json.load(fl_)
+        except (OSError, ValueError) as e:
+            # Keep the last good values, e.g. if another tool wrote the file in place.
+            print(f"Could not read {self.path}: {e}")
+            if self.Settings is None:
+                self.Settings = dict(self.defaults)
+            return
+        settings_ = dict(self.defaults)
+        settings_.update(loaded_)
+        self.Settings = settings_
+        self.stamp = (stat_.st_mtime_ns, stat_.st_size)
+
+    def _Write(self):
+        directory_ = os.path.dirname(self.path) or "."
+        try:
+            handle_, tempPath = tempfile.mkstemp(prefix=".Settings.", suffix=".tmp", dir=directory_)
+            try:
+                with os.fdopen(handle_, "w") as outfile:
+                    json.dump(self.Settings, outfile)
+                    outfile.flush()
+                    os.fsync(outfile.fileno())
+                os.replace(tempPath, self.path)
+            except BaseException:
+                os.remove(tempPath)
+                raise
+            stat_ = os.stat(self.path)
+            self.stamp = (stat_.st_mtime_ns, stat_.st_size)
+            self.pending = False
+        except OSError as e:
+            print(f"Could not write {self.path}: {e}")
+
+
+def FlushAll():
+    with storesLock:
+        stores_ = list(stores.values())
+    for store_ in stores_:
+        store_.Flush()
+
+
+atexit.register(FlushAll)
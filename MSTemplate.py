@@ -0,0 +1,102 @@
+import re
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSTemplate renders the MAXScript templates used by the importer in a single pass
+from a placeholder -> value context.
+
+The placeholders a template may contain are described once by a Placeholders
+pattern: fixed names plus regular expressions for families such as TEX_<TYPE>".
+Static templates are compiled once, when their module is loaded, into alternating
+literal / placeholder segments; rendering only fills the placeholder slots and
+joins the result. Text generated per asset is rendered with one pattern.sub pass
+instead, since compiling it would never be reused.
+
+Placeholders missing from the context are left untouched, exactly like a skipped
+str.replace; a placeholder enclosing another one (e.g. '"MSFABRIC"' around
+'MSFABRIC') then falls back to the inner one.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+
+def Placeholders(names, patterns=()):
+    """
+    Compiled pattern matching any of names or patterns. Names are tried longest
+    first, so the earliest and longest placeholder wins on an overlap.
+    """
+    alternatives_ = list(patterns) + [re.escape(name_) for name_ in sorted(set(names), key=len, reverse=True)]
+    return re.compile("|".join(alternatives_))
+
+
+class CompiledTemplate():
+    __slots__ = ("segments", "placeholders")
+
+    def __init__(self, text, placeholders):
+        """
+        placeholders is a Placeholders pattern or an iterable of placeholder names.
+        """
+        if not hasattr(placeholders, "finditer"):
+            placeholders = Placeholders(placeholders)
+        self.placeholders = placeholders
+        self.segments = []
+        cursor_ = 0
+        for match_ in placeholders.finditer(text):
+            self.segments.append(text[cursor_:match_.start()])
+            self.segments.append(match_.group())
+            cursor_ = match_.end()
+        self.segments.append(text[cursor_:])
+
+    def Render(self, context):
+        """
+        Fills every placeholder slot from context. Even segments are literals,
+        odd segments are placeholder names.
+        """
+        parts_ = self.segments[:]
+        for index_ in range(1, len(parts_), 2):
+            value_ = context.get(parts_[index_])
+            parts_[index_] = Fallback(parts_[index_], context, self.placeholders) if value_ is None else value_
+        return "".join(parts_)
+
+
+def RenderTemplate(text, context, placeholders):
+    """
+    Renders text that is generated per asset against context, in one pass.
+    """
+    if not context:
+        return text
+
+    def Value(match_):
+        value_ = context.get(match_.group())
+        return Fallback(match_.group(), context, placeholders) if value_ is None else value_
+
+    return placeholders.sub(Value, text)
+
+
+def Fallback(placeholder, context, placeholders):
+    # Leaves the first character of an unresolved placeholder as it is and
+    # renders the rest, which may hold a shorter placeholder.
+    return placeholder[0] + RenderTemplate(placeholder[1:], context, placeholders)
+
+
+def CommentLines(text, marker, prefix="--"):
+    """
+    Comments out every line of text that contains marker, in a single pass.
+    Used for the Octane bitmap slots whose TEX_ placeholder was never resolved.
+    """
+    parts_ = []
+    cursor_ = 0
+    lastLine = -1
+    position_ = text.find(marker)
+    while position_ != -1:
+        lineStart = text.rfind("\n", 0, position_) + 1
+        if lineStart != lastLine:
+            parts_.append(text[cursor_:lineStart])
+            parts_.append(prefix)
+            cursor_ = lastLine = lineStart
+        position_ = text.find(marker, position_ + len(marker))
+    if not parts_:
+        return text
+    parts_.append(text[cursor_:])
+    return "".join(parts_)
@@ -0,0 +1,248 @@
+import collections, functools, json, re, threading, time
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+MSTiming records where the time of an import goes: receiving the Bridge payload,
+generating the scripts in Python, and 3ds Max executing them.
+
+It is off unless "Timing_Enabled" is set in Settings.json; while off, Span() and
+Timed functions cost one attribute check. When on, every span adds its duration
+to the report of the import in progress, from any thread. The MAXScript sections
+of an asset are wrapped with timeStamp() markers (WrapSection) and their times are
+read back after each execute (CollectMaxScript). Count() adds to named counters of
+the import, e.g. the MSScriptCache hits and misses. The last "Timing_History"
+reports are kept for LiveLinkUI and can be exported as JSON.
+
+    with MSTiming.Span("receive"):
+        ...
+
+    @MSTiming.Timed("parse")
+    def parseJSON(self):
+        ...
+
+Exports that overlap (a second one arriving before the first has completed) are
+recorded as one import.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+# MAXScript global the section markers append "<section>=<ms>;" to.
+MAXSCRIPT_LOG = "MSTimingLog"
+
+MAXSCRIPT_PRELUDE = f"""
+global {MAXSCRIPT_LOG}
+if {MAXSCRIPT_LOG} == undefined do {MAXSCRIPT_LOG} = ""
+"""
+
+# Section names become MAXScript variable names, which cannot have dots
+SECTION_NAME = re.compile(r"[^A-Za-z0-9_]")
+
+
+class NullSpan():
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class ImportTiming():
+    def __init__(self, label=""):
+        self.label = label
+        self.started = time.time()
+        self.start = time.perf_counter()
+        self.seconds = None
+        self.assets = 0
+        self.spans = {}
+        self.maxscript = {}
+        self.counters = {}
+
+    @staticmethod
+    def Add(table, name, seconds):
+        entry_ = table.get(name)
+        if entry_ is None:
+            table[name] = [1, seconds, seconds]
+        else:
+            entry_[0] += 1
+            entry_[1] += seconds
+            entry_[2] = max(entry_[2], seconds)
+
+    def ToDict(self):
+        def Stats(table):
+            return {
+                name_: {"count": count_, "total_ms": total_ * 1000.0, "max_ms": max_ * 1000.0}
+                for name_, (count_, total_, max_) in table.items()
+            }
+        return {
+            "label": self.label,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "seconds": self.seconds,
+            "assets": self.assets,
+            "spans": Stats(self.spans),
+            "maxscript": Stats(self.maxscript),
+            "counters": dict(self.counters),
+        }
+
+    def Summary(self):
+        """
+        One line for the UI, e.g. "12:03:44  8 assets  1.92 s  generate 310 ms  max.mesh 1210 ms".
+        """
+        parts_ = [time.strftime("%H:%M:%S", time.localtime(self.started)), "%d assets" % self.assets]
+        if self.seconds is not None:
+            parts_.append("%.2f s" % self.seconds)
+        for table_ in (self.spans, self.maxscript):
+            for name_, (count_, total_, max_) in table_.items():
+                parts_.append("%s %.0f ms" % (name_, total_ * 1000.0))
+        for name_, count_ in self.counters.items():
+            parts_.append("%s %d" % (name_, count_))
+        return "  ".join(parts_)
+
+
+class TimingRecorder():
+    def __init__(self):
+        self.isEnabled = False
+        self.history = collections.deque(maxlen=20)
+        self.current = None
+        self.lock = threading.Lock()
+
+    def Configure(self, settings):
+        self.isEnabled = bool(settings.get("Timing_Enabled", False))
+        length_ = max(1, int(settings.get("Timing_History", 20)))
+        if length_ != self.history.maxlen:
+            self.history = collections.deque(self.history, maxlen=length_)
+
+    def BeginImport(self, label=""):
+        """
+        Starts the report of an export, unless one is still in progress.
+        """
+        if not self.isEnabled:
+            return
+        with self.lock:
+            if self.current is None:
+                self.current = ImportTiming(label)
+
+    def EndImport(self, assetCount=0):
+        """
+        Completes the report in progress and returns it (None while off).
+        """
+        with self.lock:
+            timing_ = self.current
+            self.current = None
+            if timing_ is None:
+                return None
+            timing_.seconds = time.perf_counter() - timing_.start
+            timing_.assets += assetCount
+            self.history.append(timing_)
+        return timing_
+
+    def Add(self, name, seconds):
+        with self.lock:
+            if self.current is None:
+                self.current = ImportTiming()
+            ImportTiming.Add(self.current.spans, name, seconds)
+
+    def Count(self, name, amount=1):
+        if not self.isEnabled:
+            return
+        with self.lock:
+            if self.current is None:
+                self.current = ImportTiming()
+            counters_ = self.current.counters
+            counters_[name] = counters_.get(name, 0) + amount
+
+    def Span(self, name):
+        if not self.isEnabled:
+            return NULL_SPAN
+        return TimedSpan(self, name)
+
+    def WrapSection(self, name, script):
+        """
+        Wraps a section of generated MAXScript with timeStamp() markers that log
+        its duration to MSTimingLog. Returns script unchanged while off.
+        """
+        if not self.isEnabled:
+            return script
+        variable_ = "msTiming_" + SECTION_NAME.sub("_", name)
+        return (
+            f"\n{MAXSCRIPT_PRELUDE}{variable_} = timeStamp()\n"
+            f"{script}"
+            f'\n{MAXSCRIPT_LOG} += "{name}=" + ((timeStamp() - {variable_}) as string) + ";"\n'
+        )
+
+    def CollectMaxScript(self, runtime):
+        """
+        Reads the section times the last executed script logged and clears the log.
+        """
+        if not self.isEnabled:
+            return
+        log_ = runtime.execute(MAXSCRIPT_LOG)
+        runtime.execute(f'{MAXSCRIPT_LOG} = ""')
+        if not isinstance(log_, str) or not log_:
+            return
+        with self.lock:
+            if self.current is None:
+                self.current = ImportTiming()
+            for entry_ in log_.split(";"):
+                name_, separator_, milliseconds_ = entry_.partition("=")
+                if separator_:
+                    try:
+                        ImportTiming.Add(self.current.maxscript, name_, float(milliseconds_) / 1000.0)
+                    except ValueError:
+                        pass
+
+    def GetHistory(self):
+        with self.lock:
+            return list(self.history)
+
+    def Export(self, path):
+        with open(path, "w") as f:
+            json.dump([timing_.ToDict() for timing_ in self.GetHistory()], f, indent=4)
+
+
+class TimedSpan():
+    __slots__ = ("recorder", "name", "start")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.recorder.Add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+recorder = TimingRecorder()
+
+
+def Configure(settings):
+    recorder.Configure(settings)
+
+
+def Span(name):
+    return recorder.Span(name)
+
+
+def Timed(name):
+    """
+    Decorator: records every call of the function as a span called name.
+    """
+    def Decorate(function):
+        @functools.wraps(function)
+        def timed_(*args, **kwargs):
+            if not recorder.isEnabled:
+                return function(*args, **kwargs)
+            start_ = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                recorder.Add(name, time.perf_counter() - start_)
+        return timed_
+    return Decorate
@@ -1,47 +1,13 @@
-import os, json, sys, socket, time, re
+import os, json, sys, socket, threading, time
 from pymxs import runtime as rt
 
-#import QThread
+_startTime_ = time.perf_counter()
 
 _path_ = os.path.dirname(__file__).replace("\\", "/")
 if _path_ not in sys.path:
   sys.path.append( _path_ )
 
-
-
-import MS_Importer
-from Logging import Logger
-_importerSetup_ = MS_Importer.LiveLinkImporter()
-
-MSLIVELINK_VERSION = "5.5"
-
-try:
-    from PySide6.QtGui import *
-    from PySide6.QtCore import *
-    from PySide6.QtWidgets import *
-except ImportError:
-    try:
-        from PySide2.QtGui import *
-        from PySide2.QtCore import *
-        from PySide2.QtWidgets import *
-    except ImportError:
-        try:
-            from PySide.QtGui import *
-            from PySide.QtCore import *
-        except ImportError:
-            try:
-                from PyQt5.QtGui import *
-                from PyQt5.QtCore import *
-                from PyQt5.QtWidgets import *
-            except ImportError:
-                try:
-                    from PyQt4.QtGui import *
-                    from PyQt4.QtCore import *
-                except ImportError:
-                    raise ImportError("No suitable PyQt or PySide version found")
-
-
-
+import MSLiveLinkStream
 
 
 """#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
@@ -51,226 +17,111 @@ MegascansLiveLinkAPI is the core component of the Megascans Plugin plugins.
 This API relies on a QThread to monitor any incoming data from Bridge by communicating
 via a socket port.
 
-This module has a bunch of classes and functions that are standardized as much as possible
-to make sure you don't have to modify them too much for them to work in any python-compatible
-software.
-If you're looking into extending the user interface then you can modify the MegascansLiveLinkUI
-class to suit your needs.
+This module is what 3ds Max runs at startup: it registers the Megascans menu and
+starts listening for Bridge. Everything Qt-based (QLiveLinkMonitor, LiveLinkUI) lives
+in MSLiveLinkUI, which is only imported when it is needed, always on the main
+thread. With "Deferred_Startup" (the default) that is the first Bridge connection
+or menu click, so no Qt binding, MSLiveLinkUI, importer, Settings.json or main
+window lookup is part of 3ds Max startup. A first connection reaches the main
+thread through MSMainThread, the only Qt module the listener thread imports.
+If you're looking into extending the user interface then you can modify the
+LiveLinkUI class in MSLiveLinkUI to suit your needs.
 
 #####################################################################################
 #*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
 
+MSLIVELINK_VERSION = MSLiveLinkStream.MSLIVELINK_VERSION
 
+# The Qt classes that used to be defined here, now in MSLiveLinkUI. Bound by LoadUI:
+# at 3ds Max startup on the first Bridge connection or menu click (or right away
+# without Deferred_Startup), and right away when MS_API is imported as a module.
+QLiveLinkMonitor = None
+LiveLinkUI = None
+stylesheet_ = None
+
+
+def LoadUI():
+    """
+    Imports MSLiveLinkUI: the Qt binding, the importer and the UI classes. Call on
+    the main thread.
+    """
+    global QLiveLinkMonitor, LiveLinkUI, stylesheet_
+    import MSLiveLinkUI, MSMainThread
+    # The listener thread then reaches this thread through a dispatcher made here
+    MSMainThread.Install()
+    QLiveLinkMonitor = MSLiveLinkUI.QLiveLinkMonitor
+    LiveLinkUI = MSLiveLinkUI.LiveLinkUI
+    stylesheet_ = MSLiveLinkUI.stylesheet_
+    return MSLiveLinkUI
+
+
+def GetImporter():
+    return LoadUI().GetImporter()
 
 
 def GetHostApp():
-    try:
-        try:
-            import qtmax
-            mainWindow = qtmax.GetQMaxMainWindow()
-        except:
-            try:
-                mainWindow = QWidget.find(rt.windows.getMAXHWND())
-            except:
-                mainWindow = QApplication.activeWindow()
-
-        while True:
-            lastWin = mainWindow.parent()
-            if lastWin:
-                mainWindow = lastWin
-            else:
-                break
-        return mainWindow
-    except:
-        pass
-
-""" QLiveLinkMonitor is a QThread-based thread that monitors a specific port for import.
-Simply put, this class is responsible for communication between your software and Bridge."""
-
-class QLiveLinkMonitor(QThread):
-    Bridge_Call = Signal()
-    Instance = []
+    return LoadUI().GetHostApp()
+
+
+def LoadMonitor():
+    """
+    Loads MSLiveLinkUI and creates the QLiveLinkMonitor with its importer. Runs on
+    the main thread, see BridgeListener.
+    """
+    return LoadUI().CreateMonitor()
 
-    def __init__(self):
-        super(QLiveLinkMonitor, self).__init__()
-        self.TotalData = b""
-        QLiveLinkMonitor.Instance.append(self)
 
-    def __del__(self):
-        self.quit()
-        self.wait()
+def IsDeferredStartup():
+    """
+    "Deferred_Startup" from Settings.json, read without creating the importer.
+    """
+    try:
+        with open(os.path.join(_path_, "Settings.json"), "r") as f:
+            return bool(json.load(f).get("Deferred_Startup", True))
+    except (OSError, ValueError, AttributeError):
+        return True
+
+
+class BridgeListener(threading.Thread):
+    """
+    Accepts Bridge connections on a plain thread. The first connection imports
+    MSMainThread (QtCore) and has the main thread load MSLiveLinkUI and create the
+    QLiveLinkMonitor and its importer (LoadMonitor); this thread only waits for the
+    finished monitor, and every export is then received by
+    QLiveLinkMonitor.ReceiveExport here.
+    """
+    Instance = None
 
-    def stop(self):
-        self.terminate()
+    def __init__(self):
+        super(BridgeListener, self).__init__(name="MSBridgeListener", daemon=True)
+        self.Monitor = None
 
     def run(self):
-        time.sleep(0.025)
         try:
-            host, port = 'localhost', 13292
             socket_ = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            socket_.bind((host, port))
+            socket_.bind((MSLiveLinkStream.BRIDGE_HOST, MSLiveLinkStream.BRIDGE_PORT))
+            socket_.listen(5)
             while True:
-                socket_.listen(5)
                 client, address = socket_.accept()
-                data = b""
-                data = client.recv(4096*2)
-                if data:
-                    self.TotalData = b""
-                    self.TotalData += data
-                    while True:
-                        data = client.recv(4096*2)
-                        if data:
-                            self.TotalData += data
-                        else:
-                            break
-                    time.sleep(0.05)
-                    self.Bridge_Call.emit()
-                    time.sleep(0.05)
+                if self.Monitor is None:
+                    try:
+                        import MSMainThread
+                        self.Monitor = MSMainThread.RunOnMainThread(LoadMonitor)
+                    except Exception as e:
+                        print(f"Could not start the Bridge importer: {e}")
+                        client.close()
+                        continue
+                self.Monitor.ReceiveExport(client)
         except Exception as e:
-            print(f"Error in QLiveLinkMonitor: {e}")
+            print(f"Error in BridgeListener: {e}")
 
-    def InitializeImporter(self):
-        import pymxs
-        json_array = json.loads(self.TotalData)
-        for asset_ in json_array:
-            importer = _importerSetup_.Identifier
-            importer.set_Asset_Data(asset_)
-            try:
-                guid = asset_['guid']
-                assetID = asset_['id']
-            except KeyError:
-                guid = ""
-                assetID = ""
-            bridge_event = "BRIDGE_BULK_EXPORT_ASSET" if len(json_array) > 1 else "BRIDGE_EXPORT_ASSET"
-            try:
-                Logger(pymxs.runtime.execute("classof renderers.current"), pymxs.runtime.maxversion()[7], guid, assetID, bridge_event)
-            except Exception as e:
-                Logger(pymxs.runtime.execute("classof renderers.current"), "2019 or lower", guid, assetID, bridge_event)
-                print(f"Error in InitializeImporter Logger: {e}")
-
-
-
-
-"""
-#################################################################################################
-#################################################################################################
-"""
-
-stylesheet_ = ("""
-
-QCheckBox { background: transparent; color: #E6E6E6; font-family: Source Sans Pro; font-size: 14px; }
-QCheckBox::indicator:hover { border: 2px solid #2B98F0; background-color: transparent; }
-QCheckBox::indicator:checked:hover { background-color: #2B98F0; border: 2px solid #73a5ce; }
-QCheckBox:indicator{ color: #67696a; background-color: transparent; border: 2px solid #67696a;
-width: 14px; height: 14px; border-radius: 2px; }
-QCheckBox::indicator:checked { border: 2px solid #18191b;
-background-color: #2B98F0; color: #ffffff; }
-QCheckBox::hover { spacing: 12px; background: transparent; color: #ffffff; }
-QCheckBox::checked { color: #ffffff; }
-QCheckBox::indicator:disabled, QRadioButton::indicator:disabled { border: 1px solid #444; }
-QCheckBox:disabled { background: transparent; color: #414141; font-family: Source Sans Pro;
-font-size: 14px; margin: 0px; text-align: center; }
-
-QComboBox { color: #FFFFFF; font-size: 14px; font-family: Source Sans Pro;
-selection-background-color: #1d1e1f; background-color: #1d1e1f; }
-QComboBox:hover { color: #c9c9c9; font-size: 14px; font-family: Source Sans Pro;
-selection-background-color: #232426; background-color: #232426; } """)
-
-
-"""
-#################################################################################################
-#################################################################################################
-"""
-
-class LiveLinkUI(QWidget):
-
-    Instance = []
-    Settings = [0, 0, 0]
-
-
-    # UI Widgets
-
-    def __init__(self, _importerSetup_, parent=GetHostApp()):
-        super(LiveLinkUI, self).__init__(parent)
-
-        LiveLinkUI.Instance = self
-        self.Importer = _importerSetup_
-
-        self._path_ = _path_
-        self.setObjectName("LiveLinkUI")
-        img_ = QPixmap( os.path.join(self._path_, "MS_Logo.png") )
-        self.setWindowIcon(QIcon(img_))
-        self.setMinimumWidth(250)
-        self.setWindowTitle("MS Plugin " + MSLIVELINK_VERSION + " - 3ds Max")
-        self.setWindowFlags(Qt.Window)
-
-        self.style_ = ("""  QWidget#LiveLinkUI { background-color: #262729; } """)
-        self.setStyleSheet(self.style_)
-
-        # style_ = ("QLabel {background-color: #232325; font-size: 14px;font-family: Source Sans Pro; color: #afafaf;}")
-
-        # Set the main layout
-        self.MainLayout = QVBoxLayout()
-        self.setLayout(self.MainLayout)
-        self.MainLayout.setSpacing(5)
-        self.MainLayout.setContentsMargins(5, 2, 5, 2)
-
-
-        # Set the checkbox options
-
-        self.checks_l = QVBoxLayout()
-        self.checks_l.setSpacing(2)
-        self.MainLayout.addLayout(self.checks_l)
-
-        self.applytoSel = QCheckBox("Apply Material to Selection")
-        self.applytoSel.setToolTip("Applies the imported material(s) to your selection.")
-        self.applytoSel.setChecked( self.Importer.getPref("Material_to_Sel") )
-        self.applytoSel.setFixedHeight(30)
-        self.applytoSel.setStyleSheet(stylesheet_)
-        self.checks_l.addWidget(self.applytoSel)
-        
-        
-        # Enable Displacement Check Box
-        # Set the checkbox options
-
-        self.checks_l = QVBoxLayout()
-        self.checks_l.setSpacing(2)
-        self.MainLayout.addLayout(self.checks_l)
-
-        self.enableDisplacement = QCheckBox("Import 3D Assets with Displacement")
-        self.enableDisplacement.setToolTip("Enables displacement for 3D Assets")
-        self.enableDisplacement.setChecked( self.Importer.getPref("Enable_Displacement") )
-        self.enableDisplacement.setFixedHeight(30)
-        self.enableDisplacement.setStyleSheet(stylesheet_)
-        self.checks_l.addWidget(self.enableDisplacement)
-        
-        
-        # Save current import settings
-        self.applytoSel.stateChanged.connect(self.settingsChanged)
-        self.enableDisplacement.stateChanged.connect(self.settingsChanged)
-
-    # UI Callbacks
-    def settingsChanged(self):
-        settings_data = self.Importer.loadSettings()
-        settings_data["Material_to_Sel"] = self.applytoSel.isChecked()
-        settings_data["Enable_Displacement"] = self.enableDisplacement.isChecked()
-        self.Importer.updateSettings(settings_data)
 
 # LIVELINK INITIALIZER
 
 def initLiveLink():
+    return LoadUI().initLiveLink()
+
 
-    if LiveLinkUI.Instance != None:
-        try: LiveLinkUI.Instance.close()
-        except: pass
-
-    LiveLinkUI.Instance = LiveLinkUI(_importerSetup_)
-    LiveLinkUI.Instance.show()
-    pref_geo = QRect(500, 300, 460, 30)
-    LiveLinkUI.Instance.setGeometry(pref_geo)
-    return LiveLinkUI.Instance
-    
-    
 #LIVELINK MENU INSTALLER
 def createToolbarMenuPymxs():
     import pymxs
@@ -359,22 +210,22 @@ def createNewMenu():
 
     except Exception as e:
         print(f"{e}")
-        
+
 
 # Start the LiveLink server here.
 def StartSocketServer():
+    LoadUI().StartSocketServer()
+
+
+def StartDeferredSocketServer():
     try:
-        if len(QLiveLinkMonitor.Instance) == 0:
-            bridge_monitor = QLiveLinkMonitor()
-            bridge_monitor.Bridge_Call.connect(bridge_monitor.InitializeImporter)
-            bridge_monitor.start()
-        print("Quixel Bridge Plugin v" + MSLIVELINK_VERSION + " started successfully.")
-        
-    except:
-        print("Quixel Bridge Plugin v" + MSLIVELINK_VERSION + " failed to start.")
-        pass
-    
-    
+        if BridgeListener.Instance is None:
+            BridgeListener.Instance = BridgeListener()
+            BridgeListener.Instance.start()
+        print("Quixel Bridge Plugin listening on port %d." % MSLiveLinkStream.BRIDGE_PORT)
+    except Exception as e:
+        print(f"Quixel Bridge Plugin failed to start: {e}")
+
 
 # The file named builtins calls ours MS_API file from 3ds Max startup - afterwards MS_API is the __main__ file that is run directly with bridge exports
 # Start our socket server and setup Megascans menu in the Max Menu bar
@@ -397,5 +248,13 @@ if __name__ == "builtins" or __name__ == "__builtin__":
         except Exception as e:
             print(f"Failed to create menu for older versions of 3ds Max: {e}")
 
-    StartSocketServer()
-
+    # Deferred startup (default): only the socket listener runs until Bridge
+    # connects or the menu is clicked, see BridgeListener.
+    if IsDeferredStartup():
+        StartDeferredSocketServer()
+    else:
+        StartSocketServer()
+    print("Quixel Bridge Plugin startup took %.1f ms." % ((time.perf_counter() - _startTime_) * 1000.0))
+else:
+    # Imported as a module rather than run at startup: the UI names are there from the start
+    LoadUI()
@@ -1,15 +1,125 @@
-import os, sys, json, pymxs
+import os, sys, json, time
 import traceback
+from functools import lru_cache
 
-import MSVraySetup, MSLiveLinkHelpers, MSOctaneSetup, MSCoronaSetup, MSFStormSetup, MSArnoldSetup, MSRedshiftSetup
+import MSAssetClass, MSAssetIndex, MSAssetMeta, MSDiagnostics, MSFileProbe, MSProfiling, MSRenderer, MSRuntime, MSScriptCache, MSSettings, MSTemplate, MSTiming
+from MSRenderer import RendererType
+
+import MSLiveLinkHelpers
 
 helper = MSLiveLinkHelpers.LiveLinkHelper()
-VRayHelper = MSVraySetup.VraySetup()
-OctaneHelper = MSOctaneSetup.OctaneSetup()
-CoronaHelper = MSCoronaSetup.CoronaSetup()
-FStormHelper = MSFStormSetup.FStormSetup()
-ArnoldHelper = MSArnoldSetup.ArnoldSetup()
-RedshiftHelper = MSRedshiftSetup.RedshiftSetup()
+rendererProbe = MSRenderer.RendererProbe()
+
+# Material setup per renderer, looked up in initAssetImport. The setup modules are
+# only imported once their renderer is used, see MSRenderer.SetupRegistry.
+MATERIAL_SETUPS = MSRenderer.SetupRegistry()
+
+# Renderers whose material setups read the bitmaps declared by TextureSetup.
+TEXTURE_SETUP_RENDERERS = frozenset([RendererType.ARNOLD, RendererType.CORONA, RendererType.REDSHIFT, RendererType.OCTANE])
+
+# Bitmap variables declared by TextureSetup and the texture slot each one loads.
+BITMAP_SLOTS = [
+    ("albedoBitmap", "ALBEDO"),
+    ("diffuseBitmap", "ALBEDO"),
+    ("roughnessBitmap", "ROUGHNESS"),
+    ("opacityBitmap", "OPACITY"),
+    ("normalBitmap", "NORMAL"),
+    ("metallicBitmap", "METALNESS"),
+    ("translucencyBitmap", "TRANSLUCENCY"),
+    ("transmissionBitmap", "TRANSMISSION"),
+    ("displacementBitmap", "DISPLACEMENT"),
+    ("specularBitmap", "SPECULAR"),
+    ("glossBitmap", "GLOSS"),
+    ("FuzzBitmap", "FUZZ"),
+    ("aoBitmap", "AO"),
+    ("cavityBitmap", "CAVITY"),
+    ("bumpBitmap", "BUMP"),
+    ("normalbumpBitmap", "NORMALBUMP"),
+]
+
+# MaxScript making one of the helper calls of PreparedAsset.mainThreadCalls from a batch script.
+MAIN_THREAD_CALL = 'python.Execute "import MS_Importer; MS_Importer.helper.{}()"\n'
+
+# Every placeholder GetPlaceholders can resolve, see MSTemplate.
+PLACEHOLDERS = MSTemplate.Placeholders(
+    [
+        "SELOPTION", "MS_MATNAME", "MSTYPE", "FBXPATHLIST", "MSLOD",
+        '"MSFABRIC"', "MSFABRIC", "MSMETAL", "MSBAREMETAL", "MSFRUIT", "MSCUSTOM",
+        "MS_METAL", "MS_BAREMETAL", "MS_FABRIC", "MS_FRUIT", "MS_DISP", "MS_PLANT", "MS_SSS",
+        "SPECULARTOIOR", "MS_HEIGHT", "SCATTERPARENTNAME",
+    ],
+    [r'TEX_[A-Z0-9_]+"', r'"CS_[A-Z0-9_]+"'],
+)
+
+
+@lru_cache(maxsize=64)
+def BuildTextureSetup(isOctane, textureTypes):
+    """
+    Compiled TextureSetup template for an asset with the given texture types. Only
+    the slots the asset has load a file; every other bitmap variable is set to undefined.
+    """
+    lines_ = ["", "            --Bitmaptextures" if isOctane else "            --Bitmaps", ""]
+    for bitmapName, slot_ in BITMAP_SLOTS:
+        if slot_.lower() not in textureTypes:
+            lines_.append(f"            {bitmapName} = undefined")
+        elif isOctane:
+            lines_.append(f'            {bitmapName} = Bitmaptexture fileName: "TEX_{slot_}" gamma: "CS_{slot_}"')
+        else:
+            lines_.append(f'            {bitmapName} = openBitmap "TEX_{slot_}" gamma: "CS_{slot_}"')
+    lines_.append("            ")
+    return MSTemplate.CompiledTemplate("\n".join(lines_), PLACEHOLDERS)
+
+
+MESH_SETUP = MSTemplate.CompiledTemplate("""
+        FBXImporterSetParam "ScaleFactor" 1
+        selToMat = "SELOPTION"
+        old_sel = for s in selection collect s
+
+        assetType = "MSTYPE"
+        assetLOD = "MSLOD"
+        isFabric = "MSFABRIC"
+        isMetal = "MSMETAL"
+        isBareMetal = "MSBAREMETAL"
+        isCustom = "MSCUSTOM"
+        isFruit = "MSFRUIT"
+
+        
+        MSFabric = MS_FABRIC
+        MSMetal = MS_METAL
+        MSBareMetal = MS_BAREMETAL
+        MSFruit = MS_FRUIT
+        Disp = MS_DISP
+        MSPlant = MS_PLANT
+        SSSSurface = MS_SSS
+
+        meshes_ = #(FBXPATHLIST)
+
+        oldObj = objects as array
+
+        for geo in meshes_ do (
+            ImportFile geo #noprompt
+        )
+
+        newObj = for o in objects where findItem oldObj o == 0 collect o
+
+        select newObj
+        if (selToMat == "Enabled") do (
+            selectMore old_sel
+        )
+
+        CurOBJs = for s in selection collect s
+        """, PLACEHOLDERS)
+
+SCATTER_SETUP = MSTemplate.CompiledTemplate("""
+        actionMan.executeAction 0 "40043"  -- Selection: Select None
+
+        parentObject = Point pos:[0,0,0] name:"SCATTERPARENTNAME"
+
+        select CurOBJs
+        for o in selection do o.parent = parentObject
+        actionMan.executeAction 0 "40043"  -- Selection: Select None
+        """, PLACEHOLDERS)
+
 
 class LiveLinkImporter():
     Identifier = None
@@ -17,27 +127,165 @@ class LiveLinkImporter():
 
     def __init__(self):
         self._path_ = os.path.dirname(__file__).replace("\\", "/")
+        self.heldSettings = None
+        self.SettingsStore = MSSettings.SettingsStore(os.path.join(self._path_, "Settings.json"), self.defaultSettings())
         self.Settings = self.loadSettings()
         self.toSelRequest = self.Settings["Material_to_Sel"]
+        self.Batch = None
+        # Counts imports; starts from the clock so the ids the generated scripts
+        # compare against stay unique when the plugin is reloaded in a 3ds Max session.
+        self.ImportID = int(time.time() * 1000)
+        self.MaxVersion = 0
+        self.FileProbe = MSFileProbe.FileProbe()
         LiveLinkImporter.Identifier = self
 
     def set_Asset_Data(self, json_data):
-        self.SetRenderEngine()
-        if(self.Renderer == "Not-Supported"):
+        if self.Batch is None:
+            self.ImportID += 1
+            self.FileProbe = MSFileProbe.FileProbe()
+            self.MaxVersion = helper.GetMaxVersion()
+            self.SetRenderEngine()
+            if not self.CheckRenderEngine():
+                return
+
+        prepared_ = self.PrepareAsset(json_data)
+        if prepared_ is not None:
+            self.CommitAsset(prepared_)
+
+    def PrepareAsset(self, json_data):
+        """
+        Pure-Python half of an import: parses json_data and renders its script. It
+        does not call into 3ds Max, so MSImportWorker can run it off the main thread;
+        the 3ds Max calls the asset needs come back in PreparedAsset.mainThreadCalls.
+        Assets imported before with the same inputs come from MSScriptCache.
+        """
+        if self.Renderer == RendererType.NOT_SUPPORTED:
+            return None
+        if not MSScriptCache.cache.isEnabled or MSProfiling.profiler.IsArmed():
+            self.json_data = json_data
+            self.parseJSON()
+            return self.initAssetImport()
+
+        if self.Batch is None:
+            self.loadSettings()
+        key_ = self.GetScriptCacheKey(json_data)
+        importID = str(self.ImportID)
+        entry_ = MSScriptCache.cache.Get(key_)
+        if entry_ is not None:
+            return PreparedAsset(
+                entry_["id"],
+                entry_["script"].replace(MSScriptCache.IMPORT_ID_TOKEN, importID),
+                [getattr(helper, name_) for name_ in entry_["mainThreadCalls"]],
+                [prelude_.replace(MSScriptCache.IMPORT_ID_TOKEN, importID) for prelude_ in entry_["preludes"]]
+            )
+
+        # Generated against the token, so the entry serves later imports too
+        self.json_data = json_data
+        self.parseJSON()
+        prepared_ = self.initAssetImport(MSScriptCache.IMPORT_ID_TOKEN)
+        MSScriptCache.cache.Put(
+            key_, prepared_.ID, prepared_.script, [call_.__name__ for call_ in prepared_.mainThreadCalls],
+            prepared_.preludes
+        )
+        prepared_.script = prepared_.script.replace(MSScriptCache.IMPORT_ID_TOKEN, importID)
+        prepared_.preludes = [prelude_.replace(MSScriptCache.IMPORT_ID_TOKEN, importID) for prelude_ in prepared_.preludes]
+        return prepared_
+
+    def GetScriptCacheKey(self, json_data):
+        """
+        MSScriptCache key of json_data: the JSON and everything else the script
+        is generated from, including the size and modification time of the
+        textures and of the .exr variants parseJSON prefers for displacement, the
+        MSAssetClass classes (so rules added with AddRule count) and the material
+        setup registered for the renderer.
+        """
+        textures_ = []
+        for obj in json_data.get("components", []):
+            path_ = obj.get("path", "")
+            textures_.append((path_, self.FileProbe.Fingerprint(path_)))
+            if obj.get("type") == "displacement":
+                exr_ = os.path.splitext(path_)[0] + ".exr"
+                textures_.append((exr_, self.FileProbe.Fingerprint(exr_)))
+        return MSScriptCache.cache.Key(
+            MSScriptCache.PluginVersion(self._path_),
+            self._path_,
+            self.Renderer,
+            self.MaxVersion,
+            self.Settings["Material_to_Sel"],
+            self.Settings["Enable_Displacement"],
+            MSAssetIndex.GetPolicy(self.Settings),
+            MSTiming.recorder.isEnabled,
+            MSAssetClass.Classify(json_data),
+            MATERIAL_SETUPS.Identity(self.Renderer) if self.Renderer in MATERIAL_SETUPS else None,
+            textures_,
+            json_data
+        )
+
+    def CommitAsset(self, prepared):
+        """
+        Main-thread half of an import: runs the asset's 3ds Max calls and executes its
+        script, or adds it to the current batch.
+        """
+        if self.Batch is not None:
+            # The calls run from the batch script, right before the asset's own
+            # script, as they would outside a batch. See WrapBatchScript.
+            self.Batch.append((
+                prepared.ID, prepared.script, [call_.__name__ for call_ in prepared.mainThreadCalls], prepared.preludes
+            ))
+            if self.BatchChunkSize and len(self.Batch) >= self.BatchChunkSize:
+                self.FlushBatch()
+            return
+
+        for call_ in prepared.mainThreadCalls:
+            call_()
+        self.ExecuteScript(self.WrapScript("".join(prepared.preludes) + prepared.script), [prepared.ID])
+
+    def CheckRenderEngine(self):
+        if(self.Renderer == RendererType.NOT_SUPPORTED):
             msg = (
                 "Your current render engine is not supported by the Bridge Plugin, "
                 "so we are terminating the import process, but the Plugin is still running!"
             )
             helper.ShowMessageDialog("MS Plugin Error", msg)
             print(msg)
+            return False
+        print("Your current render engine is " + self.Renderer)
+        return True
+
+    def BeginBatch(self, chunkSize=None):
+        """
+        Starts bulk mode: the renderer is probed and the settings are read once, and
+        the scripts of the following assets are collected and run together, either
+        all at EndBatch or every chunkSize assets (Settings "Bulk_Chunk_Size", 0 = all).
+        """
+        if self.heldSettings is None:
+            self.loadSettings()
+        self.toSelRequest = self.Settings["Material_to_Sel"]
+        if chunkSize is None:
+            chunkSize = self.Settings.get("Bulk_Chunk_Size", 0)
+        self.BatchChunkSize = chunkSize
+        self.Batch = []
+        self.ImportID += 1
+        self.FileProbe = MSFileProbe.FileProbe()
+        self.MaxVersion = helper.GetMaxVersion()
+        self.SetRenderEngine()
+        self.CheckRenderEngine()
+
+    def EndBatch(self):
+        if self.Batch is None:
             return
-        else:
-            print("Your current render engine is " + self.Renderer)
+        self.FlushBatch()
+        self.Batch = None
+        rendererProbe.Expire()
 
-        self.json_data = json_data
-        self.parseJSON()
-        self.initAssetImport()
+    def FlushBatch(self):
+        if not self.Batch:
+            return
+        batch_ = self.Batch
+        self.Batch = []
+        self.ExecuteScript(self.WrapBatchScript(batch_), [assetID for assetID, script_, calls_, preludes_ in batch_])
 
+    @MSTiming.Timed("parse")
     def parseJSON(self):
         """
         Gathers metadata from self.json_data, sets up relevant internal fields.
@@ -50,36 +298,24 @@ class LiveLinkImporter():
         self.minLOD = self.json_data["minLOD"]
         self.ID = self.json_data["id"]
         self.Path = self.json_data["path"]
-        self.isScatterAsset = self.CheckScatterAsset()
+        # Tags and categories are normalized once and every material class comes
+        # from MSAssetClass.CLASSIFICATION_RULES.
+        self.AssetClasses = MSAssetClass.Classify(self.json_data)
+        self.isScatterAsset = self.AssetClasses["isScatterAsset"]
         self.isBillboard = self.CheckIsBillboard()
 
-        self.isMetal = bool(self.json_data["category"] == "Metal" and self.Type == "surface")
-        self.isBareMetal = bool("colorless" in [item.lower() for item in self.json_data["tags"]] and self.isMetal)
-        self.isFruit = bool(
-            "fruits" in [item.lower() for item in self.json_data["tags"]]
-            or "fruit" in [item.lower() for item in self.json_data["tags"]]
-            or "fruits" in [item.lower() for item in self.json_data["categories"]]
-            or "fruit" in [item.lower() for item in self.json_data["categories"]]
-        )
+        self.isMetal = self.AssetClasses["isMetal"]
+        self.isBareMetal = self.AssetClasses["isBareMetal"]
+        self.isFruit = self.AssetClasses["isFruit"]
         self.useDisplacement = bool(
             ((self.activeLOD != "high") and self.Settings["Enable_Displacement"])
             or (self.Type != "3d")
         )
         self.isSpecularWorkflow = bool(self.json_data["workflow"] == "specular")
         self.isAlembic = helper.GetMeshType(self.json_data["meshList"])
-        self.isFabric = bool(
-            "fabric" in [item.lower() for item in self.json_data["tags"]]
-            or "fabric" in [item.lower() for item in self.json_data["categories"]]
-        )
-        self.isPlant = bool(self.Type == "3dplant")
-        self.isSurfaceSSS = (
-            self.Type == "surface"
-            and (
-                "moss" in [cat.lower() for cat in self.json_data["categories"]]
-                or "skin" in [cat.lower() for cat in self.json_data["categories"]]
-                or "snow" in [cat.lower() for cat in self.json_data["categories"]]
-            )
-        )
+        self.isFabric = self.AssetClasses["isFabric"]
+        self.isPlant = self.AssetClasses["isPlant"]
+        self.isSurfaceSSS = self.AssetClasses["isSurfaceSSS"]
 
         texturesListName = "components"
         if self.isBillboard:
@@ -95,10 +331,8 @@ class LiveLinkImporter():
 
             # If there's a displacement map, prefer .exr if it exists
             if texType == "displacement" and self.useDisplacement:
-                dirn_ = os.path.dirname(texPath)
-                filen_ = os.path.splitext(os.path.basename(texPath))[0]
-                possible_exr = os.path.join(dirn_, filen_ + ".exr")
-                if os.path.exists(possible_exr):
+                possible_exr = self.FileProbe.FindVariant(texPath, ".exr")
+                if possible_exr is not None:
                     texPath = possible_exr
                     texFormat = "exr"
 
@@ -119,35 +353,49 @@ class LiveLinkImporter():
                 self.Name = "_".join(self.Name.split("_")[:-1])
 
         self.materialName = self.ID + "_" + self.Name
+        self.assetKey = MSAssetIndex.AssetKey(
+            self.ID, self.activeLOD, MSAssetIndex.AssetResolution(self.json_data, self.TexturesList),
+            self.Renderer, self.useDisplacement
+        )
 
+        # Parsed once and shared with the renderer setups through RendererData.
+        self.meta = self.json_data.get("meta")
+        self.assetMeta = MSAssetMeta.AssetMeta(self.meta)
+        self.isMultiMatAsset = helper.HasMultipleMaterial(self.meta)
+
+        # The scan size and height the renderer setups have always been given: the
+        # helper's scan area, and the height value with its "m" dropped.
         self.scanWidth = 1
         self.scanHeight = 1
-        self.meta = None
-
         try:
-            if "meta" in self.json_data.keys():
-                self.meta = self.json_data["meta"]
+            if self.meta is not None:
                 self.scanWidth = helper.GetScanWidth(self.meta)
                 self.scanHeight = helper.GetScanHeight(self.meta)
-                height_ = [item for item in self.meta if item["key"].lower() == "height"]
-                if len(height_) >= 1:
-                    self.height = str(height_[0]["value"].replace("m", ""))
-                    self.height = float(self.height) * (39.37 / 2 * (self.scanWidth / 2.1))
+                height_ = self.assetMeta.Get("height")
+                if height_ is not None:
+                    self.height = float(height_.replace("m", "")) * (39.37 / 2 * (self.scanWidth / 2.1))
                     if self.Type == "3d":
                         self.height = 0.005 * 39.37
-        except:
+        except Exception:
             pass
 
-    def initAssetImport(self):
+    @MSTiming.Timed("generate")
+    def initAssetImport(self, importID=None):
         """
-        Actually builds the final MaxScript string (render_setup) and executes it.
-        We'll wrap it with a try/catch and log to a file.
+        Builds the final MaxScript string (render_setup) of the asset and returns it
+        as a PreparedAsset; CommitAsset executes it wrapped in a try/catch. The
+        script compares against importID, self.ImportID by default.
         """
-        self.Settings = self.loadSettings()
-        self.toSelRequest = self.Settings["Material_to_Sel"]
+        if self.Batch is None:
+            if self.heldSettings is None:
+                self.loadSettings()
+            self.toSelRequest = self.Settings["Material_to_Sel"]
+
+        mainThreadCalls = []
+        if len(self.GeometryList) > 0 and self.isAlembic and self.MaxVersion >= 2019:
+            mainThreadCalls.append(helper.SetAlembicImportSettings)
 
-        if len(self.GeometryList) > 0 and self.isAlembic and helper.GetMaxVersion() >= 2019:
-            helper.SetAlembicImportSettings()
+        placeholders_ = self.GetPlaceholders()
 
         assetData = RendererData(
             self.TexturesList,
@@ -162,138 +410,58 @@ class LiveLinkImporter():
             self.isSpecularWorkflow,
             self.scanWidth,
             self.scanHeight,
-            self.meta
+            self.meta,
+            self.ID,
+            self.assetMeta,
+            self.isMultiMatAsset,
+            frozenset(self.VerifiedTextures),
+            self.ImportID if importID is None else importID,
+            self.assetKey,
+            MSAssetIndex.GetPolicy(self.Settings),
+            mainThreadCalls
         )
 
-        # Build the script
-        render_setup = ""
+        # Build the script. The static sections are templates compiled when the
+        # module is loaded; generated text is rendered in one pass, see MSTemplate.
+        sections_ = []
 
         if not assetData.applyToSel:
-            render_setup += "clearSelection()\n"
+            sections_.append("clearSelection()\n")
 
-        isMultiMatAsset = helper.HasMultipleMaterial(self.meta)
+        isMultiMatAsset = self.isMultiMatAsset
         if isMultiMatAsset and "obj" in self.json_data["meshFormat"].lower():
-            render_setup += helper.OpenObjImpFile()
-            render_setup += helper.GetObjSetting("Objects", "SingleMesh", "isSingleMesh")
-            render_setup += helper.ChangeObjSetting("Objects", "SingleMesh", "1")
-
-        render_setup += self.MeshSetup()
-
-        if self.toSelRequest and self.Type.lower() not in ["3dplant", "3d"]:
-            render_setup = render_setup.replace("SELOPTION", "Enabled")
-        else:
-            render_setup = render_setup.replace("SELOPTION", "Disabled")
-
-        if self.Renderer in ["Arnold", "Corona", "Redshift", "Octane"]:
-            render_setup += self.TextureSetup()
-
-        import MSVraySetup, MSCoronaSetup, MSFStormSetup, MSArnoldSetup, MSRedshiftSetup
-        # V-Ray
-        if self.Renderer == "Arnold":
-            render_setup += MSArnoldSetup.ArnoldSetup().GetMaterialSetup(assetData)
-        elif self.Renderer == "Corona":
-            render_setup += MSCoronaSetup.CoronaSetup().GetMaterialSetup(assetData)
-        elif self.Renderer == "Vray":
-            render_setup += MSVraySetup.VraySetup().GetVRayRenderSetup(assetData)
-        elif self.Renderer == "Redshift":
-            render_setup += MSRedshiftSetup.RedshiftSetup().GetMaterialSetup(assetData)
-        elif self.Renderer == "FStorm":
-            import MSFStormSetup
-            render_setup += MSFStormSetup.FStormSetup().GetMaterialSetup(assetData)
-        elif self.Renderer == "Octane":
-            import MSOctaneSetup
-            render_setup += MSOctaneSetup.OctaneSetup().GetMaterialSetup(assetData)
-
-        # Build placeholders
-        maplist_ = [(item["path"], item["format"], item["type"]) for item in self.json_data["components"]]
-        for map_ in maplist_:
-            texture_ = map_[0]
-            format_ = map_[1]
-            if map_[2].lower() == "displacement":
-                dirn_ = os.path.dirname(map_[0])
-                filen_ = os.path.splitext(os.path.basename(map_[0]))[0]
-                if os.path.exists(os.path.join(dirn_, filen_ + ".exr")):
-                    texture_ = os.path.join(dirn_, filen_ + ".exr")
-                    format_ = "exr"
-
-            c_space = 1.0
-            if format_.lower() in ["exr"]:
-                c_space = 1.0
-            if map_[2].lower() in ["albedo", "specular", "translucency"] and format_.lower() not in ["exr"]:
-                c_space = 2.2
-
-            placeholderFile = "TEX_" + map_[2].upper() + '"'
-            placeholderGamma = '"CS_' + map_[2].upper() + '"'
-            render_setup = render_setup.replace(placeholderFile, texture_.replace("\\", "/") + '"')
-            render_setup = render_setup.replace(placeholderGamma, str(c_space))
-
-        render_setup = render_setup.replace("MS_MATNAME", self.materialName)
-        render_setup = render_setup.replace("MSTYPE", self.Type.lower())
-
-        pathlist_ = ", ".join(
-            ('"'+ item["path"].replace("\\", "/") +'"') for item in self.json_data["meshList"]
-        )
-        render_setup = render_setup.replace("FBXPATHLIST", pathlist_)
-        render_setup = render_setup.replace("MSLOD", self.activeLOD)
-
-        if "tags" in self.json_data.keys():
-            if "fabric" in [item.lower() for item in self.json_data["tags"]]:
-                render_setup = render_setup.replace("MSFABRIC", "isFabric")
-            else:
-                render_setup = render_setup.replace('"MSFABRIC"', "false")
-
-            if "metal" in self.json_data["tags"] or "metal" in self.json_data["categories"]:
-                render_setup = render_setup.replace("MSMETAL", "isMetal")
+            sections_.append(MSTemplate.RenderTemplate(helper.OpenObjImpFile(), placeholders_, PLACEHOLDERS))
+            sections_.append(MSTemplate.RenderTemplate(helper.GetObjSetting("Objects", "SingleMesh", "isSingleMesh"), placeholders_, PLACEHOLDERS))
+            sections_.append(MSTemplate.RenderTemplate(helper.ChangeObjSetting("Objects", "SingleMesh", "1"), placeholders_, PLACEHOLDERS))
 
-            if (
-                "colorless" in self.json_data["tags"]
-                and "metal" in self.json_data["tags"]
-            ) or ("metal" in self.json_data["categories"]):
-                render_setup = render_setup.replace("MSBAREMETAL", "isBareMetal")
+        # Each section logs its 3ds Max run time when timing is on, see MSTiming
+        timing_ = MSTiming.recorder
+        sections_.append(timing_.WrapSection("max.mesh", self.MeshSetup().Render(placeholders_)))
 
-            if "fruits" in self.json_data["tags"]:
-                render_setup = render_setup.replace("MSFRUIT", "isFruit")
-
-            if "isCustom" in self.json_data.keys():
-                if self.json_data["isCustom"] == True:
-                    render_setup = render_setup.replace("MSCUSTOM", "isCustom")
-
-        render_setup = render_setup.replace("MS_METAL", str(self.isMetal).lower())
-        render_setup = render_setup.replace("MS_BAREMETAL", str(self.isBareMetal).lower())
-        render_setup = render_setup.replace("MS_FABRIC", str(self.isFabric).lower())
-        render_setup = render_setup.replace("MS_FRUIT", str(self.isFruit).lower())
-        render_setup = render_setup.replace("MS_DISP", str(self.useDisplacement).lower())
-        render_setup = render_setup.replace("MS_PLANT", str(self.isPlant).lower())
-        render_setup = render_setup.replace("MS_SSS", str(self.isSurfaceSSS).lower())
-
-        # If Corona or Redshift placeholders exist
-        if self.Renderer.lower() == "corona":
-            render_setup = render_setup.replace(
-                "SPECULARTOIOR",
-                os.path.join(self._path_, "SpecularToIOR.CUBE").replace("\\", "/")
-            )
-            render_setup = render_setup.replace("MS_HEIGHT", str(self.height))
+        if self.Renderer in TEXTURE_SETUP_RENDERERS:
+            sections_.append(timing_.WrapSection("max.textures", self.TextureSetup().Render(placeholders_)))
 
-        if self.Renderer.lower() == "redshift":
-            render_setup = render_setup.replace("MS_HEIGHT", str(self.height))
+        material_ = MATERIAL_SETUPS[self.Renderer](assetData)
+        sections_.append(timing_.WrapSection("max.material", MSTemplate.RenderTemplate(material_, placeholders_, PLACEHOLDERS)))
 
         if self.isScatterAsset:
-            render_setup += self.ScatterSetup()
-            render_setup = render_setup.replace("SCATTERPARENTNAME", self.materialName)
+            scatter_ = self.ScatterSetup().Render({"SCATTERPARENTNAME": self.materialName})
+            sections_.append(timing_.WrapSection("max.scatter", scatter_))
+
+        render_setup = "".join(sections_)
 
         if isMultiMatAsset and "obj" in self.json_data["meshFormat"].lower():
             render_setup += helper.ResetObjIniValue("Objects", "SingleMesh", "isSingleMesh")
 
-        if self.Renderer == "Octane":
-            updated_line = ""
-            for script_line in render_setup.splitlines():
-                if "TEX_" in script_line:
-                    updated_line = "--" + script_line
-                    render_setup = render_setup.replace(script_line, updated_line)
+        if self.Renderer == RendererType.OCTANE:
+            render_setup = MSTemplate.CommentLines(render_setup, "TEX_")
+
+        return PreparedAsset(self.ID, render_setup, mainThreadCalls, assetData.preludes)
 
-        # 1) We'll wrap that in a MaxScript try/catch
-        # 2) We'll write the entire final script to disk
-        msLogFile = "C:/temp/megascans_script.ms"
+    def WrapScript(self, render_setup):
+        """
+        Wraps the final script in a MaxScript try/catch that logs to a file.
+        """
         msTryCatch = f"""
 try(
 {render_setup}
@@ -305,167 +473,159 @@ catch(errMsg) (
     close logFileHandle
 )
 """
+        return msTryCatch
 
-        # Write this final script to disk so we can see EXACTLY what's run
-        try:
-            with open(msLogFile, "w") as f:
-                f.write(msTryCatch)
-        except Exception as e:
-            print("Error writing to msLogFile:", e)
+    def WrapBatchScript(self, batch):
+        """
+        Joins the scripts of a batch into one MaxScript. Every asset gets its own
+        try/catch that appends the failing asset ID to the error log, so one broken
+        asset neither hides which one failed nor stops the rest of the batch.
+        The asset's main-thread calls (helper method names) are made from its block
+        through python.Execute, so they keep their place between the scripts.
+        The preludes of the assets come first, each one once.
+        """
+        preludes_ = []
+        blocks_ = []
+        for assetID, render_setup, calls_, assetPreludes in batch:
+            preludes_ += [prelude_ for prelude_ in assetPreludes if prelude_ not in preludes_]
+            calls_ = "".join(MAIN_THREAD_CALL.format(name_) for name_ in calls_)
+            blocks_.append(f"""
+msBridgeAsset = "{assetID}"
+try(
+{calls_}{render_setup}
+)
+catch(errMsg) (
+    local logFileHandle = openFile "C:/temp/megascans_error.log" mode:"a"
+    format "MAXScript Error in asset %: %\\n" msBridgeAsset (getCurrentException()) to:logFileHandle
+    format "------------------\\n" to:logFileHandle
+    close logFileHandle
+)
+""")
+        return self.WrapScript("".join(preludes_ + blocks_))
+
+    def ExecuteScript(self, msTryCatch, assetIDs):
+        # Keep the final script (when diagnostics are on) so we can see EXACTLY what's run
+        MSDiagnostics.Record(assetIDs[0] if len(assetIDs) == 1 else "bulk", "megascans_script", msTryCatch, "ms")
 
         # Finally, run msTryCatch
         try:
             if not LiveLinkImporter.isDebugMode:
-                pymxs.runtime.execute(msTryCatch)
+                with MSTiming.Span("execute"):
+                    MSRuntime.Get().execute(msTryCatch)
+                MSTiming.recorder.CollectMaxScript(MSRuntime.Get())
         except Exception as e:
             # If it bombs at the python level, log it
             pythonLogFile = "C:/temp/megascans_python_error.log"
             with open(pythonLogFile, "a") as f:
                 f.write("=== Python-level Exception ===\n")
+                f.write("Assets: " + ", ".join(assetIDs) + "\n")
                 f.write(str(e) + "\n")
                 f.write(traceback.format_exc() + "\n")
             print(f"Python-level exception. See {pythonLogFile} for details.")
 
-    def SetRenderEngine(self):
-        selectedRenderer = str(pymxs.runtime.execute("renderers.current"))
-        selectedRenderer = selectedRenderer.lower()
-        self.Renderer = "Not-Supported"
-        if "corona" in selectedRenderer:
-            self.Renderer = "Corona"
-        elif "redshift" in selectedRenderer:
-            self.Renderer = "Redshift"
-        elif "v_ray" in selectedRenderer:
-            self.Renderer = "Vray"
-        elif "octane" in selectedRenderer:
-            self.Renderer = "Octane"
-        elif "fstorm" in selectedRenderer:
-            self.Renderer = "FStorm"
-        elif "arnold" in selectedRenderer:
-            self.Renderer = "Arnold"
+    def GetPlaceholders(self):
+        """
+        Builds the placeholder -> value context for the generated script. Entries
+        are added in the order the importer has always resolved them; the first
+        value for a placeholder wins. Also collects the texture slots whose file
+        was confirmed on disk in self.VerifiedTextures.
+        """
+        placeholders_ = {}
+        self.VerifiedTextures = set()
+        placeholders_["SELOPTION"] = "Disabled"
+        if self.toSelRequest and self.Type.lower() not in ["3dplant", "3d"]:
+            placeholders_["SELOPTION"] = "Enabled"
 
-    def MeshSetup(self):
-        return ("""
-        FBXImporterSetParam "ScaleFactor" 1
-        selToMat = "SELOPTION"
-        old_sel = for s in selection collect s
+        maplist_ = [(item["path"], item["format"], item["type"]) for item in self.json_data["components"]]
+        for map_ in maplist_:
+            texture_ = map_[0]
+            format_ = map_[1]
+            if map_[2].lower() == "displacement":
+                possible_exr = self.FileProbe.FindVariant(map_[0], ".exr")
+                if possible_exr is not None:
+                    texture_ = possible_exr
+                    format_ = "exr"
 
-        assetType = "MSTYPE"
-        assetLOD = "MSLOD"
-        isFabric = "MSFABRIC"
-        isMetal = "MSMETAL"
-        isBareMetal = "MSBAREMETAL"
-        isCustom = "MSCUSTOM"
-        isFruit = "MSFRUIT"
+            c_space = 1.0
+            if format_.lower() in ["exr"]:
+                c_space = 1.0
+            if map_[2].lower() in ["albedo", "specular", "translucency"] and format_.lower() not in ["exr"]:
+                c_space = 2.2
 
-        
-        MSFabric = MS_FABRIC
-        MSMetal = MS_METAL
-        MSBareMetal = MS_BAREMETAL
-        MSFruit = MS_FRUIT
-        Disp = MS_DISP
-        MSPlant = MS_PLANT
-        SSSSurface = MS_SSS
+            placeholderFile = "TEX_" + map_[2].upper() + '"'
+            if placeholderFile not in placeholders_ and self.FileProbe.Exists(texture_):
+                self.VerifiedTextures.add(map_[2].lower())
+            placeholders_.setdefault(placeholderFile, texture_.replace("\\", "/") + '"')
+            placeholders_.setdefault('"CS_' + map_[2].upper() + '"', str(c_space))
 
-        meshes_ = #(FBXPATHLIST)
+        # Assets with a diffuse map and no albedo load it into the albedo slots, see parseJSON.
+        if 'TEX_ALBEDO"' not in placeholders_ and 'TEX_DIFFUSE"' in placeholders_:
+            placeholders_['TEX_ALBEDO"'] = placeholders_['TEX_DIFFUSE"']
+            placeholders_['"CS_ALBEDO"'] = "1.0" if placeholders_['TEX_DIFFUSE"'].lower().endswith('.exr"') else "2.2"
+            if "diffuse" in self.VerifiedTextures:
+                self.VerifiedTextures.add("albedo")
 
-        oldObj = objects as array
+        placeholders_.setdefault("MS_MATNAME", self.materialName)
+        placeholders_.setdefault("MSTYPE", self.Type.lower())
 
-        for geo in meshes_ do (
-            ImportFile geo #noprompt
+        pathlist_ = ", ".join(
+            ('"'+ item["path"].replace("\\", "/") +'"') for item in self.json_data["meshList"]
         )
+        placeholders_.setdefault("FBXPATHLIST", pathlist_)
+        placeholders_.setdefault("MSLOD", self.activeLOD)
 
-        newObj = for o in objects where findItem oldObj o == 0 collect o
+        if "tags" in self.json_data.keys():
+            if self.AssetClasses["hasFabricTag"]:
+                placeholders_["MSFABRIC"] = "isFabric"
+            else:
+                placeholders_['"MSFABRIC"'] = "false"
 
-        select newObj
-        if (selToMat == "Enabled") do (
-            selectMore old_sel
-        )
+            if self.AssetClasses["hasMetalTag"]:
+                placeholders_["MSMETAL"] = "isMetal"
 
-        CurOBJs = for s in selection collect s
-        """)
+            if self.AssetClasses["hasBareMetalTag"]:
+                placeholders_["MSBAREMETAL"] = "isBareMetal"
 
-    def TextureSetup(self):
-        if self.Renderer == "Octane":
-            return ("""
-            --Bitmaptextures
-
-            albedoBitmap = undefined
-            diffuseBitmap = undefined
-            roughnessBitmap = undefined
-            opacityBitmap = undefined
-            normalBitmap = undefined
-            metallicBitmap = undefined
-            translucencyBitmap = undefined
-            transmissionBitmap = undefined
-            displacementBitmap = undefined
-            specularBitmap = undefined
-            glossBitmap = undefined
-            FuzzBitmap = undefined
-            aoBitmap = undefined
-            cavityBitmap = undefined
-            bumpBitmap = undefined
-            normalbumpBitmap = undefined
-
-            albedoBitmap = Bitmaptexture fileName: "TEX_ALBEDO" gamma: "CS_ALBEDO"
-            diffuseBitmap = Bitmaptexture fileName: "TEX_ALBEDO" gamma: "CS_ALBEDO"
-            roughnessBitmap = Bitmaptexture fileName: "TEX_ROUGHNESS" gamma: "CS_ROUGHNESS"
-            opacityBitmap = Bitmaptexture fileName: "TEX_OPACITY" gamma: "CS_OPACITY"
-            normalBitmap = Bitmaptexture fileName: "TEX_NORMAL" gamma: "CS_NORMAL"
-            metallicBitmap = Bitmaptexture fileName: "TEX_METALNESS" gamma: "CS_METALNESS"
-            translucencyBitmap = Bitmaptexture fileName: "TEX_TRANSLUCENCY" gamma: "CS_TRANSLUCENCY"
-            transmissionBitmap = Bitmaptexture fileName: "TEX_TRANSMISSION" gamma: "CS_TRANSMISSION"
-            displacementBitmap = Bitmaptexture fileName: "TEX_DISPLACEMENT" gamma: "CS_DISPLACEMENT"
-            specularBitmap = Bitmaptexture fileName: "TEX_SPECULAR" gamma: "CS_SPECULAR"
-            glossBitmap = Bitmaptexture fileName: "TEX_GLOSS" gamma: "CS_GLOSS"
-            FuzzBitmap = Bitmaptexture fileName: "TEX_FUZZ" gamma: "CS_FUZZ"
-            aoBitmap = Bitmaptexture fileName: "TEX_AO" gamma: "CS_AO"
-            cavityBitmap = Bitmaptexture fileName: "TEX_CAVITY" gamma: "CS_CAVITY"
-            bumpBitmap = Bitmaptexture fileName: "TEX_BUMP" gamma: "CS_BUMP"
-            normalbumpBitmap = Bitmaptexture fileName: "TEX_NORMALBUMP" gamma: "CS_NORMALBUMP"
-            """)
-        else:
-            return ("""
-            --Bitmaps
-
-            albedoBitmap = openBitmap "TEX_ALBEDO" gamma: "CS_ALBEDO"
-            diffuseBitmap = openBitmap "TEX_ALBEDO" gamma: "CS_ALBEDO"
-            roughnessBitmap = openBitmap "TEX_ROUGHNESS" gamma: "CS_ROUGHNESS"
-            opacityBitmap = openBitmap "TEX_OPACITY" gamma: "CS_OPACITY"
-            normalBitmap = openBitmap "TEX_NORMAL" gamma: "CS_NORMAL"
-            metallicBitmap = openBitmap "TEX_METALNESS" gamma: "CS_METALNESS"
-            translucencyBitmap = openBitmap "TEX_TRANSLUCENCY" gamma: "CS_TRANSLUCENCY"
-            transmissionBitmap = openBitmap "TEX_TRANSMISSION" gamma: "CS_TRANSMISSION"
-            displacementBitmap = openBitmap "TEX_DISPLACEMENT" gamma: "CS_DISPLACEMENT"
-            specularBitmap = openBitmap "TEX_SPECULAR" gamma: "CS_SPECULAR"
-            glossBitmap = openBitmap "TEX_GLOSS" gamma: "CS_GLOSS"
-            FuzzBitmap = openBitmap "TEX_FUZZ" gamma: "CS_FUZZ"
-            aoBitmap = openBitmap "TEX_AO" gamma: "CS_AO"
-            cavityBitmap = openBitmap "TEX_CAVITY" gamma: "CS_CAVITY"
-            bumpBitmap = openBitmap "TEX_BUMP" gamma: "CS_BUMP"
-            normalbumpBitmap = openBitmap "TEX_NORMALBUMP" gamma: "CS_NORMALBUMP"
-            """)
+            if self.AssetClasses["hasFruitTag"]:
+                placeholders_["MSFRUIT"] = "isFruit"
 
-    def ScatterSetup(self):
-        return ("""
-        actionMan.executeAction 0 "40043"  -- Selection: Select None
+            if "isCustom" in self.json_data.keys():
+                if self.json_data["isCustom"] == True:
+                    placeholders_["MSCUSTOM"] = "isCustom"
 
-        parentObject = Point pos:[0,0,0] name:"SCATTERPARENTNAME"
+        placeholders_["MS_METAL"] = str(self.isMetal).lower()
+        placeholders_["MS_BAREMETAL"] = str(self.isBareMetal).lower()
+        placeholders_["MS_FABRIC"] = str(self.isFabric).lower()
+        placeholders_["MS_FRUIT"] = str(self.isFruit).lower()
+        placeholders_["MS_DISP"] = str(self.useDisplacement).lower()
+        placeholders_["MS_PLANT"] = str(self.isPlant).lower()
+        placeholders_["MS_SSS"] = str(self.isSurfaceSSS).lower()
 
-        select CurOBJs
-        for o in selection do o.parent = parentObject
-        actionMan.executeAction 0 "40043"  -- Selection: Select None
-        """)
+        # If Corona or Redshift placeholders exist
+        if self.Renderer == RendererType.CORONA:
+            placeholders_["SPECULARTOIOR"] = os.path.join(self._path_, "SpecularToIOR.CUBE").replace("\\", "/")
+            placeholders_["MS_HEIGHT"] = str(self.height)
+
+        if self.Renderer == RendererType.REDSHIFT:
+            placeholders_["MS_HEIGHT"] = str(self.height)
+
+        return placeholders_
+
+    def SetRenderEngine(self):
+        self.Renderer = rendererProbe.Get()
+
+    def MeshSetup(self):
+        return MESH_SETUP
+
+    def TextureSetup(self):
+        textureTypes = frozenset(texType.lower() for texFormat, texType, texPath in self.TexturesList)
+        return BuildTextureSetup(self.Renderer == RendererType.OCTANE, textureTypes)
+
+    def ScatterSetup(self):
+        return SCATTER_SETUP
 
     def CheckScatterAsset(self):
-        if self.Type == "3d":
-            if (
-                "scatter" in self.json_data["categories"]
-                or "scatter" in self.json_data["tags"]
-                or "cmb_asset" in self.json_data["categories"]
-                or "cmb_asset" in self.json_data["tags"]
-            ):
-                return True
-        return False
+        return MSAssetClass.Classify(self.json_data)["isScatterAsset"]
 
     def CheckIsBillboard(self):
         if self.Type == "3dplant":
@@ -474,36 +634,76 @@ catch(errMsg) (
         return False
 
     def loadSettings(self):
-        if os.path.exists(os.path.join(self._path_, "Settings.json")):
-            with open(os.path.join(self._path_, "Settings.json"), 'r') as fl_:
-                self.Settings = json.load(fl_)
-        else:
-            self.createSettings()
+        if self.heldSettings is not None:
+            # An export is using self.Settings, see HoldSettings
+            return dict(self.heldSettings)
+        self.Settings = self.SettingsStore.Load()
+        self.configureModules()
         return self.Settings
 
+    def configureModules(self):
+        """
+        Applies self.Settings to the modules that keep their own copy of them.
+        """
+        MSDiagnostics.Configure(self.Settings)
+        MSProfiling.Configure(self.Settings)
+        MSScriptCache.Configure(self.Settings)
+        MSTiming.Configure(self.Settings)
+
     def createSettings(self):
         self.Settings = self.defaultSettings()
-        output_ = json.dumps(self.Settings, sort_keys=True, ensure_ascii=False, indent=2)
-        with open(os.path.join(self._path_, "Settings.json"), 'w') as outfile:
-            json.dump(self.Settings, outfile)
+        self.SettingsStore.Save(self.Settings)
 
     def defaultSettings(self):
         self.Settings = ({
             "Material_to_Sel": True,
             "WinGeometry": [0, 0, 0, 0],
-            "Enable_Displacement": True
+            "Enable_Displacement": True,
+            "Bulk_Chunk_Size": 10,
+            "Deferred_Startup": True,
+            "Background_Import": True,
+            "Parallel_Workers": 0,
+            "Parallel_Python": "",
+            "Reimport_Policy": MSAssetIndex.DEFAULT_POLICY,
+            "Diagnostics_Enabled": False,
+            "Diagnostics_Dir": "",
+            "Diagnostics_History": 5,
+            "Diagnostics_Max_KB": 1024,
+            "Timing_Enabled": False,
+            "Timing_History": 20,
+            "Script_Cache_Enabled": False,
+            "Script_Cache_Dir": "",
+            "Script_Cache_Max_MB": 64,
+            "Profile_Next_Imports": 0,
+            "Profile_Import_Count": 1,
+            "Profile_Dir": "",
+            "Profile_Top_Allocations": 25
         })
         return self.Settings
 
     def updateSettings(self, settings):
-        if os.path.exists(os.path.join(self._path_, "Settings.json")):
-            with open(os.path.join(self._path_, "Settings.json"), 'w') as outfile:
-                json.dump(settings, outfile)
-        else:
-            self.Settings = settings
-            output_ = json.dumps(self.Settings, sort_keys=True, ensure_ascii=False, indent=2)
-            with open(os.path.join(self._path_, "Settings.json"), 'w') as outfile:
-                json.dump(self.Settings, outfile)
+        self.SettingsStore.Update(settings)
+        if self.heldSettings is not None:
+            self.heldSettings = dict(settings)
+            return
+        self.Settings = settings
+        self.configureModules()
+
+    def HoldSettings(self):
+        """
+        Keeps self.Settings and the modules configured from them as they are until
+        ReleaseSettings, while an export is generated from them (on MSImportWorker's
+        thread too). Settings changed meanwhile are saved, and loadSettings returns
+        them, but they only apply once the export is done.
+        """
+        self.heldSettings = dict(self.Settings)
+
+    def ReleaseSettings(self):
+        settings_ = self.heldSettings
+        self.heldSettings = None
+        if settings_ is not None and settings_ != self.Settings:
+            self.Settings = settings_
+            self.configureModules()
 
     def getPref(self, request):
         return self.Settings[request]
@@ -524,7 +724,16 @@ class RendererData():
         isSpecular,
         width,
         height,
-        meta
+        meta,
+        assetID="",
+        assetMeta=None,
+        isMultiMaterial=None,
+        verifiedTextures=frozenset(),
+        importID=0,
+        assetKey="",
+        reimportPolicy=MSAssetIndex.POLICY_DUPLICATE,
+        mainThreadCalls=None,
+        preludes=None
     ):
         self.textureList = textureList
         self.textureTypes = textureTypes
@@ -539,3 +748,28 @@ class RendererData():
         self.width = width
         self.height = height
         self.meta = meta
+        self.assetID = assetID
+        self.assetMeta = assetMeta if assetMeta is not None else MSAssetMeta.AssetMeta(meta)
+        self.isMultiMaterial = isMultiMaterial
+        self.verifiedTextures = verifiedTextures
+        self.importID = importID
+        self.assetKey = assetKey
+        self.reimportPolicy = reimportPolicy
+        # 3ds Max calls of the material setup, run on the main thread by CommitAsset.
+        self.mainThreadCalls = mainThreadCalls if mainThreadCalls is not None else []
+        # MAXScript definitions the material script relies on. They are emitted once
+        # per executed script, ahead of its assets, see LiveLinkImporter.WrapBatchScript.
+        self.preludes = preludes if preludes is not None else []
+
+
+class PreparedAsset():
+    """
+    The generated script of one asset, ready for LiveLinkImporter.CommitAsset.
+    """
+    __slots__ = ("ID", "script", "mainThreadCalls", "preludes")
+
+    def __init__(self, assetID, script, mainThreadCalls=(), preludes=()):
+        self.ID = assetID
+        self.script = script
+        self.mainThreadCalls = mainThreadCalls
+        self.preludes = preludes
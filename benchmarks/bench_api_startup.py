@@ -0,0 +1,84 @@
+"""
+Time MS_API adds to 3ds Max startup with and without "Deferred_Startup", and the
+work the deferred startup moves to the first Bridge connection or menu click.
+
+Each measurement is a fresh interpreter on an MSRuntime.HeadlessRuntime:
+"deferred" and "eager" run MS_API the way 3ds Max does (exec'd as builtins: menu
+registration and socket listener), from a copy of MS_API.py next to a Settings.json
+with Deferred_Startup on and off; "first load" is what the first connection or
+menu click then runs on the main thread under the deferred startup: MSLiveLinkUI
+(Qt binding, importer module, UI classes), the monitor with its importer and the
+main window lookup. "eager" and "first load" need a Qt binding and the Quixel
+plugin modules; without them they are reported as unavailable.
+
+    python benchmarks/bench_api_startup.py [runs]
+"""
+import json, os, shutil, statistics, subprocess, sys, tempfile
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOTSTRAP = """
+import os, sys, time
+sys.path[:0] = %r
+import MSRuntime
+MSRuntime.Install(MSRuntime.HeadlessRuntime())
+start_ = time.perf_counter()
+%s
+seconds_ = time.perf_counter() - start_
+loaded_ = [name_ for name_ in ("MSLiveLinkUI", "MS_Importer") if name_ in sys.modules]
+loaded_ += sorted(name_ for name_ in sys.modules if name_.split(".")[0] in ("PySide6", "PySide2", "PySide", "PyQt5", "PyQt4"))[:1]
+print("RESULT", seconds_, ",".join(loaded_), flush=True)
+# The eager startup leaves the monitor's QThread running
+os._exit(0)
+"""
+
+# As the README has 3ds Max run it; runpy's run_name="builtins" would shadow the builtins module
+STARTUP = "filePath = %r; exec(open(filePath).read(), {'__file__': filePath})"
+
+MODES = [
+    ("deferred", True, STARTUP),
+    ("eager", False, STARTUP),
+    ("first load", None, "import MSLiveLinkUI; MSLiveLinkUI.CreateMonitor(); MSLiveLinkUI.GetHostApp()"),
+]
+
+
+def Run(code):
+    paths_ = [path_ for path_ in os.environ.get("PYTHONPATH", "").split(os.pathsep) if path_] + [_path_]
+    process_ = subprocess.run(
+        [sys.executable, "-c", BOOTSTRAP % (paths_, code)], capture_output=True, text=True, timeout=60
+    )
+    results_ = [line_ for line_ in process_.stdout.splitlines() if line_.startswith("RESULT")]
+    if process_.returncode != 0 or not results_:
+        raise RuntimeError((process_.stderr.strip().splitlines() or ["failed"])[-1])
+    result_ = results_[-1].split(" ", 2)
+    return float(result_[1]), result_[2] if len(result_) > 2 else ""
+
+
+def PluginCopy(directory, isDeferred):
+    """
+    MS_API.py next to a Settings.json with Deferred_Startup set, in directory.
+    """
+    shutil.copy(os.path.join(_path_, "MS_API.py"), directory)
+    with open(os.path.join(directory, "Settings.json"), "w") as f:
+        json.dump({"Deferred_Startup": isDeferred}, f)
+    return os.path.join(directory, "MS_API.py")
+
+
+def main():
+    runs_ = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    print("%-10s %10s  %s" % ("part", "median ms", "loaded"))
+    for label_, isDeferred, code_ in MODES:
+        try:
+            with tempfile.TemporaryDirectory() as plugin_:
+                if isDeferred is not None:
+                    code_ = code_ % PluginCopy(plugin_, isDeferred)
+                results_ = [Run(code_) for run_ in range(runs_)]
+        except RuntimeError as e:
+            print("%-10s %10s  %s" % (label_, "-", "unavailable: %s" % e))
+            continue
+        print("%-10s %10.2f  %s" % (label_, statistics.median(result_[0] for result_ in results_) * 1000.0,
+                                   results_[-1][1] or "-"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compares per-asset execution with bulk mode (LiveLinkImporter.BeginBatch) on a
+synthetic bulk export, on an MSRuntime.HeadlessRuntime that records every script
+3ds Max would have executed. MSScriptCache is off, so both modes generate every
+script.
+
+Needs the Quixel plugin modules (MSLiveLinkHelpers and the renderer setups) next
+to MS_Importer.py, as in an installed plugin folder.
+
+    python benchmarks/bench_batch.py [assets] [chunk_size]
+"""
+import os, sys, time
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _path_ not in sys.path:
+    sys.path.append(_path_)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import bridge_payloads
+import MSRuntime
+
+runtime_ = MSRuntime.Install(MSRuntime.HeadlessRuntime())
+
+import MS_Importer
+
+
+def Run(importer, payload, chunkSize):
+    runtime_.Reset()
+    start_ = time.perf_counter()
+    if chunkSize is None:
+        for asset_ in payload:
+            importer.set_Asset_Data(asset_)
+    else:
+        importer.BeginBatch(chunkSize)
+        for asset_ in payload:
+            importer.set_Asset_Data(asset_)
+        importer.EndBatch()
+    return time.perf_counter() - start_, [len(script_) for script_ in runtime_.Executed]
+
+
+def main():
+    assets_ = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    chunkSize = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    payload_ = bridge_payloads.SyntheticPayload(assets_)
+    restoreCache = bridge_payloads.OverrideScriptCache(False)
+    try:
+        importer_ = MS_Importer.LiveLinkImporter()
+        for label_, chunk_ in (("per-asset", None), ("bulk", chunkSize)):
+            elapsed_, scripts_ = Run(importer_, payload_, chunk_)
+            print("%-10s %8.2f ms  scripts executed: %4d  largest script: %8d B"
+                  % (label_, elapsed_ * 1000.0, len(scripts_), max(scripts_ or [0])))
+    finally:
+        restoreCache()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Microbenchmark for asset classification: the per-predicate list rebuilding that
+parseJSON and initAssetImport used to do, against MSAssetClass.Classify.
+
+Runs over a corpus of synthetic Bridge payloads with mixed-case tags and
+categories, and fails if any asset is classified differently.
+
+    python benchmarks/bench_classify.py [assets]
+"""
+import os, sys, random, time
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _path_ not in sys.path:
+    sys.path.append(_path_)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import MSAssetClass
+import bridge_payloads
+
+TAG_POOL = ["rock", "Rock", "metal", "Metal", "colorless", "Colorless", "fabric", "Fabric", "fruit",
+            "fruits", "Fruits", "scatter", "cmb_asset", "moss", "Skin", "snow", "wood", "plant", "ground",
+            "nature", "rough", "tileable", "brick", "concrete", "painted", "old", "dirty", "new"]
+
+
+def LegacyClassify(json_data):
+    Type = json_data["type"]
+    isMetal = bool(json_data["category"] == "Metal" and Type == "surface")
+    return {
+        "isMetal": isMetal,
+        "isBareMetal": bool("colorless" in [item.lower() for item in json_data["tags"]] and isMetal),
+        "isFruit": bool(
+            "fruits" in [item.lower() for item in json_data["tags"]]
+            or "fruit" in [item.lower() for item in json_data["tags"]]
+            or "fruits" in [item.lower() for item in json_data["categories"]]
+            or "fruit" in [item.lower() for item in json_data["categories"]]
+        ),
+        "isFabric": bool(
+            "fabric" in [item.lower() for item in json_data["tags"]]
+            or "fabric" in [item.lower() for item in json_data["categories"]]
+        ),
+        "isPlant": bool(Type == "3dplant"),
+        "isSurfaceSSS": (
+            Type == "surface"
+            and (
+                "moss" in [cat.lower() for cat in json_data["categories"]]
+                or "skin" in [cat.lower() for cat in json_data["categories"]]
+                or "snow" in [cat.lower() for cat in json_data["categories"]]
+            )
+        ),
+        "isScatterAsset": Type == "3d" and (
+            "scatter" in json_data["categories"]
+            or "scatter" in json_data["tags"]
+            or "cmb_asset" in json_data["categories"]
+            or "cmb_asset" in json_data["tags"]
+        ),
+        "hasFabricTag": "fabric" in [item.lower() for item in json_data["tags"]],
+        "hasMetalTag": "metal" in json_data["tags"] or "metal" in json_data["categories"],
+        "hasBareMetalTag": ("colorless" in json_data["tags"] and "metal" in json_data["tags"])
+        or ("metal" in json_data["categories"]),
+        "hasFruitTag": "fruits" in json_data["tags"],
+    }
+
+
+def BuildCorpus(count):
+    random_ = random.Random(1234)
+    corpus_ = bridge_payloads.SyntheticPayload(count)
+    for asset_ in corpus_:
+        asset_["tags"] = random_.sample(TAG_POOL, random_.randint(3, 20))
+        asset_["categories"] = random_.sample(TAG_POOL, random_.randint(1, 4))
+    return corpus_
+
+
+def main():
+    count_ = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    corpus_ = BuildCorpus(count_)
+
+    start_ = time.perf_counter()
+    legacy_ = [LegacyClassify(asset_) for asset_ in corpus_]
+    legacyTime = time.perf_counter() - start_
+
+    start_ = time.perf_counter()
+    classes_ = [MSAssetClass.Classify(asset_) for asset_ in corpus_]
+    ruleTime = time.perf_counter() - start_
+
+    for asset_, expected_, actual_ in zip(corpus_, legacy_, classes_):
+        for name_, value_ in expected_.items():
+            if bool(actual_[name_]) != bool(value_):
+                print("MISMATCH on %s: %s expected %s" % (asset_["id"], name_, value_))
+                return 1
+
+    print("assets: %d" % count_)
+    print("list rebuilding : %8.2f us/asset" % (legacyTime * 1e6 / count_))
+    print("predicate list  : %8.2f us/asset" % (ruleTime * 1e6 / count_))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Octane material generation of the previous f-string GetOpaqueMaterial against the
+per-shape fragments that replaced it, on a fixture corpus of surfaces, 3D assets
+and 3D plants.
+
+    f-string     FStringSetup.GetOpaqueMaterial below, the generator as it was
+                 before the fragments: every texture slot, formatted per material
+    full shape   MSOctaneSetup without textureTypes: the compiled template of the
+                 full universal_material, every texture slot
+    asset shape  MSOctaneSetup with the asset's textureTypes: only the blocks of
+                 the textures the asset has
+
+Emitting only the asset's blocks makes the script about 25% smaller; it does
+not make generation faster than rendering the full shape. Prints the time and
+script size per material of each.
+
+Needs MSLiveLinkHelpers next to MSOctaneSetup.py, as in an installed plugin folder.
+
+    python benchmarks/bench_fragments.py [assets] [rounds]
+"""
+import os, sys, time
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _path_ not in sys.path:
+    sys.path.append(_path_)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import MSRuntime
+
+MSRuntime.Install(MSRuntime.HeadlessRuntime())
+
+import MSOctaneSetup
+import bridge_payloads
+
+
+class FStringSetup():
+    """
+    GetOpaqueMaterial as it was before the per-shape fragments, unchanged.
+    """
+    def GetFileChecks(self, verifiedTextures):
+        """
+        MAXScript condition per bitmap variable. Files the importer already found on
+        disk are not checked again with doesFileExist.
+        """
+        return {
+            bitmapName: "true" if textureType in verifiedTextures else f"doesFileExist {bitmapName}.filename"
+            for bitmapName, textureType in MSOctaneSetup.BITMAP_TEXTURE_TYPES.items()
+        }
+
+    def GetOpaqueMaterial(self, nodeName, matName, useDisplacement, assetType, displacement_amount, displacement_lod, has_polished, scan_scale1, scan_scale2, is_scale_fixed, verifiedTextures=frozenset()):
+        """
+        Creates an Octane universal_material for opaque surfaces.
+        Before each texture assignment, the slot’s input type is set to 2.
+        All RGB_image and Grayscale_image nodes share one _2D_transformation and Mesh_UV_projection,
+        and every node comes from the OctaneNodeRegistry of the current import.
+        Scaling is handled directly in the generated MAXScript, with a check for isScaleFixed.
+        """
+        fileChecks = self.GetFileChecks(verifiedTextures)
+        imageNode = MSOctaneSetup.nodeRegistry.ImageNode
+
+        # Create displacement snippet with LoD and amount from computed values
+        displacementSnippet = "--No displacement"
+        if useDisplacement and assetType.lower() not in ["3dplant"]:
+            displacementSnippet = f"""
+            if displacementBitmap != undefined then (
+                if {fileChecks['displacementBitmap']} do (
+                    {nodeName}.displacement = Texture_displacement()
+                    {nodeName}.displacement.texture_input_type = 2
+                    {nodeName}.displacement.amount = {displacement_amount}
+                    {nodeName}.displacement.levelOfDetail = {displacement_lod}
+                    {nodeName}.displacement.black_level = 0.5
+
+                    {nodeName}.displacement.texture_tex = {imageNode('Grayscale_image', 'displacementBitmap', '_OctaneBuildIn_LINEAR_sRGB', 1.0)}
+                )
+            )
+            """
+
+        # Coating snippet for polished surfaces
+        coatingSnippet = ""
+        if has_polished:
+            coatingSnippet = f"""
+            {nodeName}.coating_input_type = 0  -- Value mode
+            {nodeName}.coating_value = 1.0     -- Enable coating
+            {nodeName}.coatingRoughness_input_type = 0  -- Value mode
+            {nodeName}.coatingRoughness_value = 0.01    -- Smooth coating
+            """
+
+        # Embed the scaling logic directly in the MAXScript, with a check for isScaleFixed
+        matScript = f"""
+        {nodeName} = universal_material()
+        {nodeName}.name = "{matName}"
+        -- Set all texture input types to "texture" mode (2)
+        {nodeName}.albedo_input_type = 2
+        {nodeName}.metallic_input_type = 2
+        {nodeName}.roughness_input_type = 2
+        {nodeName}.opacity_input_type = 2
+        {nodeName}.specular_input_type = 2
+        {nodeName}.normal_input_type = 2
+        {nodeName}.transmission_input_type = 2
+
+        -- Shared transform and projection nodes, reused from the node registry
+        -- Check if scale is fixed
+        isScaleFixed = {str(is_scale_fixed).lower()}
+        if isScaleFixed then (
+            transScale1 = 1.0
+            transScale2 = 1.0
+        ) else (
+            -- Base scale from asset metadata (assumed to be in meters)
+            baseScale1 = {scan_scale1}
+            baseScale2 = {scan_scale2}
+            -- Determine the system unit type and set the scale multiplier
+            scaleMultiplier = 1.0  -- Default for meters
+            case units.SystemType of (
+                #meters: scaleMultiplier = 1.0
+                #centimeters: scaleMultiplier = 100.0
+                #millimeters: scaleMultiplier = 1000.0
+                #kilometers: scaleMultiplier = 0.001
+                #inches: scaleMultiplier = 39.3701
+                #feet: scaleMultiplier = 3.28084
+                #miles: scaleMultiplier = 0.000621371
+                default: (
+                    format "Warning: Unknown system unit type %, defaulting to meters (scaleMultiplier = 1.0)\n" units.SystemType
+                    scaleMultiplier = 1.0
+                )
+            )
+            -- Apply the multiplier to the base scales
+            transScale1 = baseScale1 * scaleMultiplier
+            transScale2 = baseScale2 * scaleMultiplier
+        )
+        trans2D = MSOctaneTransformNode transScale1 transScale2
+        meshUV = MSOctaneProjectionNode()
+
+        -- Albedo (set up base texture with shared transform/projection)
+        if albedoBitmap != undefined then (
+            if {fileChecks['albedoBitmap']} do (
+                {nodeName}.albedo_tex = {imageNode('RGB_image', 'albedoBitmap', '_OctaneBuildIn_sRGB', 2.2)}
+            )
+        )
+
+        -- Metallic
+        if metallicBitmap != undefined then (
+            if {fileChecks['metallicBitmap']} do (
+                {nodeName}.metallic_tex = {imageNode('Grayscale_image', 'metallicBitmap', '_OctaneBuildIn_LINEAR_sRGB', 1.0)}
+            )
+        )
+
+        -- Roughness
+        if roughnessBitmap != undefined then (
+            if {fileChecks['roughnessBitmap']} then (
+                {nodeName}.roughness_tex = {imageNode('Grayscale_image', 'roughnessBitmap', '_OctaneBuildIn_LINEAR_sRGB', 1.0)}
+            )
+        )
+        else if glossBitmap != undefined then (
+            if {fileChecks['glossBitmap']} then (
+                {nodeName}.roughness_tex = {imageNode('Grayscale_image', 'glossBitmap', '_OctaneBuildIn_LINEAR_sRGB', 1.0)}
+            )
+        )
+
+        -- Specular
+        if specularBitmap != undefined then (
+            if {fileChecks['specularBitmap']} then (
+                {nodeName}.specular_tex = {imageNode('RGB_image', 'specularBitmap', '_OctaneBuildIn_LINEAR_sRGB', 1.0)}
+            )
+        )
+
+        -- Normal
+        if normalBitmap != undefined then (
+            if {fileChecks['normalBitmap']} do (
+                {nodeName}.normal_tex = {imageNode('RGB_image', 'normalBitmap', '_OctaneBuildIn_LINEAR_sRGB', 1.0)}
+            )
+        )
+
+        -- Displacement (already updated in snippet above)
+        {displacementSnippet}
+
+        -- Coating for polished surfaces
+        {coatingSnippet}
+
+        -- Opacity
+        if opacityBitmap != undefined then (
+            if {fileChecks['opacityBitmap']} do (
+                {nodeName}.opacity_tex = {imageNode('Grayscale_image', 'opacityBitmap', '_OctaneBuildIn_LINEAR_sRGB', 1.0)}
+            )
+        )
+
+        -- Transmission / Translucency
+        if translucencyBitmap != undefined then (
+            if {fileChecks['translucencyBitmap']} then (
+                {nodeName}.transmission_tex = {imageNode('RGB_image', 'translucencyBitmap', '_OctaneBuildIn_sRGB', 2.2)}
+            )
+        )
+        else if transmissionBitmap != undefined then (
+            if {fileChecks['transmissionBitmap']} then (
+                {nodeName}.transmission_tex = {imageNode('Grayscale_image', 'transmissionBitmap', '_OctaneBuildIn_LINEAR_sRGB', 1.0)}
+            )
+        )
+
+        -- Bump, Cavity, Fuzz (these nodes are created but not connected)
+        if bumpBitmap != undefined then (
+            if {fileChecks['bumpBitmap']} then (
+                local BumpNode = {imageNode('Grayscale_image', 'bumpBitmap', '_OctaneBuildIn_LINEAR_sRGB', 1.0)}
+            )
+        )
+        if cavityBitmap != undefined then (
+            if {fileChecks['cavityBitmap']} then (
+                local CavityNode = {imageNode('Grayscale_image', 'cavityBitmap', '_OctaneBuildIn_LINEAR_sRGB', 1.0)}
+            )
+        )
+        if fuzzBitmap != undefined then (
+            if {fileChecks['fuzzBitmap']} then (
+                local FuzzNode = {imageNode('Grayscale_image', 'fuzzBitmap', '_OctaneBuildIn_LINEAR_sRGB', 1.0)}
+            )
+        )
+        """
+        return matScript
+
+
+def FString(setup, asset):
+    return setup.GetOpaqueMaterial(
+        "MatNode", asset["id"], True, asset["type"], 0.02, 12, False, 2.0, 2.0, False, frozenset(),
+    )
+
+
+def FullShape(setup, asset):
+    return Generate(setup, asset, None)
+
+
+def AssetShape(setup, asset):
+    return Generate(setup, asset, [component_["type"] for component_ in asset["components"]])
+
+
+def Generate(setup, asset, textureTypes):
+    return setup.GetOpaqueMaterial(
+        "MatNode", asset["id"], True, asset["type"], 0.02, 12, False, 2.0, 2.0, False,
+        frozenset(), textureTypes,
+    )
+
+
+def Measure(function, setup, assets, rounds):
+    sizes_ = {}
+    start_ = time.perf_counter()
+    for round_ in range(rounds):
+        for asset_ in assets:
+            script_ = function(setup, asset_)
+            if round_ == 0:
+                sizes_.setdefault(asset_["type"], []).append(len(script_))
+    return (time.perf_counter() - start_) / (rounds * len(assets)), sizes_
+
+
+def main():
+    count_ = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    rounds_ = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    assets_ = bridge_payloads.SyntheticPayload(count_)
+
+    results_ = {}
+    for label_, function_, setup_ in (
+        ("f-string", FString, FStringSetup()),
+        ("full shape", FullShape, MSOctaneSetup.OctaneSetup()),
+        ("asset shape", AssetShape, MSOctaneSetup.OctaneSetup()),
+    ):
+        function_(setup_, assets_[0])
+        results_[label_] = Measure(function_, setup_, assets_, rounds_)
+
+    print("%d assets x %d rounds" % (count_, rounds_))
+    for label_, (perAsset_, sizes_) in results_.items():
+        print("%-11s %8.1f us/material" % (label_, perAsset_ * 1e6))
+        for assetType_, values_ in sorted(sizes_.items()):
+            print("            %-8s %6.0f bytes/material" % (assetType_, sum(values_) / len(values_)))
+    print("shapes compiled: %s" % (MSOctaneSetup.CompileOpaqueMaterial.cache_info(),))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Import throughput, stage by stage, for recorded or synthetic Bridge payloads.
+
+Every payload is sent over loopback and received the way QLiveLinkMonitor.run
+does it (MSLiveLinkStream.IterPayloadChunks feeding a JSONArrayStream), then
+imported as one bulk export through LiveLinkImporter.set_Asset_Data on an
+MSRuntime.HeadlessRuntime. The importer's functions are wrapped with timers, and
+each stage is charged its own time only (a stage called from another one is
+not counted twice):
+
+    receive     reading the socket                              per payload
+    decode      JSON decoding of the stream                     per payload
+    parse       LiveLinkImporter.parseJSON                      per asset
+    classify    MSAssetClass.Classify                           per asset
+    generate    initAssetImport and the renderer's GetMaterialSetup
+    substitute  MSTemplate rendering and CommentLines           per asset
+    write       wrapping and executing the scripts              per flush
+
+Reports p50 / p95 / max per stage and assets per second, and with --json writes
+the same numbers, plus the git commit, for comparing runs across commits.
+
+MSScriptCache is off, so every round generates its scripts. With --script-cache
+it is on, in an empty temporary folder: the warm-up round fills it and the timed
+rounds are repeat imports; its hits and misses are reported.
+
+Needs the Quixel plugin modules (MSLiveLinkHelpers and the renderer setups) next
+to MS_Importer.py, as in an installed plugin folder.
+
+    python benchmarks/bench_import.py [--payloads DIR] [--assets 100] [--rounds 5]
+                                      [--renderer Octane_Renderer:Octane_Renderer]
+                                      [--script-cache] [--json results.json]
+"""
+import argparse, json, os, platform, socket, subprocess, sys, tempfile, threading, time
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _path_ not in sys.path:
+    sys.path.append(_path_)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import bridge_payloads
+import MSRuntime
+
+LIBRARY_ROOT = "D:/Megascans"
+STAGES = ["receive", "decode", "parse", "classify", "generate", "substitute", "write"]
+
+runtime_ = MSRuntime.Install(MSRuntime.HeadlessRuntime(libraryRoot=LIBRARY_ROOT))
+
+import MSAssetClass, MSLiveLinkStream, MSScriptCache, MSTemplate, MS_Importer
+
+
+class StageTimer():
+    """
+    Charges the time spent in wrapped functions to stages. Nested calls are
+    subtracted from their caller, so every second is counted once. Times are
+    summed per unit (an asset, a flush) and kept as one sample when Close is called.
+    """
+    def __init__(self):
+        self.samples = {stage_: [] for stage_ in STAGES}
+        self.current = {}
+        self.stack = []
+
+    def Enter(self, stage):
+        self.stack.append([stage, time.perf_counter(), 0.0])
+
+    def Exit(self):
+        stage_, start_, children_ = self.stack.pop()
+        elapsed_ = time.perf_counter() - start_
+        self.current[stage_] = self.current.get(stage_, 0.0) + elapsed_ - children_
+        if self.stack:
+            self.stack[-1][2] += elapsed_
+
+    def Close(self):
+        for stage_, seconds_ in self.current.items():
+            self.samples[stage_].append(seconds_)
+        self.current = {}
+
+    def Wrap(self, function, stage):
+        def timed_(*args, **kwargs):
+            self.Enter(stage)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.Exit()
+        timed_.__wrapped__ = function
+        return timed_
+
+
+class TimedSetups():
+    """
+    Stands in for MS_Importer.MATERIAL_SETUPS, timing the setup it hands out.
+    """
+    def __init__(self, setups, timer):
+        self.setups = setups
+        self.timer = timer
+
+    def __getitem__(self, rendererType):
+        return self.timer.Wrap(self.setups[rendererType], "generate")
+
+    def __contains__(self, rendererType):
+        return rendererType in self.setups
+
+    def Identity(self, rendererType):
+        return self.setups.Identity(rendererType)
+
+
+def Instrument(timer):
+    """
+    Wraps the importer's stages with timer. Returns a function that undoes it.
+    """
+    patches_ = [
+        (MS_Importer.LiveLinkImporter, "parseJSON", "parse"),
+        (MS_Importer.LiveLinkImporter, "initAssetImport", "generate"),
+        (MS_Importer.LiveLinkImporter, "WrapScript", "write"),
+        (MS_Importer.LiveLinkImporter, "WrapBatchScript", "write"),
+        (MS_Importer.LiveLinkImporter, "ExecuteScript", "write"),
+        (MSAssetClass, "Classify", "classify"),
+        (MSTemplate.CompiledTemplate, "Render", "substitute"),
+        (MSTemplate, "RenderTemplate", "substitute"),
+        (MSTemplate, "CommentLines", "substitute"),
+    ]
+    originals_ = []
+    for owner_, name_, stage_ in patches_:
+        original_ = owner_.__dict__[name_]
+        originals_.append((owner_, name_, original_))
+        setattr(owner_, name_, timer.Wrap(original_, stage_))
+    setups_ = MS_Importer.MATERIAL_SETUPS
+    MS_Importer.MATERIAL_SETUPS = TimedSetups(setups_, timer)
+
+    def Restore():
+        for owner_, name_, original_ in originals_:
+            setattr(owner_, name_, original_)
+        MS_Importer.MATERIAL_SETUPS = setups_
+    return Restore
+
+
+def FakeBridge(port, payload):
+    sender_ = socket.create_connection(("127.0.0.1", port))
+    sender_.sendall(payload)
+    sender_.close()
+
+
+def Receive(payload, timer):
+    """
+    Receives payload like QLiveLinkMonitor.run and returns its assets.
+    """
+    listener_ = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener_.bind(("127.0.0.1", 0))
+    listener_.listen(1)
+    sender_ = threading.Thread(target=FakeBridge, args=(listener_.getsockname()[1], payload))
+    sender_.start()
+    client_, address_ = listener_.accept()
+    assets_ = []
+    stream_ = MSLiveLinkStream.JSONArrayStream()
+    chunks_ = MSLiveLinkStream.IterPayloadChunks(client_)
+    try:
+        while True:
+            timer.Enter("receive")
+            try:
+                data_ = next(chunks_, None)
+            finally:
+                timer.Exit()
+            if data_ is None:
+                break
+            timer.Enter("decode")
+            try:
+                assets_.extend(stream_.Feed(data_))
+            finally:
+                timer.Exit()
+        timer.Enter("decode")
+        try:
+            assets_.extend(stream_.Close())
+        finally:
+            timer.Exit()
+    finally:
+        client_.close()
+        sender_.join()
+        listener_.close()
+    timer.Close()
+    return assets_
+
+
+def Import(importer, assets, timer):
+    importer.BeginBatch()
+    for asset_ in assets:
+        importer.set_Asset_Data(asset_)
+        timer.Close()
+    importer.EndBatch()
+    timer.Close()
+
+
+def Percentile(values, fraction):
+    ordered_ = sorted(values)
+    return ordered_[min(len(ordered_) - 1, int(round(fraction * (len(ordered_) - 1))))]
+
+
+def Summarize(samples):
+    summary_ = {}
+    for stage_ in STAGES:
+        values_ = samples[stage_]
+        if not values_:
+            continue
+        summary_[stage_] = {
+            "n": len(values_),
+            "p50_ms": Percentile(values_, 0.50) * 1000.0,
+            "p95_ms": Percentile(values_, 0.95) * 1000.0,
+            "max_ms": max(values_) * 1000.0,
+            "total_ms": sum(values_) * 1000.0,
+        }
+    return summary_
+
+
+def GitCommit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=_path_, stderr=subprocess.DEVNULL
+        ).decode("ascii").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser_ = argparse.ArgumentParser(description="Import throughput per stage.")
+    parser_.add_argument("--payloads", help="directory of recorded Bridge *.json payloads")
+    parser_.add_argument("--assets", type=int, default=100, help="assets of the synthetic payload")
+    parser_.add_argument("--rounds", type=int, default=5, help="times every payload is imported")
+    parser_.add_argument("--renderer", default=MSRuntime.OCTANE_RENDERER, help='"renderers.current" to report')
+    parser_.add_argument("--script-cache", action="store_true", help="time repeat imports from MSScriptCache")
+    parser_.add_argument("--json", help="write the results to this file")
+    args_ = parser_.parse_args()
+
+    runtime_.Renderer = args_.renderer
+    fixtures_ = None
+    if args_.payloads:
+        payloads_ = bridge_payloads.LoadPayloads(args_.payloads)
+    else:
+        synthetic_ = bridge_payloads.SyntheticPayload(args_.assets, root=LIBRARY_ROOT)
+        payloads_ = [("synthetic", bridge_payloads.Encode(synthetic_))]
+        fixtures_ = tempfile.TemporaryDirectory()
+        bridge_payloads.WriteFixtures(synthetic_, fixtures_.name, root=LIBRARY_ROOT)
+        runtime_.FixtureDir = fixtures_.name
+
+    cacheDir = tempfile.TemporaryDirectory()
+    restoreCache = bridge_payloads.OverrideScriptCache(args_.script_cache, cacheDir.name)
+    importer_ = MS_Importer.LiveLinkImporter()
+    # Warm-up: compile the templates and classification rules before timing
+    Import(importer_, Receive(payloads_[0][1], StageTimer()), StageTimer())
+
+    MSScriptCache.cache.Wait()
+    cacheBefore = MSScriptCache.cache.GetStats()
+
+    timer_ = StageTimer()
+    restore_ = Instrument(timer_)
+    assetCount = 0
+    start_ = time.perf_counter()
+    try:
+        for round_ in range(args_.rounds):
+            for name_, payload_ in payloads_:
+                runtime_.Reset()
+                assets_ = Receive(payload_, timer_)
+                Import(importer_, assets_, timer_)
+                assetCount += len(assets_)
+    finally:
+        restore_()
+    seconds_ = time.perf_counter() - start_
+    MSScriptCache.cache.Wait()
+    cacheAfter = MSScriptCache.cache.GetStats()
+    restoreCache()
+    cacheDir.cleanup()
+    if fixtures_ is not None:
+        fixtures_.cleanup()
+
+    results_ = {
+        "commit": GitCommit(),
+        "python": platform.python_version(),
+        "renderer": args_.renderer,
+        "payloads": [name_ for name_, payload_ in payloads_],
+        "rounds": args_.rounds,
+        "assets": assetCount,
+        "seconds": seconds_,
+        "assets_per_second": assetCount / seconds_ if seconds_ else 0.0,
+        "stages": Summarize(timer_.samples),
+        "script_cache": {
+            "enabled": args_.script_cache,
+            "hits": cacheAfter["hits"] - cacheBefore["hits"],
+            "misses": cacheAfter["misses"] - cacheBefore["misses"],
+        },
+    }
+
+    print("%d assets in %.3f s, %.1f assets/s (%s)"
+          % (assetCount, seconds_, results_["assets_per_second"], args_.renderer.split(":")[0]))
+    if args_.script_cache:
+        print("script cache: %(hits)d hits, %(misses)d misses" % results_["script_cache"])
+    print("%-11s %6s %10s %10s %10s %10s" % ("stage", "n", "p50 ms", "p95 ms", "max ms", "total ms"))
+    for stage_, stats_ in results_["stages"].items():
+        print("%-11s %6d %10.3f %10.3f %10.3f %10.1f"
+              % (stage_, stats_["n"], stats_["p50_ms"], stats_["p95_ms"], stats_["max_ms"], stats_["total_ms"]))
+    if args_.json:
+        with open(args_.json, "w") as fl_:
+            json.dump(results_, fl_, indent=2)
+
+
+if __name__ == "__main__":
+    main()
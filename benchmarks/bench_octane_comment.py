@@ -0,0 +1,74 @@
+"""
+Regression benchmark for commenting out unresolved Octane bitmap slots.
+
+Uses a synthetic 16-slot Octane asset with every texture missing, so every
+Bitmaptexture line still carries its TEX_ placeholder, and compares the old
+per-line whole-script replace loop with MSTemplate.CommentLines.
+
+    python benchmarks/bench_octane_comment.py [repeats]
+"""
+import os, sys, time
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _path_ not in sys.path:
+    sys.path.append(_path_)
+
+import MSTemplate
+
+SLOTS = [("albedo", "ALBEDO"), ("diffuse", "ALBEDO"), ("roughness", "ROUGHNESS"), ("opacity", "OPACITY"),
+         ("normal", "NORMAL"), ("metallic", "METALNESS"), ("translucency", "TRANSLUCENCY"),
+         ("transmission", "TRANSMISSION"), ("displacement", "DISPLACEMENT"), ("specular", "SPECULAR"),
+         ("gloss", "GLOSS"), ("Fuzz", "FUZZ"), ("ao", "AO"), ("cavity", "CAVITY"), ("bump", "BUMP"),
+         ("normalbump", "NORMALBUMP")]
+
+
+def BuildScript():
+    declarations_ = "".join("            %sBitmap = undefined\n" % name for name, _ in SLOTS)
+    bitmaps_ = "".join(
+        '            %sBitmap = Bitmaptexture fileName: "TEX_%s" gamma: "CS_%s"\n' % (name, slot, slot)
+        for name, slot in SLOTS
+    )
+    material_ = "".join(
+        "        MatNode.slot_%d_tex = RGB_image()\n        MatNode.slot_%d_tex.gamma = 1.0\n" % (line, line)
+        for line in range(250)
+    )
+    return declarations_ + bitmaps_ + material_
+
+
+def LegacyComment(render_setup):
+    for script_line in render_setup.splitlines():
+        if "TEX_" in script_line:
+            updated_line = "--" + script_line
+            render_setup = render_setup.replace(script_line, updated_line)
+    return render_setup
+
+
+def main():
+    repeats_ = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    script_ = BuildScript()
+
+    start_ = time.perf_counter()
+    for _ in range(repeats_):
+        legacy_ = LegacyComment(script_)
+    legacyTime = time.perf_counter() - start_
+
+    start_ = time.perf_counter()
+    for _ in range(repeats_):
+        commented_ = MSTemplate.CommentLines(script_, "TEX_")
+    commentTime = time.perf_counter() - start_
+
+    if legacy_ != commented_:
+        print("MISMATCH: commented script differs from the legacy loop")
+        return 1
+    if commented_.count("--") != len(SLOTS):
+        print("MISMATCH: expected %d commented slots, got %d" % (len(SLOTS), commented_.count("--")))
+        return 1
+
+    print("script size: %d bytes, missing slots: %d" % (len(script_), len(SLOTS)))
+    print("per-line replace loop : %8.3f ms/asset" % (legacyTime * 1000.0 / repeats_))
+    print("single-pass comment   : %8.3f ms/asset" % (commentTime * 1000.0 / repeats_))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Scaling of MSParallelImport: script generation for a synthetic bulk export on 1,
+2, 4 and 8 worker processes. The pool is started and warmed up before it is
+timed, and every run must produce the same scripts, in the same order, as the
+in-process run. MSScriptCache is off, so every run generates its scripts.
+
+Needs the Quixel plugin modules (MSLiveLinkHelpers and the renderer setups) next
+to MS_Importer.py, as in an installed plugin folder.
+
+    python benchmarks/bench_parallel.py [assets] [workers ...]
+"""
+import os, sys, time
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _path_ not in sys.path:
+    sys.path.append(_path_)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import MSParallelImport
+import bridge_payloads
+
+
+def CreateImporter():
+    MSParallelImport.EnsureRuntime()
+    import MS_Importer
+    importer_ = MS_Importer.LiveLinkImporter()
+    importer_.Renderer = MS_Importer.RendererType.OCTANE
+    importer_.MaxVersion = 2024
+    # Sent to the workers, which configure their MSScriptCache from it
+    importer_.Settings = dict(importer_.Settings, Script_Cache_Enabled=False)
+    importer_.BatchChunkSize = 0
+    importer_.Batch = []
+    return importer_
+
+
+def Generate(importer, payload, workers):
+    start_ = time.perf_counter()
+    scripts_ = []
+    for prepared_, error_ in MSParallelImport.GenerateScripts(importer, payload, workers):
+        if error_ is not None:
+            raise RuntimeError(error_)
+        scripts_.append((prepared_.ID, prepared_.script))
+    return time.perf_counter() - start_, scripts_
+
+
+def main():
+    count_ = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    workerCounts = [int(value_) for value_ in sys.argv[2:]] or [1, 2, 4, 8]
+    payload_ = bridge_payloads.SyntheticPayload(count_)
+    try:
+        importer_ = CreateImporter()
+        Generate(importer_, payload_[:20], 1)
+        serial_, expected_ = Generate(importer_, payload_, 1)
+        print("%d assets, %d CPUs" % (count_, os.cpu_count() or 0))
+        print("workers  seconds  assets/s  speedup")
+        for workers_ in workerCounts:
+            if workers_ > 1:
+                Generate(importer_, payload_[:workers_ * 8], workers_)
+                seconds_, scripts_ = Generate(importer_, payload_, workers_)
+                if scripts_ != expected_:
+                    raise SystemExit("%d workers: scripts differ from the in-process run" % workers_)
+            else:
+                seconds_ = serial_
+            print("%7d  %7.3f  %8.0f  %6.2fx" % (workers_, seconds_, count_ / seconds_, serial_ / seconds_))
+    finally:
+        MSParallelImport.Shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Loopback benchmark for the QLiveLinkMonitor receive path.
+
+A fake Bridge client sends payloads from 1 KB to 50 MB to a local listener, both
+as a plain EOF-terminated stream and length-framed. Reports receive throughput
+and accept-to-emit latency for MSLiveLinkStream.ReceivePayload, and for the old
+8 KB recv / bytes += / sleep loop on the sizes where it finishes in reasonable time.
+
+    python benchmarks/bench_receive.py
+"""
+import os, sys, socket, threading, time
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _path_ not in sys.path:
+    sys.path.append(_path_)
+
+import MSLiveLinkStream
+
+SIZES = [1024, 64 * 1024, 1024 * 1024, 10 * 1024 * 1024, 50 * 1024 * 1024]
+LEGACY_MAX_SIZE = 10 * 1024 * 1024
+
+
+def LegacyReceive(client):
+    TotalData = b""
+    data = client.recv(4096*2)
+    if data:
+        TotalData += data
+        while True:
+            data = client.recv(4096*2)
+            if data:
+                TotalData += data
+            else:
+                break
+        time.sleep(0.05)
+    return TotalData
+
+
+def FakeBridge(port, payload, framed):
+    sender_ = socket.create_connection(("127.0.0.1", port))
+    sender_.sendall(MSLiveLinkStream.FramePayload(payload) if framed else payload)
+    if framed:
+        # A framed sender keeps the socket open until the listener is done.
+        sender_.recv(1)
+    sender_.close()
+
+
+def Measure(receive, payload, framed):
+    listener_ = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener_.bind(("127.0.0.1", 0))
+    listener_.listen(1)
+    port_ = listener_.getsockname()[1]
+
+    start_ = time.perf_counter()
+    sender_ = threading.Thread(target=FakeBridge, args=(port_, payload, framed))
+    sender_.start()
+    client_, address_ = listener_.accept()
+    accepted_ = time.perf_counter()
+    data_ = receive(client_)
+    emitted_ = time.perf_counter()
+    client_.close()
+    sender_.join()
+    listener_.close()
+
+    if len(data_) != len(payload):
+        raise RuntimeError("received %d of %d bytes" % (len(data_), len(payload)))
+    return emitted_ - start_, emitted_ - accepted_
+
+
+def Report(label, size, total, latency):
+    throughput_ = size / total / (1024.0 * 1024.0)
+    print("%-16s %10d B  %9.1f MB/s  accept-to-emit %9.2f ms" % (label, size, throughput_, latency * 1000.0))
+
+
+def main():
+    for size_ in SIZES:
+        payload_ = (b'[{"id": "abc", "pad": "' + b"x" * size_)[:size_ - 3] + b'"}]'
+        total_, latency_ = Measure(MSLiveLinkStream.ReceivePayload, payload_, False)
+        Report("stream/eof", size_, total_, latency_)
+        total_, latency_ = Measure(MSLiveLinkStream.ReceivePayload, payload_, True)
+        Report("stream/framed", size_, total_, latency_)
+        if size_ <= LEGACY_MAX_SIZE:
+            total_, latency_ = Measure(LegacyReceive, payload_, False)
+            Report("legacy", size_, total_, latency_)
+
+
+if __name__ == "__main__":
+    main()
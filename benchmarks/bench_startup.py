@@ -0,0 +1,74 @@
+"""
+Cost of loading MS_Importer at 3ds Max startup, with the renderer setups loaded
+lazily (now) and all of them loaded up front (as the importer used to).
+
+The result is null: the three modes are within noise of each other (28.8 ms lazy,
+34.1 ms eager, 36.6 ms first octane in one median-of-9 run, and eager the fastest
+in another). MSOctaneSetup, the only setup in this repository, is about 1 ms of the
+roughly 28 ms MS_Importer import, so lazy loading is kept for SetupRegistry and
+Register(), not for startup time.
+
+Every run is a fresh interpreter on an MSRuntime.HeadlessRuntime. "lazy" imports
+MS_Importer only; "eager" also instantiates every setup in MSRenderer.SETUP_PLUGINS;
+"first octane" is lazy plus the Octane setup its first import loads. Reported are
+the median wall time and the cumulative "-X importtime" of MS_Importer, and which
+setup modules ended up loaded.
+
+Needs the Quixel plugin modules (MSLiveLinkHelpers and the renderer setups) next
+to MS_Importer.py, as in an installed plugin folder.
+
+    python benchmarks/bench_startup.py [runs]
+"""
+import os, re, statistics, subprocess, sys
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOTSTRAP = """
+import sys, time
+sys.path[:0] = %r
+import MSRuntime
+MSRuntime.Install(MSRuntime.HeadlessRuntime())
+start_ = time.perf_counter()
+import MS_Importer, MSRenderer
+%s
+seconds_ = time.perf_counter() - start_
+loaded_ = sorted(name_ for name_, cls_, method_ in MSRenderer.SETUP_PLUGINS.values() if name_ in sys.modules)
+print("RESULT", seconds_, ",".join(loaded_))
+"""
+
+MODES = [
+    ("lazy", ""),
+    ("first octane", "MS_Importer.MATERIAL_SETUPS.GetSetup(MSRenderer.RendererType.OCTANE)"),
+    ("eager", "for renderer_ in MSRenderer.SETUP_PLUGINS: MS_Importer.MATERIAL_SETUPS.GetSetup(renderer_)"),
+]
+
+IMPORT_TIME = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\S.*)$")
+
+
+def Run(setup):
+    paths_ = [path_ for path_ in os.environ.get("PYTHONPATH", "").split(os.pathsep) if path_] + [_path_]
+    process_ = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOTSTRAP % (paths_, setup)],
+        capture_output=True, text=True, check=True,
+    )
+    cumulative_ = 0
+    for line_ in process_.stderr.splitlines():
+        match_ = IMPORT_TIME.match(line_)
+        if match_ and match_.group(3).strip() == "MS_Importer":
+            cumulative_ = int(match_.group(2))
+    result_ = [line_ for line_ in process_.stdout.splitlines() if line_.startswith("RESULT")][-1].split(" ", 2)
+    return float(result_[1]), cumulative_ / 1e6, result_[2] if len(result_) > 2 else ""
+
+
+def main():
+    runs_ = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    print("%-13s %10s %14s  %s" % ("mode", "wall ms", "importtime ms", "setup modules loaded"))
+    for label_, setup_ in MODES:
+        results_ = [Run(setup_) for run_ in range(runs_)]
+        wall_ = statistics.median(result_[0] for result_ in results_)
+        importTime = statistics.median(result_[1] for result_ in results_)
+        print("%-13s %10.2f %14.2f  %s" % (label_, wall_ * 1000.0, importTime * 1000.0, results_[-1][2] or "-"))
+
+
+if __name__ == "__main__":
+    main()
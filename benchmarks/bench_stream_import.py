@@ -0,0 +1,89 @@
+"""
+Time to first import and peak memory for a bulk export, comparing the buffered
+path (receive everything, json.loads, then import) with MSLiveLinkStream's
+incremental parser that hands out each asset as soon as it is complete.
+
+A fake Bridge sender writes the payload over loopback in 64 KB pieces with a small
+delay between them, like a slow network share feeding Bridge.
+
+    python benchmarks/bench_stream_import.py [assets] [delay_ms]
+"""
+import os, sys, json, socket, threading, time, tracemalloc
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _path_ not in sys.path:
+    sys.path.append(_path_)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import MSLiveLinkStream
+import bridge_payloads
+
+
+def FakeBridge(port, payload, delay):
+    sender_ = socket.create_connection(("127.0.0.1", port))
+    for offset_ in range(0, len(payload), 64 * 1024):
+        sender_.sendall(payload[offset_:offset_ + 64 * 1024])
+        time.sleep(delay)
+    sender_.close()
+
+
+def ImportStub(asset):
+    # Stands in for script generation: touch the fields the importer reads.
+    return len(asset["components"]) + len(asset["meta"])
+
+
+def Buffered(client):
+    imported_ = []
+    for asset_ in json.loads(MSLiveLinkStream.ReceivePayload(client)):
+        ImportStub(asset_)
+        imported_.append(time.perf_counter())
+    return imported_
+
+
+def Streaming(client):
+    imported_ = []
+    stream_ = MSLiveLinkStream.JSONArrayStream()
+    for data_ in MSLiveLinkStream.IterPayloadChunks(client):
+        for asset_ in stream_.Feed(data_):
+            ImportStub(asset_)
+            imported_.append(time.perf_counter())
+    for asset_ in stream_.Close():
+        ImportStub(asset_)
+        imported_.append(time.perf_counter())
+    return imported_
+
+
+def Measure(receive, payload, delay):
+    listener_ = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener_.bind(("127.0.0.1", 0))
+    listener_.listen(1)
+    sender_ = threading.Thread(target=FakeBridge, args=(listener_.getsockname()[1], payload, delay))
+
+    tracemalloc.start()
+    start_ = time.perf_counter()
+    sender_.start()
+    client_, address_ = listener_.accept()
+    imported_ = receive(client_)
+    peak_ = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    client_.close()
+    sender_.join()
+    listener_.close()
+    return imported_[0] - start_, imported_[-1] - start_, peak_, len(imported_)
+
+
+def main():
+    assets_ = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    delay_ = (float(sys.argv[2]) if len(sys.argv) > 2 else 2.0) / 1000.0
+    payload_ = bridge_payloads.Encode(bridge_payloads.SyntheticPayload(assets_))
+    print("assets: %d, payload: %.1f KB" % (assets_, len(payload_) / 1024.0))
+
+    for label_, receive_ in (("buffered", Buffered), ("streaming", Streaming)):
+        first_, last_, peak_, count_ = Measure(receive_, payload_, delay_)
+        print("%-10s first import %8.2f ms  last import %8.2f ms  peak %8.1f KB  (%d assets)"
+              % (label_, first_ * 1000.0, last_ * 1000.0, peak_ / 1024.0, count_))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Compares MSTemplate rendering against the str.replace cascade the importer used
+to run over the whole generated MAXScript, on the sections the importer really
+renders.
+
+A synthetic Bridge export is imported once on an MSRuntime.HeadlessRuntime (the
+script cache off) while every MSTemplate render call is recorded: the template
+or generated text, and the placeholder context of the asset. The recorded calls
+are then replayed three ways:
+
+    replace cascade   str.replace per placeholder, in GetPlaceholders order, over
+                      the joined sections of the asset (the original importer)
+    per-call compile  the previous MSTemplate, compiling every section keyed on
+                      (text, context placeholders)
+    MSTemplate        the templates compiled at module load, one pattern.sub pass
+                      over the generated material text
+
+Needs the Quixel plugin modules (MSLiveLinkHelpers and the renderer setups) next
+to MS_Importer.py, as in an installed plugin folder.
+
+    python benchmarks/bench_template.py [assets] [rounds] [renderer]
+
+Fails if any path renders a different script.
+"""
+import contextlib, io, os, sys, tempfile, time
+from functools import lru_cache
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _path_ not in sys.path:
+    sys.path.append(_path_)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import bridge_payloads
+import MSRuntime
+
+LIBRARY_ROOT = "D:/Megascans"
+
+runtime_ = MSRuntime.Install(MSRuntime.HeadlessRuntime(libraryRoot=LIBRARY_ROOT))
+
+import MSTemplate, MS_Importer
+
+
+def RecordSections(payload):
+    """
+    Imports payload and returns, per render call with the importer's placeholders,
+    (template or text, context, rendered). Contexts are the importer's own
+    dictionaries, so the sections of one asset share the same one; the scatter
+    section has its own.
+    """
+    calls_ = []
+    render_ = MSTemplate.CompiledTemplate.Render
+    renderTemplate = MSTemplate.RenderTemplate
+
+    def Render(template, context):
+        rendered_ = render_(template, context)
+        if template.placeholders is MS_Importer.PLACEHOLDERS:
+            calls_.append((template, context, rendered_))
+        return rendered_
+
+    def RenderText(text, context, placeholders):
+        rendered_ = renderTemplate(text, context, placeholders)
+        if placeholders is MS_Importer.PLACEHOLDERS and context:
+            calls_.append((text, context, rendered_))
+        return rendered_
+
+    MSTemplate.CompiledTemplate.Render = Render
+    MSTemplate.RenderTemplate = RenderText
+    restoreCache = bridge_payloads.OverrideScriptCache(False)
+    try:
+        importer_ = MS_Importer.LiveLinkImporter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for asset_ in payload:
+                importer_.set_Asset_Data(asset_)
+    finally:
+        MSTemplate.CompiledTemplate.Render = render_
+        MSTemplate.RenderTemplate = renderTemplate
+        restoreCache()
+    return calls_
+
+
+def Text(source):
+    return "".join(source.segments) if isinstance(source, MSTemplate.CompiledTemplate) else source
+
+
+def Group(calls):
+    """
+    Joins consecutive calls that share a context, i.e. the sections of one asset
+    the cascade ran over as a single script.
+    """
+    groups_ = []
+    for source_, context_, rendered_ in calls:
+        if groups_ and groups_[-1][1] is context_:
+            groups_[-1][0].append(Text(source_))
+            groups_[-1][2].append(rendered_)
+        else:
+            groups_.append(([Text(source_)], context_, [rendered_]))
+    return [("".join(texts_), context_, "".join(rendered_)) for texts_, context_, rendered_ in groups_]
+
+
+def LegacyCascade(script, context):
+    for placeholder_, value_ in context.items():
+        script = script.replace(placeholder_, value_)
+    return script
+
+
+class PerCallTemplate():
+    """
+    The previous MSTemplate: segments found with str.find for the placeholders of
+    the context, compiled per (text, placeholders) and kept in an LRU cache.
+    """
+    def __init__(self, text, tokens):
+        matches_ = []
+        for token in tokens:
+            position_ = text.find(token)
+            while position_ != -1:
+                matches_.append((position_, -len(token), token))
+                position_ = text.find(token, position_ + len(token))
+        matches_.sort()
+        self.segments = []
+        cursor_ = 0
+        for position_, length_, token in matches_:
+            if position_ < cursor_:
+                continue
+            self.segments.append(text[cursor_:position_])
+            self.segments.append(token)
+            cursor_ = position_ - length_
+        self.segments.append(text[cursor_:])
+
+    def Render(self, context):
+        parts_ = self.segments[:]
+        for index_ in range(1, len(parts_), 2):
+            parts_[index_] = context[parts_[index_]]
+        return "".join(parts_)
+
+
+@lru_cache(maxsize=128)
+def CompilePerCall(text, tokens):
+    return PerCallTemplate(text, tokens)
+
+
+def PerCallRender(source, context):
+    return CompilePerCall(Text(source), tuple(context)).Render(context)
+
+
+def CurrentRender(source, context):
+    if isinstance(source, MSTemplate.CompiledTemplate):
+        return source.Render(context)
+    return MSTemplate.RenderTemplate(source, context, MS_Importer.PLACEHOLDERS)
+
+
+def Time(function, rounds):
+    function()
+    start_ = time.perf_counter()
+    for round_ in range(rounds):
+        function()
+    return (time.perf_counter() - start_) / rounds
+
+
+def main():
+    count_ = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rounds_ = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    if len(sys.argv) > 3:
+        runtime_.Renderer = sys.argv[3]
+    payload_ = bridge_payloads.SyntheticPayload(count_, root=LIBRARY_ROOT)
+
+    with tempfile.TemporaryDirectory() as fixtures_:
+        bridge_payloads.WriteFixtures(payload_, fixtures_, root=LIBRARY_ROOT)
+        runtime_.FixtureDir = fixtures_
+        calls_ = RecordSections(payload_)
+    groups_ = Group(calls_)
+
+    expected_ = [rendered_ for text_, context_, rendered_ in groups_]
+    if [LegacyCascade(text_, context_) for text_, context_, rendered_ in groups_] != expected_:
+        print("MISMATCH: MSTemplate differs from the replace cascade")
+        return 1
+    if [PerCallRender(source_, context_) for source_, context_, rendered_ in calls_] != [rendered_ for source_, context_, rendered_ in calls_]:
+        print("MISMATCH: MSTemplate differs from the per-call compile")
+        return 1
+
+    timings_ = [
+        ("replace cascade", Time(lambda: [LegacyCascade(text_, context_) for text_, context_, rendered_ in groups_], rounds_)),
+        ("per-call compile", Time(lambda: [PerCallRender(source_, context_) for source_, context_, rendered_ in calls_], rounds_)),
+        ("MSTemplate", Time(lambda: [CurrentRender(source_, context_) for source_, context_, rendered_ in calls_], rounds_)),
+    ]
+
+    print("renderer: %s, assets: %d, render calls: %d, script: %.0f bytes/asset" % (
+        runtime_.Renderer, count_, len(calls_), sum(len(text_) for text_, context_, rendered_ in groups_) / count_))
+    for label_, seconds_ in timings_:
+        print("%-17s %8.3f ms/asset" % (label_, seconds_ * 1000.0 / count_))
+    print("per-call compile cache: %s" % (CompilePerCall.cache_info(),))
+    print("output byte-identical: yes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
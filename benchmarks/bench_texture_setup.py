@@ -0,0 +1,84 @@
+"""
+Counts the bitmap loads the generated TextureSetup asks 3ds Max for, before and
+after it was driven by the asset's TexturesList.
+
+An MSRuntime.HeadlessRuntime records every executed script; the openBitmap /
+Bitmaptexture constructors in them that are not commented out are the file opens
+3ds Max would attempt. Before, all 16 slots were emitted for every asset: Octane
+commented out the unresolved ones, the other renderers tried to open them.
+MSScriptCache is off, so both generators build every script.
+
+Needs the Quixel plugin modules (MSLiveLinkHelpers and the renderer setups) next
+to MS_Importer.py, as in an installed plugin folder.
+
+    python benchmarks/bench_texture_setup.py [assets]
+"""
+import os, re, sys, time
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _path_ not in sys.path:
+    sys.path.append(_path_)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import bridge_payloads
+import MSRuntime
+
+BITMAP_LOAD = re.compile(r"^[ \t]*\w+Bitmap = (?:openBitmap|Bitmaptexture fileName:)", re.MULTILINE)
+
+runtime_ = MSRuntime.Install(MSRuntime.HeadlessRuntime())
+
+import MSTemplate, MS_Importer
+
+
+def LegacyTextureSetup(importer):
+    """
+    The fixed 16-slot TextureSetup the importer emitted for every asset.
+    """
+    if importer.Renderer == MS_Importer.RendererType.OCTANE:
+        text_ = "".join(
+            ["\n            %s = undefined" % bitmapName for bitmapName, slot_ in MS_Importer.BITMAP_SLOTS]
+            + ['\n            %s = Bitmaptexture fileName: "TEX_%s" gamma: "CS_%s"' % (bitmapName, slot_, slot_)
+               for bitmapName, slot_ in MS_Importer.BITMAP_SLOTS]
+        ) + "\n"
+    else:
+        text_ = "".join(
+            '\n            %s = openBitmap "TEX_%s" gamma: "CS_%s"' % (bitmapName, slot_, slot_)
+            for bitmapName, slot_ in MS_Importer.BITMAP_SLOTS
+        ) + "\n"
+    return MSTemplate.CompiledTemplate(text_, MS_Importer.PLACEHOLDERS)
+
+
+def Run(importer, payload, textureSetup):
+    MS_Importer.LiveLinkImporter.TextureSetup = textureSetup
+    runtime_.Reset()
+    MS_Importer.rendererProbe.Invalidate()
+    start_ = time.perf_counter()
+    importer.BeginBatch(0)
+    for asset_ in payload:
+        importer.set_Asset_Data(asset_)
+    importer.EndBatch()
+    seconds_ = time.perf_counter() - start_
+    return seconds_, sum(len(BITMAP_LOAD.findall(script_)) for script_ in runtime_.Executed)
+
+
+def main():
+    count_ = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    payload_ = bridge_payloads.SyntheticPayload(count_)
+    importer_ = MS_Importer.LiveLinkImporter()
+    current_ = MS_Importer.LiveLinkImporter.TextureSetup
+    components_ = sum(len(asset_["components"]) for asset_ in payload_)
+    print("%d assets, %d texture components" % (count_, components_))
+    restoreCache = bridge_payloads.OverrideScriptCache(False)
+    try:
+        for renderer_ in ("Octane_Renderer:Octane_Renderer", "CoronaRenderer:CoronaRenderer"):
+            runtime_.Renderer = renderer_
+            for label_, setup_ in (("before", LegacyTextureSetup), ("after", current_)):
+                seconds_, loads_ = Run(importer_, payload_, setup_)
+                print("%-32s %-7s %6d bitmap loads %8.1f ms" % (renderer_.split(":")[0], label_, loads_, seconds_ * 1000))
+    finally:
+        MS_Importer.LiveLinkImporter.TextureSetup = current_
+        restoreCache()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Synthetic Bridge export payloads shared by the benchmarks.
+
+The assets follow the shape Bridge sends to the 3ds Max plugin: surfaces,
+3D assets and 3D plants with their components, mesh list and meta entries.
+"""
+import json, os
+
+SURFACE_MAPS = ["albedo", "roughness", "normal", "displacement", "ao", "cavity", "specular", "gloss", "bump"]
+ASSET_MAPS = ["albedo", "roughness", "normal", "displacement", "ao", "cavity", "specular", "metalness"]
+PLANT_MAPS = ["albedo", "roughness", "normal", "opacity", "translucency", "displacement", "specular"]
+
+KINDS = [
+    ("surface", SURFACE_MAPS, ["rock", "cliff"], ["nature", "rock"]),
+    ("3d", ASSET_MAPS, ["scatter", "stone"], ["3d", "scatter"]),
+    ("3dplant", PLANT_MAPS, ["plant", "fern"], ["3dplant", "fern"]),
+    ("surface", SURFACE_MAPS, ["metal", "colorless"], ["metal"]),
+    ("surface", SURFACE_MAPS, ["fabric", "cloth"], ["fabric"]),
+]
+
+
+def SyntheticAsset(index, root="D:/Megascans", resolution="4K"):
+    assetType, maps, tags, categories = KINDS[index % len(KINDS)]
+    assetID = "syn%05d" % index
+    path_ = "%s/%s/%s_%s" % (root, assetType, "Synthetic_Asset", assetID)
+    components_ = [
+        {
+            "type": map_,
+            "format": "exr" if map_ == "displacement" else "jpg",
+            "path": "%s/%s_%s_%s.%s" % (path_, assetID, resolution, map_.capitalize(),
+                                         "exr" if map_ == "displacement" else "jpg"),
+            "name": map_.capitalize(),
+        }
+        for map_ in maps
+    ]
+    meshes_ = []
+    if assetType != "surface":
+        meshes_ = [{"format": "fbx", "path": "%s/%s_LOD0.fbx" % (path_, assetID), "type": "lod"}]
+    return {
+        "id": assetID,
+        "guid": "00000000-0000-0000-0000-%012d" % index,
+        "name": "Synthetic Asset %d" % index,
+        "path": path_,
+        "type": assetType,
+        "category": "Metal" if "metal" in tags else categories[0].capitalize(),
+        "categories": categories,
+        "tags": tags,
+        "workflow": "metalness",
+        "activeLOD": "lod0",
+        "minLOD": "lod3",
+        "meshFormat": "fbx",
+        "resolution": resolution,
+        "components": components_,
+        "meshList": meshes_,
+        "meta": [
+            {"key": "height", "name": "Height", "value": "0.02 m"},
+            {"key": "scanArea", "name": "Scan Area", "value": "2x2 m"},
+            {"key": "isScaleFixed", "name": "Scale Fixed", "value": "false"},
+            {"key": "tileable", "name": "Tileable", "value": "true"},
+        ],
+        "exportPath": path_,
+        "isCustom": False,
+    }
+
+
+def SyntheticPayload(count, **kwargs):
+    return [SyntheticAsset(index, **kwargs) for index in range(count)]
+
+
+def WriteFixtures(payload, directory, root="D:/Megascans"):
+    """
+    Creates an empty file in directory for every component and mesh of payload,
+    laid out the way MSRuntime.HeadlessRuntime(fixtureDir=directory,
+    libraryRoot=root) looks them up.
+    """
+    for asset_ in payload:
+        for entry_ in asset_.get("components", []) + asset_.get("meshList", []):
+            relative_ = entry_["path"][len(root):].lstrip("/")
+            path_ = os.path.join(directory, *relative_.split("/"))
+            os.makedirs(os.path.dirname(path_), exist_ok=True)
+            open(path_, "ab").close()
+
+
+def LoadPayloads(directory):
+    """
+    Loads every recorded *.json payload in directory, sorted by name.
+    """
+    payloads_ = []
+    for name_ in sorted(os.listdir(directory)):
+        if name_.lower().endswith(".json"):
+            with open(os.path.join(directory, name_), "rb") as fl_:
+                payloads_.append((name_, fl_.read()))
+    return payloads_
+
+
+def Encode(payload):
+    return json.dumps(payload).encode("utf-8")
+
+
+def OverrideScriptCache(isEnabled, directory=""):
+    """
+    Makes the importer configure MSScriptCache with isEnabled and directory,
+    whatever Settings.json says. Benchmarks that compare script generators turn
+    it off, so every asset is generated. Returns a function that undoes it.
+    """
+    import MSScriptCache
+    configure_ = MSScriptCache.Configure
+
+    def Configure(settings):
+        configure_(dict(settings, Script_Cache_Enabled=isEnabled, Script_Cache_Dir=directory))
+    MSScriptCache.Configure = Configure
+
+    def Restore():
+        MSScriptCache.Configure = configure_
+    return Restore
@@ -0,0 +1,60 @@
+"""
+Runs a Bridge export through the importer on an MSRuntime.HeadlessRuntime and
+writes the MAXScript 3ds Max would have executed, one file per script, so two
+trees can be diffed. The textures of the synthetic payload are laid out as empty
+files in a fixture directory first, so file checks resolve like on a real library.
+MSScriptCache is off, so every script is generated by the tree under test.
+
+Needs the Quixel plugin modules (MSLiveLinkHelpers and the renderer setups) next
+to MS_Importer.py, as in an installed plugin folder.
+
+    python benchmarks/headless_import.py OUTPUT_DIR [assets] [renderer]
+"""
+import os, sys, tempfile
+
+_path_ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _path_ not in sys.path:
+    sys.path.append(_path_)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import bridge_payloads
+import MSRuntime
+
+LIBRARY_ROOT = "D:/Megascans"
+
+runtime_ = MSRuntime.Install(MSRuntime.HeadlessRuntime(libraryRoot=LIBRARY_ROOT))
+
+import MS_Importer
+
+
+def main():
+    if len(sys.argv) < 2:
+        raise SystemExit(__doc__)
+    output_ = sys.argv[1]
+    count_ = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    if len(sys.argv) > 3:
+        runtime_.Renderer = sys.argv[3]
+    payload_ = bridge_payloads.SyntheticPayload(count_, root=LIBRARY_ROOT)
+
+    with tempfile.TemporaryDirectory() as fixtures_:
+        bridge_payloads.WriteFixtures(payload_, fixtures_, root=LIBRARY_ROOT)
+        runtime_.FixtureDir = fixtures_
+        restoreCache = bridge_payloads.OverrideScriptCache(False)
+        try:
+            importer_ = MS_Importer.LiveLinkImporter()
+            # The import id otherwise comes from the clock; keep the scripts comparable
+            importer_.ImportID = 0
+            for asset_ in payload_:
+                importer_.set_Asset_Data(asset_)
+        finally:
+            restoreCache()
+
+    os.makedirs(output_, exist_ok=True)
+    for index_, script_ in enumerate(runtime_.Executed):
+        with open(os.path.join(output_, "%04d.ms" % index_), "w", encoding="utf-8") as fl_:
+            fl_.write(script_)
+    print("%d assets, %d scripts written to %s" % (count_, len(runtime_.Executed), output_))
+
+
+if __name__ == "__main__":
+    main()
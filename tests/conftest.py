@@ -0,0 +1,19 @@
+"""
+The plugin modules live in the repository root and are imported by name, as 3ds Max
+does from the plugin folder. Outside 3ds Max an MSRuntime.HeadlessRuntime stands in
+for pymxs, and the Quixel modules that ship with the Bridge plugin (MSLiveLinkHelpers,
+Logging) come from tests/stubs unless the real ones are on the path.
+"""
+import importlib.util, os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUBS = os.path.join(ROOT, "tests", "stubs")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+if any(importlib.util.find_spec(name_) is None for name_ in ("MSLiveLinkHelpers", "Logging")):
+    sys.path.append(STUBS)
+
+import MSRuntime
+
+if not MSRuntime.IsAvailable():
+    MSRuntime.Install(MSRuntime.HeadlessRuntime())
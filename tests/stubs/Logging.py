@@ -0,0 +1,7 @@
+"""
+Test stand-in for the Quixel Logging module: the usage log is not sent from tests.
+"""
+
+
+def Logger(*args):
+    pass
@@ -0,0 +1,71 @@
+import MSRuntime
+
+"""#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*
+#####################################################################################
+
+Test stand-in for the Quixel MSLiveLinkHelpers module, which ships with the Bridge
+plugin and not with this repository. It has the LiveLinkHelper methods the importer
+and MSOctaneSetup call. Scene and dialog calls go to the active MSRuntime, so a
+HeadlessRuntime records them; the MAXScript fragments are short marked
+placeholders, so tests can find them in the generated script.
+
+#####################################################################################
+#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*#*"""
+
+
+class LiveLinkHelper():
+    def GetMaxVersion(self):
+        return MSRuntime.Get().maxversion()[7]
+
+    def GetMeshType(self, meshList):
+        # True for Alembic meshes
+        return any(mesh_.get("format") == "abc" for mesh_ in meshList)
+
+    def HasMultipleMaterial(self, meta):
+        return self.GetNumberOfUniqueMaterial(meta) > 1
+
+    def GetNumberOfUniqueMaterial(self, meta):
+        return len(self.ExtractMatData(meta))
+
+    def ExtractMatData(self, meta):
+        for entry_ in meta:
+            if entry_.get("key") == "materialIds":
+                return entry_.get("value") or []
+        return []
+
+    def GetScanWidth(self, meta):
+        return self.GetScanSize(meta)[0]
+
+    def GetScanHeight(self, meta):
+        return self.GetScanSize(meta)[1]
+
+    def GetScanSize(self, meta):
+        # "2x2 m" -> (2.0, 2.0), 1 x 1 without a scan area
+        for entry_ in meta:
+            if entry_.get("key", "").lower() == "scanarea":
+                return tuple(float(size_) for size_ in entry_["value"].split()[0].split("x"))
+        return 1.0, 1.0
+
+    def SetAlembicImportSettings(self):
+        MSRuntime.Get().SetAlembicImportSettings()
+
+    def DeselectEverything(self):
+        MSRuntime.Get().clearSelection()
+
+    def ShowMessageDialog(self, title, message):
+        MSRuntime.Get().messageBox(message, title=title)
+
+    def OpenObjImpFile(self):
+        return "-- OpenObjImpFile\n"
+
+    def GetObjSetting(self, section, key, name):
+        return f"-- GetObjSetting {section} {key} {name}\n"
+
+    def ChangeObjSetting(self, section, key, value):
+        return f"-- ChangeObjSetting {section} {key} {value}\n"
+
+    def ResetObjIniValue(self, section, key, name):
+        return f"-- ResetObjIniValue {section} {key} {name}\n"
+
+    def RearrangeMaterialGraph(self):
+        return "-- RearrangeMaterialGraph\n"
@@ -0,0 +1,55 @@
+import pytest
+
+import MSAssetClass
+
+
+def Asset(assetType="surface", category="", tags=(), categories=()):
+    return {"type": assetType, "category": category, "tags": list(tags), "categories": list(categories)}
+
+
+@pytest.mark.parametrize("asset, classes", [
+    (Asset(category="Metal", tags=["Colorless"]), {"isMetal", "isBareMetal"}),
+    (Asset(tags=["metal", "colorless"]), {"hasMetalTag", "hasColorlessMetalTags", "hasBareMetalTag"}),
+    (Asset("3d", tags=["fruits"]), {"isFruit", "hasFruitTag"}),
+    (Asset("3d", categories=["Fruit"]), {"isFruit"}),
+    (Asset(tags=["Fabric"]), {"isFabric", "hasFabricTag"}),
+    (Asset(categories=["fabric"]), {"isFabric"}),
+    (Asset("3dplant"), {"isPlant"}),
+    (Asset(categories=["Snow"]), {"isSurfaceSSS"}),
+    (Asset("3d", categories=["Snow"]), set()),
+    (Asset("3d", tags=["scatter"]), {"isScatterAsset"}),
+    (Asset("3d", categories=["cmb_asset"]), {"isScatterAsset"}),
+    (Asset("3d", tags=["Scatter"]), set()),
+    (Asset(categories=["metal"]), {"hasMetalTag", "hasBareMetalTag"}),
+], ids=["bare-metal", "metal-tags", "fruit-tag", "fruit-category", "fabric-tag", "fabric-category", "plant",
+        "sss-surface", "sss-not-3d", "scatter-tag", "scatter-category", "scatter-case-sensitive", "metal-category"])
+def test_classify(asset, classes):
+    classes_ = MSAssetClass.Classify(asset)
+    assert list(classes_) == [name_ for name_, predicate_ in MSAssetClass.CLASSIFICATION_RULES]
+    assert {name_ for name_, value_ in classes_.items() if value_} == classes
+
+
+def test_missing_fields_classify_as_nothing():
+    assert not any(MSAssetClass.Classify({"tags": None, "categories": None}).values())
+
+
+def test_add_rule_reads_earlier_classes(monkeypatch):
+    monkeypatch.setattr(MSAssetClass, "CLASSIFICATION_RULES", list(MSAssetClass.CLASSIFICATION_RULES))
+    MSAssetClass.AddRule("isMossyRock", lambda asset, classes: classes["isSurfaceSSS"] and "rock" in asset.tags)
+    classes_ = MSAssetClass.Classify(Asset(tags=["Rock"], categories=["moss"]))
+    assert list(classes_)[-1] == "isMossyRock"
+    assert classes_["isMossyRock"]
+
+
+def test_add_rule_replaces_in_place(monkeypatch):
+    monkeypatch.setattr(MSAssetClass, "CLASSIFICATION_RULES", list(MSAssetClass.CLASSIFICATION_RULES))
+    names_ = [name_ for name_, predicate_ in MSAssetClass.CLASSIFICATION_RULES]
+    MSAssetClass.AddRule("isPlant", lambda asset, classes: asset.type == "3d")
+    assert [name_ for name_, predicate_ in MSAssetClass.CLASSIFICATION_RULES] == names_
+    assert MSAssetClass.Classify(Asset("3d"))["isPlant"]
+    assert not MSAssetClass.Classify(Asset("3dplant"))["isPlant"]
+
+
+def test_classify_with_own_rules():
+    rules_ = [("isSurface", lambda asset, classes: asset.type == "surface")]
+    assert MSAssetClass.Classify(Asset(), rules_) == {"isSurface": True}
@@ -0,0 +1,113 @@
+import pytest
+
+import MSAssetMeta
+
+# Bridge meta entries as they come with surfaces, decals and 3d assets.
+SAMPLES = {
+    "surface": [
+        {"key": "height", "name": "Height", "value": "0.02 m"},
+        {"key": "scanArea", "name": "Scan Area", "value": "2x2 m"},
+        {"key": "tileable", "name": "Tileable", "value": True},
+    ],
+    "decal": [
+        {"key": "height", "name": "Height", "value": "2 cm"},
+        {"key": "scanArea", "name": "Scan Area", "value": "60x30 cm"},
+        {"key": "isScaleFixed", "name": "Scale Fixed", "value": "True"},
+    ],
+    "small-scan": [
+        {"key": "height", "name": "Height", "value": "15 mm"},
+        {"key": "scanArea", "name": "Scan Area", "value": "600x600 mm"},
+    ],
+    "3d": [
+        {"key": "materialIds", "name": "Material Ids", "value": ["a", "b"]},
+        {"key": "scanArea", "name": "Scan Area", "value": "0.5x0.5 m"},
+    ],
+    "unreadable": [
+        {"key": "height", "name": "Height", "value": "0.01 m"},
+        {"key": "height", "name": "Height", "value": "n/a"},
+        {"key": "Height", "name": "Other case", "value": "9 m"},
+        {"key": "scanArea", "name": "Scan Area", "value": "large"},
+        {"key": "scanArea", "name": "Second", "value": "3x3 m"},
+    ],
+}
+
+
+def LegacyOctaneMeta(meta):
+    # How MSOctaneSetup read the meta before AssetMeta: height as written, scan area
+    # in metres with only centimetres converted.
+    displacement_ = 0.013
+    for entry_ in meta:
+        if entry_["key"] == "height":
+            try:
+                displacement_ = float(entry_["value"].split()[0])
+            except (ValueError, IndexError):
+                pass
+    scale_ = (1.0, 1.0)
+    for entry_ in meta:
+        if entry_["key"].lower() == "scanarea":
+            parts_ = entry_["value"].split()
+            try:
+                width_, height_ = (float(size_) for size_ in parts_[0].split("x"))
+            except (IndexError, ValueError):
+                width_, height_ = 1.0, 1.0
+            if len(parts_) >= 2 and parts_[1].lower().startswith("cm"):
+                width_, height_ = width_ / 100.0, height_ / 100.0
+            scale_ = (width_, height_)
+            break
+    fixed_ = False
+    for entry_ in meta:
+        if entry_["key"].lower() == "isscalefixed":
+            fixed_ = entry_["value"].lower() == "true"
+            break
+    return displacement_, scale_, fixed_
+
+
+@pytest.mark.parametrize("name", SAMPLES)
+def test_fields_match_the_legacy_octane_parsing(name):
+    meta_ = MSAssetMeta.AssetMeta(SAMPLES[name])
+    height_ = meta_.height if meta_.height is not None else 0.013
+    assert (height_, (meta_.scanWidth, meta_.scanHeight), meta_.isScaleFixed) == LegacyOctaneMeta(SAMPLES[name])
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("0.02 m", 0.02),
+    ("2 cm", 2.0),
+    ("15mm", None),
+    ("3", 3.0),
+    ("tall", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_number(value, expected):
+    assert MSAssetMeta.ParseNumber(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2x2 m", (2.0, 2.0)),
+    ("60x30 cm", (0.6, 0.3)),
+    ("600x600 mm", (600.0, 600.0)),
+    ("2x2", (2.0, 2.0)),
+    ("60 x 30 cm", (1.0, 1.0)),
+    ("2 cm", (0.01, 0.01)),
+])
+def test_parse_scan_area(value, expected):
+    assert MSAssetMeta.ParseScanArea(value) == pytest.approx(expected)
+
+
+def test_asset_meta_fields():
+    meta_ = MSAssetMeta.AssetMeta(SAMPLES["decal"])
+    assert meta_.height == 2.0
+    assert (meta_.hasScanArea, meta_.scanWidth, meta_.scanHeight) == (True, 0.6, 0.3)
+    assert meta_.isScaleFixed
+    assert "SCANAREA" in meta_ and "tileable" not in meta_
+    assert meta_.Get("HEIGHT") == "2 cm"
+    assert meta_.Get("tileable", "false") == "false"
+    assert len(meta_) == 3
+
+
+def test_asset_meta_defaults_and_bad_entries():
+    meta_ = MSAssetMeta.AssetMeta([{"name": "no key"}, None, {"key": 3}])
+    assert meta_.height is None
+    assert (meta_.hasScanArea, meta_.scanWidth, meta_.scanHeight) == (False, 1.0, 1.0)
+    assert not meta_.isScaleFixed
+    assert len(MSAssetMeta.AssetMeta()) == 0
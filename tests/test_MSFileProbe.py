@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+import MSFileProbe, MSRuntime
+
+
+@pytest.fixture
+def library(tmp_path):
+    asset_ = tmp_path / "surface" / "rock"
+    asset_.mkdir(parents=True)
+    (asset_ / "rock_4K_Albedo.jpg").write_bytes(b"albedo")
+    (asset_ / "rock_4K_Displacement.exr").write_bytes(b"exr")
+    (asset_ / "rock_4K_Displacement.jpg").write_bytes(b"jpg")
+    return asset_
+
+
+def test_exists(library):
+    probe_ = MSFileProbe.FileProbe()
+    assert probe_.Exists(str(library / "rock_4K_Albedo.jpg"))
+    assert not probe_.Exists(str(library / "rock_4K_Normal.jpg"))
+    assert not probe_.Exists(str(library / "missing" / "rock_4K_Albedo.jpg"))
+
+
+def test_directory_is_listed_once(library, monkeypatch):
+    probe_ = MSFileProbe.FileProbe()
+    listed_ = []
+    scandir_ = os.scandir
+
+    def Scandir(path):
+        listed_.append(path)
+        return scandir_(path)
+
+    monkeypatch.setattr(os, "scandir", Scandir)
+    probe_.Exists(str(library / "rock_4K_Albedo.jpg"))
+    probe_.Exists(str(library) + "/./rock_4K_Normal.jpg")
+    probe_.Fingerprint(str(library / "rock_4K_Albedo.jpg"))
+    assert len(listed_) == 1
+    # A new probe (a new import) sees the folder as it is now
+    (library / "rock_4K_Normal.jpg").write_bytes(b"normal")
+    assert not probe_.Exists(str(library / "rock_4K_Normal.jpg"))
+    assert MSFileProbe.FileProbe().Exists(str(library / "rock_4K_Normal.jpg"))
+
+
+def test_fingerprint(library):
+    probe_ = MSFileProbe.FileProbe()
+    stat_ = os.stat(str(library / "rock_4K_Albedo.jpg"))
+    assert probe_.Fingerprint(str(library / "rock_4K_Albedo.jpg")) == (stat_.st_size, stat_.st_mtime_ns)
+    assert probe_.Fingerprint(str(library / "rock_4K_Normal.jpg")) is None
+
+
+def test_find_variant(library):
+    probe_ = MSFileProbe.FileProbe()
+    displacement_ = str(library / "rock_4K_Displacement.jpg")
+    assert probe_.FindVariant(displacement_, ".exr") == str(library / "rock_4K_Displacement.exr")
+    assert probe_.FindVariant(str(library / "rock_4K_Albedo.jpg"), ".exr") is None
+
+
+def test_paths_are_mapped_by_runtime(library, tmp_path, monkeypatch):
+    monkeypatch.setattr(MSRuntime, "current", MSRuntime.HeadlessRuntime(fixtureDir=str(tmp_path), libraryRoot="D:/Megascans"))
+    probe_ = MSFileProbe.FileProbe()
+    assert probe_.Exists("D:/Megascans/surface/rock/rock_4K_Albedo.jpg")
+    assert probe_.FindVariant("D:/Megascans/surface/rock/rock_4K_Displacement.jpg", ".exr") is not None
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("D:\\Megascans\\surface\\rock", "D:/Megascans/surface/rock"),
+    ("D:/Megascans/surface/./rock/", "D:/Megascans/surface/rock"),
+    ("D:/Megascans/3d/../surface/rock", "D:/Megascans/surface/rock"),
+])
+def test_normalize_path(path, expected):
+    assert MSFileProbe.NormalizePath(path) == os.path.normcase(expected).replace("\\", "/")
@@ -0,0 +1,126 @@
+import os, struct
+
+import pytest
+
+import MSImageInfo, MSRuntime
+
+
+def PNG(width, height):
+    return MSImageInfo.PNG_MAGIC + struct.pack(">I4sII", 13, b"IHDR", width, height) + b"\x08\x02\x00\x00\x00"
+
+
+def EXRAttribute(name, typeName, value):
+    return name + b"\x00" + typeName + b"\x00" + struct.pack("<i", len(value)) + value
+
+
+def EXR(width, height, before=b""):
+    return (
+        MSImageInfo.EXR_MAGIC + struct.pack("<I", 2) + before
+        + EXRAttribute(b"compression", b"compression", b"\x00")
+        + EXRAttribute(b"dataWindow", b"box2i", struct.pack("<iiii", 0, 0, width - 1, height - 1))
+        + b"\x00"
+    )
+
+
+def JPEG(width, height, exif=b""):
+    app1_ = b"\xff\xe1" + struct.pack(">H", len(exif) + 2) + exif
+    sof_ = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return MSImageInfo.JPEG_MAGIC + app1_ + sof_ + b"\xff\xd9"
+
+
+def TIFF(width, height, order="<", widthType=3):
+    magic_ = b"II*\x00" if order == "<" else b"MM\x00*"
+    entries_ = [(256, widthType, width), (257, 4, height)]
+    data_ = magic_ + struct.pack(order + "I", 8) + struct.pack(order + "H", len(entries_))
+    for tag_, type_, value_ in entries_:
+        if type_ == 3:
+            data_ += struct.pack(order + "HHIHH", tag_, type_, 1, value_, 0)
+        else:
+            data_ += struct.pack(order + "HHII", tag_, type_, 1, value_)
+    return data_ + struct.pack(order + "I", 0)
+
+
+@pytest.fixture
+def image(tmp_path):
+    def Write(data, name="image.bin"):
+        path_ = tmp_path / name
+        path_.write_bytes(data)
+        return str(path_)
+    MSImageInfo.sizeCache.clear()
+    yield Write
+    MSImageInfo.sizeCache.clear()
+
+
+@pytest.mark.parametrize("data", [
+    PNG(4096, 2048),
+    EXR(4096, 2048),
+    EXR(4096, 2048, before=EXRAttribute(b"comments", b"string", b"x" * 10000)),
+    JPEG(4096, 2048),
+    JPEG(4096, 2048, exif=b"\x00" * 60000),
+    TIFF(4096, 2048),
+    TIFF(4096, 2048, order=">"),
+    TIFF(4096, 2048, widthType=4),
+], ids=["png", "exr", "exr-long-header", "jpeg", "jpeg-exif", "tiff-le", "tiff-be", "tiff-long"])
+def test_reads_size_from_header(image, data):
+    assert MSImageInfo.GetImageSize(image(data)) == (4096, 2048)
+
+
+@pytest.mark.parametrize("data", [
+    PNG(4096, 2048),
+    EXR(4096, 2048),
+    JPEG(4096, 2048),
+    TIFF(4096, 2048),
+], ids=["png", "exr", "jpeg", "tiff"])
+def test_truncated_header_is_none(image, data):
+    for length_ in range(len(data) - 8):
+        assert MSImageInfo.GetImageSize(image(data[:length_], "cut%d.bin" % length_)) is None
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"not an image at all",
+    MSImageInfo.PNG_MAGIC + b"\x00\x00\x00\x0dIHDX" + b"\x00" * 8,
+    MSImageInfo.EXR_MAGIC + struct.pack("<I", 2) + b"name\x00type\x00" + struct.pack("<i", -40) + b"\x00" * 64,
+    MSImageInfo.EXR_MAGIC + struct.pack("<I", 2) + b"\x00",
+    MSImageInfo.JPEG_MAGIC + b"\xff\xe1\x00\x00" + b"\xff" * 8,
+    MSImageInfo.JPEG_MAGIC + b"\xff\xe1\x00\x01",
+    MSImageInfo.JPEG_MAGIC + b"\xff" * 16,
+    MSImageInfo.JPEG_MAGIC + b"\x00\x00",
+    b"II*\x00" + struct.pack("<I", 1 << 30),
+    b"MM\x00*" + struct.pack(">IH", 8, 500) + b"\x00" * 12,
+], ids=["empty", "text", "png-no-ihdr", "exr-negative-size", "exr-no-datawindow", "jpeg-zero-length",
+        "jpeg-short-length", "jpeg-fill-to-eof", "jpeg-no-marker", "tiff-bad-offset", "tiff-short-ifd"])
+def test_corrupt_header_is_none(image, data):
+    assert MSImageInfo.GetImageSize(image(data)) is None
+
+
+def test_missing_file_is_none(tmp_path):
+    assert MSImageInfo.GetImageSize(str(tmp_path / "missing.exr")) is None
+
+
+def test_changed_file_is_read_again(image):
+    path_ = image(PNG(1024, 1024))
+    assert MSImageInfo.GetImageSize(path_) == (1024, 1024)
+    with open(path_, "wb") as fl_:
+        fl_.write(PNG(2048, 1024) + b"\x00")
+    assert MSImageInfo.GetImageSize(path_) == (2048, 1024)
+
+
+def test_cache_keeps_most_recent_paths(image, monkeypatch):
+    monkeypatch.setattr(MSImageInfo, "MAX_CACHED_SIZES", 3)
+    paths_ = [image(PNG(index_ + 1, 1), "image%d.png" % index_) for index_ in range(5)]
+    for path_ in paths_:
+        MSImageInfo.GetImageSize(path_)
+    MSImageInfo.GetImageSize(paths_[2])
+    MSImageInfo.GetImageSize(paths_[0])
+    assert list(MSImageInfo.sizeCache) == [paths_[4], paths_[2], paths_[0]]
+
+
+def test_path_is_mapped_by_runtime(tmp_path, monkeypatch):
+    fixture_ = tmp_path / "surface" / "rock"
+    fixture_.mkdir(parents=True)
+    (fixture_ / "rock_4K_Displacement.exr").write_bytes(EXR(4096, 4096))
+    runtime_ = MSRuntime.HeadlessRuntime(fixtureDir=str(tmp_path), libraryRoot="D:/Megascans")
+    monkeypatch.setattr(MSRuntime, "current", runtime_)
+    MSImageInfo.sizeCache.clear()
+    assert MSImageInfo.GetImageSize("D:/Megascans/surface/rock/rock_4K_Displacement.exr") == (4096, 4096)
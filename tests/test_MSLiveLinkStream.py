@@ -0,0 +1,91 @@
+import json, random, socket, threading
+
+import pytest
+
+import MSLiveLinkStream
+
+PAYLOAD = [
+    {"id": "abc", "name": "Rock \u00e9", "components": [{"path": "D:/a]b}.jpg"}], "meta": []},
+    10.5,
+    -3,
+    "text, with ] and }",
+    [1, [2, 3]],
+    True,
+    None,
+    {"id": "xyz", "tags": ["fr\u00fcit"]},
+]
+
+
+def Stream(chunks):
+    stream_ = MSLiveLinkStream.JSONArrayStream()
+    elements_ = []
+    for chunk_ in chunks:
+        elements_ += stream_.Feed(chunk_)
+    return elements_ + stream_.Close(), stream_
+
+
+def Split(data, sizes):
+    chunks_, position_ = [], 0
+    for size_ in sizes:
+        chunks_.append(data[position_:position_ + size_])
+        position_ += size_
+    return chunks_ + [data[position_:]]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_chunks(seed):
+    data_ = json.dumps(PAYLOAD, ensure_ascii=False).encode("utf-8")
+    random_ = random.Random(seed)
+    elements_, stream_ = Stream(Split(data_, [random_.randint(1, 7) for index_ in range(len(data_) // 3)]))
+    assert elements_ == PAYLOAD
+    assert stream_.count == len(PAYLOAD)
+
+
+def test_elements_are_returned_as_they_complete():
+    stream_ = MSLiveLinkStream.JSONArrayStream()
+    assert stream_.Feed(b'[{"id": "a"}, {"id"') == [{"id": "a"}]
+    assert stream_.Feed(b': "b"}') == [{"id": "b"}]
+    assert stream_.Feed(b"]") == []
+    assert stream_.Close() == []
+
+
+def test_number_split_before_its_fraction():
+    stream_ = MSLiveLinkStream.JSONArrayStream()
+    assert stream_.Feed(b"[10.") == []
+    assert stream_.Feed(b"25]") == [10.25]
+
+
+def test_payload_that_is_not_an_array_is_one_element():
+    assert Stream([b'{"id":', b' "a"}'])[0] == [{"id": "a"}]
+
+
+@pytest.mark.parametrize("data", [b'[{"id": "a"}', b"[1, 2", b'[{"id": ]'], ids=["open-array", "open-number", "malformed"])
+def test_truncated_or_malformed_payload_raises(data):
+    with pytest.raises(ValueError):
+        Stream([data])
+
+
+def Receive(data, **kwargs):
+    client_, bridge_ = socket.socketpair()
+    writer_ = threading.Thread(target=lambda: (bridge_.sendall(data), bridge_.close()))
+    writer_.start()
+    try:
+        return MSLiveLinkStream.ReceivePayload(client_, **kwargs)
+    finally:
+        writer_.join()
+        client_.close()
+
+
+def test_receive_up_to_eof():
+    data_ = json.dumps(PAYLOAD).encode("utf-8") * 50
+    assert Receive(data_, chunkSize=1024) == data_
+
+
+def test_receive_framed_payload_ignores_what_follows():
+    data_ = json.dumps(PAYLOAD).encode("utf-8")
+    assert Receive(MSLiveLinkStream.FramePayload(data_) + b"next", chunkSize=5) == data_
+
+
+def test_receive_short_framed_payload_raises():
+    with pytest.raises(ConnectionError):
+        Receive(MSLiveLinkStream.FramePayload(b"[1, 2, 3]")[:-2])
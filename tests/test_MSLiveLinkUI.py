@@ -0,0 +1,142 @@
+import json, socket, time
+
+import pytest
+
+# The monitor needs a Qt binding
+MSLiveLinkUI = pytest.importorskip("MSLiveLinkUI")
+
+import MS_Importer, MSParallelImport, MSRuntime, MSSettings, MSTiming
+
+
+def Asset(index):
+    assetID = "test%03d" % index
+    path_ = "D:/Megascans/surface/Test_%s" % assetID
+    return {
+        "id": assetID,
+        "guid": "guid-%s" % assetID,
+        "name": "Test Asset %d" % index,
+        "path": path_,
+        "type": "surface",
+        "category": "Rock",
+        "categories": ["rock"],
+        "tags": ["rock"],
+        "workflow": "metalness",
+        "activeLOD": "lod0",
+        "minLOD": "lod3",
+        "resolution": "2K",
+        "components": [
+            {"type": map_, "format": "jpg", "name": map_, "path": "%s/%s_2K_%s.jpg" % (path_, assetID, map_)}
+            for map_ in ("albedo", "roughness", "normal")
+        ],
+        "meshList": [],
+        "meta": [],
+    }
+
+
+def Send(monitor, payload):
+    """
+    Receives payload as a Bridge export, like the socket thread does.
+    """
+    client_, bridge_ = socket.socketpair()
+    bridge_.sendall(json.dumps(payload).encode("utf-8"))
+    bridge_.close()
+    monitor.ReceiveExport(client_)
+
+
+def Wait(monitor, seconds=60.0):
+    app_ = MSLiveLinkUI.QCoreApplication.instance()
+    deadline_ = time.monotonic() + seconds
+    while monitor.Exports and time.monotonic() < deadline_:
+        app_.processEvents()
+        time.sleep(0.005)
+    assert not monitor.Exports, "the export did not complete"
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    if MSLiveLinkUI.QCoreApplication.instance() is None:
+        MSLiveLinkUI.app = MSLiveLinkUI.QCoreApplication([])
+    importer_ = MSLiveLinkUI.GetImporter()
+    store_ = MSSettings.SettingsStore(str(tmp_path / "Settings.json"), importer_.defaultSettings())
+    monkeypatch.setattr(importer_, "SettingsStore", store_)
+    monkeypatch.setattr(importer_, "Settings", store_.Load())
+    MSRuntime.Get().Reset()
+    yield MSLiveLinkUI.CreateMonitor()
+    MSParallelImport.Shutdown()
+
+
+def Configure(settings):
+    importer_ = MSLiveLinkUI.GetImporter()
+    importer_.updateSettings(dict(importer_.loadSettings(), **settings))
+
+
+def ExecutedIDs(payload):
+    script_ = "".join(MSRuntime.Get().Executed)
+    return [asset_["id"] for asset_ in payload if asset_["id"] in script_]
+
+
+@pytest.mark.parametrize("isBackground", [True, False])
+def test_parallel_export_goes_through_the_worker_pool(monitor, monkeypatch, isBackground):
+    Configure({"Parallel_Workers": 2, "Background_Import": isBackground})
+    prepared_ = []
+    prepareAsset = MS_Importer.LiveLinkImporter.PrepareAsset
+
+    def PrepareAsset(self, json_data):
+        prepared_.append(json_data["id"])
+        return prepareAsset(self, json_data)
+
+    # Only assets prepared in this process are recorded, none of the workers'
+    monkeypatch.setattr(MS_Importer.LiveLinkImporter, "PrepareAsset", PrepareAsset)
+    payload_ = [Asset(index_) for index_ in range(6)]
+    Send(monitor, payload_)
+    Wait(monitor)
+
+    assert prepared_ == []
+    assert (2, None) in MSParallelImport.executors
+    assert ExecutedIDs(payload_) == [asset_["id"] for asset_ in payload_]
+
+
+def test_export_received_during_an_import_waits_for_it(monitor):
+    Configure({"Parallel_Workers": 0, "Background_Import": True})
+    batches_ = []
+    importer_ = MSLiveLinkUI.GetImporter()
+    beginBatch = importer_.BeginBatch
+
+    def BeginBatch(*args):
+        # The batch of the export before must have been executed by now
+        batches_.append(importer_.Batch)
+        beginBatch(*args)
+
+    importer_.BeginBatch = BeginBatch
+    try:
+        first_ = [Asset(index_) for index_ in range(8)]
+        second_ = [Asset(index_) for index_ in range(8, 11)]
+        Send(monitor, first_)
+        Send(monitor, second_)
+        assert len(monitor.Exports) == 2
+        Wait(monitor)
+    finally:
+        del importer_.BeginBatch
+
+    assert batches_ == [None, None]
+    assert ExecutedIDs(first_ + second_) == [asset_["id"] for asset_ in first_ + second_]
+
+
+def test_settings_changed_during_an_export_apply_after_it(monitor):
+    Configure({"Parallel_Workers": 0, "Background_Import": True, "Timing_Enabled": False})
+    importer_ = MSLiveLinkUI.GetImporter()
+    payload_ = [Asset(index_) for index_ in range(4)]
+    Send(monitor, payload_)
+    assert monitor.Exports
+    # What LiveLinkUI.settingsChanged does while the worker prepares the export
+    Configure({"Timing_Enabled": True, "Material_to_Sel": False})
+    assert importer_.Settings["Timing_Enabled"] is False and not MSTiming.recorder.isEnabled
+    assert importer_.loadSettings()["Timing_Enabled"] is True
+    assert importer_.SettingsStore.Load()["Timing_Enabled"] is True
+    Wait(monitor)
+
+    assert ExecutedIDs(payload_) == [asset_["id"] for asset_ in payload_]
+    assert MSTiming.MAXSCRIPT_LOG not in "".join(MSRuntime.Get().Executed)
+    assert importer_.Settings["Timing_Enabled"] is True and MSTiming.recorder.isEnabled
+    assert importer_.Settings["Material_to_Sel"] is False
+    Configure({"Timing_Enabled": False, "Material_to_Sel": True})
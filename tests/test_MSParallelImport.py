@@ -0,0 +1,73 @@
+import os, time
+
+import pytest
+
+import MS_Importer, MSDiagnostics, MSParallelImport, MSSettings, MSTiming
+
+
+def Asset(directory, index):
+    assetID = "pool%03d" % index
+    path_ = directory / assetID
+    path_.mkdir()
+    components_ = []
+    for map_ in ("Albedo", "Roughness", "Normal", "Displacement"):
+        (path_ / ("%s_2K_%s.jpg" % (assetID, map_))).write_bytes(b"")
+        components_.append({"type": map_.lower(), "format": "jpg", "name": map_,
+                            "path": (path_ / ("%s_2K_%s.jpg" % (assetID, map_))).as_posix()})
+    return {
+        "id": assetID, "guid": "guid-" + assetID, "name": "Pool Asset %d" % index, "path": path_.as_posix(),
+        "type": "surface", "category": "Rock", "categories": ["rock"], "tags": ["rock"],
+        "workflow": "metalness", "activeLOD": "lod0", "minLOD": "lod3", "resolution": "2K",
+        "components": components_, "meshList": [],
+        "meta": [{"key": "height", "name": "Height", "value": "0.02 m"}],
+    }
+
+
+@pytest.fixture
+def importer(tmp_path, monkeypatch):
+    importer_ = MS_Importer.LiveLinkImporter()
+    store_ = MSSettings.SettingsStore(str(tmp_path / "Settings.json"), importer_.defaultSettings())
+    monkeypatch.setattr(importer_, "SettingsStore", store_)
+    importer_.updateSettings(dict(store_.Load(), Timing_Enabled=True, Diagnostics_Enabled=True,
+                                  Diagnostics_Dir=str(tmp_path / "diagnostics")))
+    importer_.BeginBatch(0)
+    yield importer_
+    importer_.Batch = None
+    importer_.updateSettings(store_.Load())
+    MSParallelImport.Shutdown()
+
+
+def test_pool_generates_the_scripts_of_the_importer_settings(importer, tmp_path):
+    (tmp_path / "library").mkdir()
+    assets_ = [Asset(tmp_path / "library", index_) for index_ in range(4)]
+
+    pooled_ = list(MSParallelImport.GenerateScripts(importer, assets_, 2))
+    assert (2, None) in MSParallelImport.executors
+    inline_ = list(MSParallelImport.GenerateScripts(importer, assets_, 0))
+
+    assert [error_ for prepared_, error_ in pooled_] == [None] * len(assets_)
+    assert [prepared_.ID for prepared_, error_ in pooled_] == [asset_["id"] for asset_ in assets_]
+    assert [prepared_.script for prepared_, error_ in pooled_] == [prepared_.script for prepared_, error_ in inline_]
+    assert [[call_.__name__ for call_ in prepared_.mainThreadCalls] for prepared_, error_ in pooled_] == [
+        [call_.__name__ for call_ in prepared_.mainThreadCalls] for prepared_, error_ in inline_]
+    # Timing_Enabled reached the workers: their scripts carry the section markers
+    for prepared_, error_ in pooled_:
+        assert MSTiming.MAXSCRIPT_LOG in prepared_.script and "msTiming_max_material" in prepared_.script
+
+    # and so did Diagnostics_Enabled, written from the workers too
+    MSDiagnostics.sink.Wait()
+    folders_ = [str(tmp_path / "diagnostics" / asset_["id"]) for asset_ in assets_]
+    deadline_ = time.monotonic() + 30.0
+    while not all(os.path.isdir(folder_) for folder_ in folders_) and time.monotonic() < deadline_:
+        time.sleep(0.05)
+    assert all(any(name_.startswith("assetData_") for name_ in os.listdir(folder_)) for folder_ in folders_)
+
+
+def test_worker_errors_come_back_in_order(importer, tmp_path):
+    (tmp_path / "library").mkdir()
+    assets_ = [Asset(tmp_path / "library", index_) for index_ in range(3)]
+    del assets_[1]["activeLOD"]
+
+    results_ = list(MSParallelImport.GenerateScripts(importer, assets_, 2))
+    assert [prepared_ is None for prepared_, error_ in results_] == [False, True, False]
+    assert "KeyError: 'activeLOD'" in results_[1][1]
@@ -0,0 +1,85 @@
+import os, sys
+
+import pytest
+
+import MSRuntime
+
+
+@pytest.fixture
+def runtime(tmp_path):
+    (tmp_path / "surface" / "rock").mkdir(parents=True)
+    (tmp_path / "surface" / "rock" / "rock_Albedo.jpg").write_bytes(b"")
+    return MSRuntime.HeadlessRuntime(renderer="V_Ray_6:V_Ray_6", maxVersion=2023,
+                                     fixtureDir=str(tmp_path), libraryRoot="D:\\Megascans\\")
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    """
+    Restores the active runtime and the pymxs module after a test that installs one.
+    """
+    monkeypatch.setattr(MSRuntime, "current", MSRuntime.current)
+    monkeypatch.setitem(sys.modules, "pymxs", sys.modules.get("pymxs"))
+
+
+@pytest.mark.parametrize("script, expected", [
+    ("renderers.current", "V_Ray_6:V_Ray_6"),
+    ("  classof renderers.current\n", "V_Ray_6"),
+    ("MaxVersion()", [25000, 0, 0, 0, 0, 0, 0, 2023]),
+    ('doesFileExist @"D:/Megascans/surface/rock/rock_Albedo.jpg"', True),
+    ('doesFileExist "D:\\Megascans\\surface\\rock\\rock_Normal.jpg"', False),
+], ids=["renderer", "renderer-class", "max-version", "file-exists", "file-missing"])
+def test_queries_are_answered_and_not_recorded(runtime, script, expected):
+    assert runtime.execute(script) == expected
+    assert runtime.Executed == []
+
+
+def test_scripts_and_calls_are_recorded(runtime):
+    assert runtime.execute("box()\nsphere()") is True
+    runtime.clearSelection()
+    runtime.messageBox("text", title="MS Plugin Error")
+    runtime.callbacks.addScript("#postImport", "print 1", id="ms")
+    assert runtime.Executed == ["box()\nsphere()"]
+    assert runtime.Calls == [
+        ("clearSelection", (), {}),
+        ("messageBox", ("text",), {"title": "MS Plugin Error"}),
+        ("callbacks.addScript", ("#postImport", "print 1"), {"id": "ms"}),
+    ]
+    runtime.Reset()
+    assert (runtime.Executed, runtime.Calls) == ([], [])
+
+
+@pytest.mark.parametrize("path, relative", [
+    ("D:/Megascans/surface/rock/rock_Albedo.jpg", "surface/rock/rock_Albedo.jpg"),
+    ("d:\\megascans\\surface\\rock\\rock_Albedo.jpg", "surface/rock/rock_Albedo.jpg"),
+    ("E:/Other/rock_Albedo.jpg", "Other/rock_Albedo.jpg"),
+], ids=["library", "library-case-and-separators", "outside-library"])
+def test_paths_map_into_the_fixture_directory(runtime, tmp_path, path, relative):
+    assert runtime.MapPath(path) == os.path.join(str(tmp_path), *relative.split("/"))
+
+
+def test_paths_are_unchanged_without_fixtures():
+    runtime_ = MSRuntime.HeadlessRuntime(libraryRoot="D:/Megascans")
+    assert runtime_.MapPath("D:/Megascans/rock.jpg") == "D:/Megascans/rock.jpg"
+    assert runtime_.MapPath("") == ""
+
+
+def test_install_provides_a_pymxs_stand_in(runtime, installed):
+    assert MSRuntime.Install(runtime) is runtime
+    import pymxs
+    assert pymxs.runtime is runtime and pymxs.isStandIn
+    assert MSRuntime.Get() is runtime
+    assert not MSRuntime.IsAvailable()
+    assert MSRuntime.MapPath("D:/Megascans/rock.jpg") == runtime.MapPath("D:/Megascans/rock.jpg")
+    other_ = MSRuntime.Install(MSRuntime.HeadlessRuntime())
+    assert sys.modules["pymxs"].runtime is other_
+
+
+def test_mapping_is_left_to_3ds_max_for_other_runtimes(installed):
+    MSRuntime.current = MSRuntime.UnavailableRuntime()
+    assert MSRuntime.MapPath("D:/Megascans/rock.jpg") == "D:/Megascans/rock.jpg"
+
+
+def test_unavailable_runtime_refuses_every_call():
+    with pytest.raises(RuntimeError, match="pymxs.runtime.execute"):
+        MSRuntime.UnavailableRuntime().execute("box()")
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+import MSScriptCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache_ = MSScriptCache.ScriptCache()
+    cache_.Configure({"Script_Cache_Enabled": True, "Script_Cache_Dir": str(tmp_path)})
+    yield cache_
+    cache_.Wait()
+
+
+def test_off_unless_enabled():
+    cache_ = MSScriptCache.ScriptCache()
+    cache_.Configure({})
+    assert not cache_.isEnabled
+    cache_.Configure({"Script_Cache_Enabled": True})
+    assert cache_.isEnabled and cache_.directory == MSScriptCache.DEFAULT_DIRECTORY
+
+
+def test_key_ignores_dictionary_order_only():
+    key_ = MSScriptCache.ScriptCache.Key({"id": "a", "tags": ["x", "y"]}, 2024)
+    assert MSScriptCache.ScriptCache.Key({"tags": ["x", "y"], "id": "a"}, 2024) == key_
+    assert MSScriptCache.ScriptCache.Key({"id": "a", "tags": ["y", "x"]}, 2024) != key_
+    assert MSScriptCache.ScriptCache.Key({"id": "a", "tags": ["x", "y"]}, 2025) != key_
+
+
+def test_put_then_get(cache):
+    key_ = cache.Key("asset")
+    assert cache.Get(key_) is None
+    cache.Put(key_, "asset", "script " + MSScriptCache.IMPORT_ID_TOKEN, ["ImportMesh"])
+    cache.Wait()
+    entry_ = cache.Get(key_)
+    assert (entry_["id"], entry_["script"], entry_["mainThreadCalls"]) == (
+        "asset", "script " + MSScriptCache.IMPORT_ID_TOKEN, ["ImportMesh"])
+    assert cache.GetStats() == {"hits": 1, "misses": 1, "entries": 1, "bytes": os.path.getsize(
+        os.path.join(cache.directory, key_ + MSScriptCache.EXTENSION))}
+
+
+@pytest.mark.parametrize("content", [b"", b"{not json", b'{"format": 0, "script": ""}', b"[]"],
+                         ids=["empty", "corrupt", "old-format", "not-an-entry"])
+def test_unreadable_entry_is_a_miss(cache, content):
+    key_ = cache.Key("asset")
+    with open(os.path.join(cache.directory, key_ + MSScriptCache.EXTENSION), "wb") as fl_:
+        fl_.write(content)
+    assert cache.Get(key_) is None
+
+
+def test_least_recently_used_entries_are_removed(cache):
+    keys_ = [cache.Key(index_) for index_ in range(4)]
+    cache.Put(keys_[0], "a0", "x" * 100, [])
+    cache.Wait()
+    cache.maxBytes = os.path.getsize(os.path.join(cache.directory, keys_[0] + MSScriptCache.EXTENSION)) * 2
+    cache.Put(keys_[1], "a1", "x" * 100, [])
+    cache.Wait()
+    assert cache.Get(keys_[0]) is not None
+    cache.Put(keys_[2], "a2", "x" * 100, [])
+    cache.Wait()
+    assert [cache.Get(key_) is not None for key_ in keys_[:3]] == [True, False, True]
+
+
+def test_existing_folder_is_picked_up(cache, tmp_path):
+    key_ = cache.Key("asset")
+    cache.Put(key_, "asset", "script", [])
+    cache.Wait()
+    other_ = MSScriptCache.ScriptCache()
+    other_.Configure({"Script_Cache_Enabled": True, "Script_Cache_Dir": str(tmp_path)})
+    assert other_.GetStats()["entries"] == 1
+    other_.Clear()
+    assert os.listdir(str(tmp_path)) == []
+    assert other_.Get(key_) is None
+
+
+def test_plugin_version_follows_the_python_files(tmp_path):
+    (tmp_path / "MSPlugin.py").write_text("A = 1\n")
+    (tmp_path / "notes.txt").write_text("ignored")
+    version_ = MSScriptCache.PluginVersion(str(tmp_path))
+    MSScriptCache.pluginVersions.clear()
+    (tmp_path / "notes.txt").write_text("changed, still ignored")
+    assert MSScriptCache.PluginVersion(str(tmp_path)) == version_
+    MSScriptCache.pluginVersions.clear()
+    (tmp_path / "MSPlugin.py").write_text("A = 22\n")
+    assert MSScriptCache.PluginVersion(str(tmp_path)) != version_
@@ -0,0 +1,82 @@
+import json, os
+
+import pytest
+
+import MSSettings
+
+DEFAULTS = {"Material_to_Sel": True, "Bulk_Chunk_Size": 10}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "Settings.json")
+
+
+def Read(path):
+    with open(path) as fl_:
+        return json.load(fl_)
+
+
+def test_missing_file_is_written_with_the_defaults(path):
+    assert MSSettings.SettingsStore(path, DEFAULTS).Load() == DEFAULTS
+    assert Read(path) == DEFAULTS
+
+
+def test_file_values_override_the_defaults(path):
+    with open(path, "w") as fl_:
+        json.dump({"Bulk_Chunk_Size": 0, "Extra": 1}, fl_)
+    assert MSSettings.SettingsStore(path, DEFAULTS).Load() == {"Material_to_Sel": True, "Bulk_Chunk_Size": 0, "Extra": 1}
+
+
+def test_load_returns_a_copy(path):
+    store_ = MSSettings.SettingsStore(path, DEFAULTS)
+    store_.Load()["Bulk_Chunk_Size"] = 99
+    assert store_.Load()["Bulk_Chunk_Size"] == 10
+
+
+def test_file_is_read_again_once_it_changed(path):
+    store_ = MSSettings.SettingsStore(path, DEFAULTS)
+    store_.Load()
+    with open(path, "w") as fl_:
+        json.dump({"Bulk_Chunk_Size": 250}, fl_)
+    os.utime(path, ns=(1, 1))
+    assert store_.Load()["Bulk_Chunk_Size"] == 250
+
+
+def test_unreadable_file_keeps_the_last_good_values(path, capsys):
+    store_ = MSSettings.SettingsStore(path, DEFAULTS)
+    store_.Save(dict(DEFAULTS, Bulk_Chunk_Size=3))
+    with open(path, "w") as fl_:
+        fl_.write("{half written")
+    assert store_.Load()["Bulk_Chunk_Size"] == 3
+    assert "Could not read" in capsys.readouterr().out
+
+
+def test_updates_are_written_once_after_the_delay(path):
+    store_ = MSSettings.SettingsStore(path, DEFAULTS, writeDelay=60)
+    store_.Load()
+    for size_ in range(5):
+        store_.Update(dict(DEFAULTS, Bulk_Chunk_Size=size_))
+    assert Read(path)["Bulk_Chunk_Size"] == 10
+    # Pending values win over the file until they are written
+    assert store_.Load()["Bulk_Chunk_Size"] == 4
+    store_.Flush()
+    assert Read(path)["Bulk_Chunk_Size"] == 4
+    assert [name_ for name_ in os.listdir(os.path.dirname(path)) if name_.endswith(".tmp")] == []
+
+
+def test_newer_store_flushes_the_one_it_replaces(path):
+    store_ = MSSettings.SettingsStore(path, DEFAULTS, writeDelay=60)
+    store_.Load()
+    store_.Update(dict(DEFAULTS, Bulk_Chunk_Size=7))
+    newer_ = MSSettings.SettingsStore(path, DEFAULTS)
+    assert Read(path)["Bulk_Chunk_Size"] == 7
+    assert MSSettings.stores[os.path.normcase(os.path.abspath(path))] is newer_
+
+
+def test_flush_all_writes_pending_updates(path):
+    store_ = MSSettings.SettingsStore(path, DEFAULTS, writeDelay=60)
+    store_.Load()
+    store_.Update(dict(DEFAULTS, Material_to_Sel=False))
+    MSSettings.FlushAll()
+    assert Read(path)["Material_to_Sel"] is False
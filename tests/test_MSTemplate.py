@@ -0,0 +1,50 @@
+import pytest
+
+import MSTemplate
+
+PLACEHOLDERS = MSTemplate.Placeholders(['"MSFABRIC"', "MSFABRIC", "ASSETNAME", "ASSET"], [r'TEX_[A-Z0-9_]+"'])
+
+
+def Cascade(text, context):
+    # The str.replace cascade the templates replaced
+    for placeholder_, value_ in context.items():
+        text = text.replace(placeholder_, value_)
+    return text
+
+
+def test_compiled_template_fills_every_slot():
+    template_ = MSTemplate.CompiledTemplate('name = "ASSETNAME"\nmap = "TEX_ALBEDO"\n', PLACEHOLDERS)
+    assert template_.segments[1::2] == ["ASSETNAME", 'TEX_ALBEDO"']
+    assert template_.Render({"ASSETNAME": "Rock", 'TEX_ALBEDO"': 'D:/rock.jpg"'}) == 'name = "Rock"\nmap = "D:/rock.jpg"\n'
+
+
+def test_longest_name_wins():
+    context_ = {"ASSET": "short", "ASSETNAME": "long"}
+    assert MSTemplate.RenderTemplate("ASSETNAME ASSET", context_, PLACEHOLDERS) == "long short"
+
+
+def test_missing_placeholder_is_left_untouched():
+    text_ = 'map = "TEX_ROUGHNESS" name = ASSETNAME'
+    assert MSTemplate.CompiledTemplate(text_, PLACEHOLDERS).Render({}) == text_
+    assert MSTemplate.RenderTemplate(text_, {"ASSET": "x"}, PLACEHOLDERS) == 'map = "TEX_ROUGHNESS" name = ASSETNAME'
+
+
+def test_enclosing_placeholder_falls_back_to_the_inner_one():
+    context_ = {"MSFABRIC": "true"}
+    text_ = 'isFabric = "MSFABRIC" and MSFABRIC'
+    assert MSTemplate.CompiledTemplate(text_, PLACEHOLDERS).Render(context_) == 'isFabric = "true" and true'
+    assert MSTemplate.RenderTemplate(text_, context_, PLACEHOLDERS) == Cascade(text_, context_)
+
+
+def test_names_are_compiled_into_a_pattern():
+    template_ = MSTemplate.CompiledTemplate("a ASSETNAME b", ["ASSETNAME"])
+    assert template_.Render({"ASSETNAME": "x"}) == "a x b"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("a\nTEX_X\nb", "a\n--TEX_X\nb"),
+    ("TEX_X TEX_Y\nb", "--TEX_X TEX_Y\nb"),
+    ("a\nb", "a\nb"),
+], ids=["line", "twice-on-a-line", "none"])
+def test_comment_lines(text, expected):
+    assert MSTemplate.CommentLines(text, "TEX_") == expected
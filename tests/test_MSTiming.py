@@ -0,0 +1,15 @@
+import MSTiming
+
+
+def test_sections_are_unchanged_while_off():
+    recorder_ = MSTiming.TimingRecorder()
+    recorder_.Configure({})
+    assert recorder_.WrapSection("max.mesh", "box()") == "box()"
+
+
+def test_section_markers_use_a_valid_variable_name():
+    recorder_ = MSTiming.TimingRecorder()
+    recorder_.Configure({"Timing_Enabled": True})
+    script_ = recorder_.WrapSection("max.mesh (fbx)", "box()")
+    assert "\nmsTiming_max_mesh__fbx_ = timeStamp()\nbox()" in script_
+    assert '"max.mesh (fbx)=" + ((timeStamp() - msTiming_max_mesh__fbx_) as string)' in script_
@@ -0,0 +1,122 @@
+import os
+
+import pytest
+
+import MS_Importer, MSLiveLinkStream, MSRuntime, MSScriptCache, MSSettings
+
+LIBRARY_ROOT = "D:/Megascans"
+
+# What Bridge sends for an export of a surface and a 3D asset
+BRIDGE_EXPORT = b"""[
+{"id": "rkspb2", "guid": "a1b2", "name": "Mossy Rock", "type": "surface", "category": "Rock",
+ "categories": ["nature", "rock"], "tags": ["rock", "mossy"], "workflow": "metalness",
+ "activeLOD": "lod0", "minLOD": "lod3", "resolution": "4K", "path": "D:/Megascans/surface/Mossy_Rock_rkspb2",
+ "components": [
+  {"type": "albedo", "format": "jpg", "name": "Albedo", "path": "D:/Megascans/surface/Mossy_Rock_rkspb2/rkspb2_4K_Albedo.jpg"},
+  {"type": "roughness", "format": "jpg", "name": "Roughness", "path": "D:/Megascans/surface/Mossy_Rock_rkspb2/rkspb2_4K_Roughness.jpg"},
+  {"type": "displacement", "format": "jpg", "name": "Displacement", "path": "D:/Megascans/surface/Mossy_Rock_rkspb2/rkspb2_4K_Displacement.jpg"}],
+ "meshList": [],
+ "meta": [{"key": "height", "name": "Height", "value": "0.05 m"}, {"key": "scanArea", "name": "Scan Area", "value": "2x2 m"}]},
+{"id": "uknkaffaw", "guid": "c3d4", "name": "Old Stump", "type": "3d", "category": "Wood",
+ "categories": ["3d", "wood"], "tags": ["stump"], "workflow": "metalness",
+ "activeLOD": "lod0", "minLOD": "lod3", "resolution": "2K", "path": "D:/Megascans/3d/Old_Stump_uknkaffaw",
+ "components": [
+  {"type": "albedo", "format": "jpg", "name": "Albedo", "path": "D:/Megascans/3d/Old_Stump_uknkaffaw/uknkaffaw_2K_Albedo.jpg"},
+  {"type": "normal", "format": "jpg", "name": "Normal", "path": "D:/Megascans/3d/Old_Stump_uknkaffaw/uknkaffaw_2K_Normal_LOD0.jpg"}],
+ "meshList": [{"type": "lod", "format": "fbx", "path": "D:/Megascans/3d/Old_Stump_uknkaffaw/uknkaffaw_LOD0.fbx"}],
+ "meta": [{"key": "scanArea", "name": "Scan Area", "value": "0.5x0.5 m"}]}
+]"""
+
+
+@pytest.fixture
+def runtime(tmp_path, monkeypatch):
+    runtime_ = MSRuntime.Get()
+    monkeypatch.setattr(runtime_, "FixtureDir", str(tmp_path / "library"))
+    monkeypatch.setattr(runtime_, "LibraryRoot", LIBRARY_ROOT)
+    runtime_.Reset()
+    MS_Importer.rendererProbe.Expire()
+    return runtime_
+
+
+@pytest.fixture
+def importer(tmp_path, monkeypatch):
+    importer_ = MS_Importer.LiveLinkImporter()
+    store_ = MSSettings.SettingsStore(str(tmp_path / "Settings.json"), importer_.defaultSettings())
+    monkeypatch.setattr(importer_, "SettingsStore", store_)
+    importer_.updateSettings(store_.Load())
+    importer_.ImportID = 0
+    return importer_
+
+
+def Import(importer, runtime, payload):
+    """
+    Lays out the files of payload under the runtime's fixture directory, then
+    imports it asset by asset the way Bridge exports arrive.
+    """
+    stream_ = MSLiveLinkStream.JSONArrayStream()
+    assets_ = stream_.Feed(payload) + stream_.Close()
+    for asset_ in assets_:
+        for entry_ in asset_["components"] + asset_["meshList"]:
+            path_ = runtime.MapPath(entry_["path"])
+            os.makedirs(os.path.dirname(path_), exist_ok=True)
+            open(path_, "ab").close()
+    for asset_ in assets_:
+        importer.set_Asset_Data(asset_)
+    return runtime.Executed
+
+
+def test_bridge_export_becomes_one_script_per_asset(importer, runtime):
+    surface_, stump_ = Import(importer, runtime, BRIDGE_EXPORT)
+
+    assert 'assetType = "surface"' in surface_
+    assert 'MatNode.name = "rkspb2_Mossy_Rock"' in surface_
+    assert 'albedoBitmap = Bitmaptexture fileName: "D:/Megascans/surface/Mossy_Rock_rkspb2/rkspb2_4K_Albedo.jpg"' in surface_
+    assert "normalBitmap = undefined" in surface_
+    assert "meshes_ = #()" in surface_
+    assert "MatNode.displacement.amount = 0.05" in surface_
+    assert "for o in selection do o.material = MatNode" in surface_
+
+    assert 'assetType = "3d"' in stump_
+    assert 'meshes_ = #("D:/Megascans/3d/Old_Stump_uknkaffaw/uknkaffaw_LOD0.fbx")' in stump_
+    assert 'normalBitmap = Bitmaptexture fileName: "D:/Megascans/3d/Old_Stump_uknkaffaw/uknkaffaw_2K_Normal_LOD0.jpg"' in stump_
+    assert "MatNode.displacement" not in stump_
+    for script_ in (surface_, stump_):
+        assert script_.strip().startswith("try(") and "catch(errMsg)" in script_
+        assert "universal_material()" in script_
+
+
+def test_meta_values_are_read_as_before(importer, runtime):
+    # Heights go to Octane as written and the helper gives the scan size, in any unit
+    surface_ = Import(importer, runtime, BRIDGE_EXPORT.replace(b'"0.05 m"', b'"2 cm"').replace(b'"2x2 m"', b'"60x60 cm"'))[0]
+    assert "MatNode.displacement.amount = 2.0" in surface_
+    importer.set_Asset_Data(MSLiveLinkStream.JSONArrayStream().Feed(BRIDGE_EXPORT)[0])
+    assert (importer.scanWidth, importer.scanHeight) == (2.0, 2.0)
+    assert importer.height == pytest.approx(0.05 * 39.37 / 2 * (2.0 / 2.1))
+
+
+def test_bridge_export_as_one_batch(importer, runtime):
+    importer.BeginBatch(0)
+    Import(importer, runtime, BRIDGE_EXPORT)
+    assert runtime.Executed == []
+    importer.EndBatch()
+    script_, = runtime.Executed
+    assert script_.index('MatNode.name = "rkspb2_Mossy_Rock"') < script_.index('MatNode.name = "uknkaffaw_Old_Stump"')
+    # The Octane node registry and asset index functions are defined once, ahead of the assets
+    for definition_ in ("fn MSOctaneImageNode ", "fn MSAssetIndexRegister ", 'MSOctaneImportID = "1"'):
+        assert script_.count(definition_) == 1
+        assert script_.index(definition_) < script_.index('msBridgeAsset = "rkspb2"')
+
+
+def test_cached_scripts_keep_their_preludes(importer, runtime, tmp_path):
+    importer.updateSettings(dict(importer.Settings, Script_Cache_Enabled=True, Script_Cache_Dir=str(tmp_path / "cache")))
+    try:
+        generated_ = list(Import(importer, runtime, BRIDGE_EXPORT))
+        MSScriptCache.cache.Wait()
+        runtime.Reset()
+        importer.ImportID = 0
+        cached_ = Import(importer, runtime, BRIDGE_EXPORT)
+    finally:
+        importer.updateSettings(dict(importer.Settings, Script_Cache_Enabled=False))
+    assert MSScriptCache.cache.GetStats()["hits"] >= 2
+    assert cached_ == generated_
+    assert all(script_.count("fn MSOctaneImageNode ") == 1 for script_ in cached_)